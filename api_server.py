@@ -1,61 +1,194 @@
 """
 Flask Backend API Server
 Web Dashboard için REST API endpoints sağlar.
+
+Model (scikit-learn), pandas ve Firebase import sırasında yüklenmez;
+arka plan ısınma görevinde yüklenir (bkz. isinma.py ve /api/ready).
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
-import pandas as pd
 import json
+import math
 import os
+import threading
 from datetime import datetime, timedelta
 from model_egit import load_model, predict_anomaly, calculate_risk_score
 from config import (
     NUM_TRANSFORMERS,
     TRANSFORMER_LOCATIONS,
     RISK_SCORING,
-    ECONOMICS,
+    ALERT_CONFIG,
+    LOCAL_DATABASE,
+    STORAGE,
     DATA_GENERATION
 )
+from canli_akis import RealtimeFeed, SENSOR_FIELDS
+from konum_indeksi import parse_bbox
+from yanit_katmani import init_response_layer, wants_columnar, frame_payload
+from isinma import WarmUp
+from kolon_deposu import is_current, open_sensor_columns
+from depolama import CsvBackend, open_backend
 
-# Firebase import (opsiyonel)
-USE_FIREBASE = os.path.exists('firebase-key.json')
-if USE_FIREBASE:
-    try:
-        from firebase_config import init_firebase, get_firestore, get_latest_by_transformer, FIRESTORE_COLLECTION
-        init_firebase('firebase-key.json')
-        print("✅ Firebase API için başlatıldı")
-    except Exception as e:
-        print(f"⚠️  Firebase başlatılamadı: {e}")
-        USE_FIREBASE = False
-else:
+# Firebase (opsiyonel) - istemci ısınma görevinde başlatılır
+USE_FIREBASE = os.path.exists(STORAGE['firebase_key'])
+if not USE_FIREBASE:
     print("ℹ️  firebase-key.json bulunamadı, CSV kullanılacak")
 
 app = Flask(__name__)
 CORS(app)  # Frontend'den istekler için CORS aktif
+init_response_layer(app)  # orjson + gzip/brotli
+
+# Ağır yüklemeler: start_background_tasks() ile arka planda, ya da ilk
+# ihtiyaç duyan istekte warmup.require(...) ile
+warmup = WarmUp('api_server')
 
-# Model yükleme (başlangıçta)
 model = None
 scaler = None
+remote_storage = None   # depolama.FirestoreBackend
+remote_generation = None   # Akışa son uygulanan Firestore önbellek sürümü
+remote_applied = {}        # transformer_id -> akışa uygulanan son Firestore kaydının zamanı
+
 
+@warmup.step('model')
 def init_model():
-    """Modeli yükler"""
+    """Modeli yükler (scikit-learn import'u dahil)"""
     global model, scaler
+    model, scaler = load_model()
+    print("✅ Model API için yüklendi")
+
+
+@warmup.step('firebase', required=False)
+def init_firebase_client():
+    """Firebase istemcisini başlatır (firebase-key.json varsa)"""
+    global USE_FIREBASE, remote_storage
+    if not USE_FIREBASE:
+        return
+    try:
+        remote_storage = open_backend('firestore')
+        print("✅ Firebase API için başlatıldı")
+    except Exception:
+        USE_FIREBASE = False
+        raise
+
+
+# Canlı akış: realtime_data.csv tek iş parçacığıyla takip edilir,
+# tüm açık panolara sadece değişiklikler gönderilir
+realtime_feed = RealtimeFeed('data/realtime_data.csv')
+
+
+@warmup.step('realtime_feed')
+def prime_realtime_feed():
+    """pandas'ı yükler ve mevcut realtime_data.csv'yi akışa okur"""
+    realtime_feed.poll(publish=False)
+
+
+# Tarihsel veri: memmap kolon deposu ısınmada açılır (yoksa CSV'den bir kez
+# üretilir); üretim sürerken /api/historical-data ilerlemeyle 503 döner
+sensor_columns = None
+history_load = {'state': 'pending', 'rows': 0, 'progress': 0.0, 'error': None, 'source': None}
+_history_reload_lock = threading.Lock()
+
+
+def _sensor_csv_source():
+    """sensor_data.csv (boyut, değişim zamanı) - dosya yoksa None"""
     try:
-        model, scaler = load_model()
-        print("✅ Model API için yüklendi")
+        stat = os.stat(DATA_GENERATION['output_file'])
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_sensor_columns():
+    """Kolon deposunu açar, gerekirse sensor_data.csv'den üretir (istek dışında çağrılır)"""
+    global sensor_columns
+    history_load.update(state='loading', rows=0, progress=0.0, error=None, source=_sensor_csv_source())
+    try:
+        columns = open_sensor_columns(
+            progress=lambda rows, ratio: history_load.update(rows=rows, progress=round(ratio, 3))
+        )
     except Exception as e:
-        print(f"⚠️  Model yüklenemedi: {e}")
-        model = None
-        scaler = None
+        history_load.update(state='failed', error=str(e))
+        raise
+    sensor_columns = columns
+    history_load.update(
+        state='ready' if columns is not None else 'missing',
+        rows=len(columns) if columns is not None else 0,
+        progress=1.0
+    )
+
+
+@warmup.step('history', required=False)
+def init_sensor_columns():
+    """Kolon deposunu açar (gerekirse sensor_data.csv'den üretir)"""
+    load_sensor_columns()
+
+
+def reload_sensor_columns_async():
+    """
+    sensor_data.csv ısınmadan sonra değiştiyse depoyu arka planda yeniden
+    üretir. Aynı anda tek yeniden üretim; aynı CSV için başarısız deneme
+    tekrarlanmaz.
+    
+    Returns:
+        bool: Yeniden üretim sürüyor mu
+    """
+    source = _sensor_csv_source()
+    if source is None or history_load['source'] == source and history_load['state'] != 'loading':
+        return history_load['state'] == 'loading'
+    if not _history_reload_lock.acquire(blocking=False):
+        return True
+    history_load.update(state='loading', source=source)
+    
+    def run():
+        try:
+            load_sensor_columns()
+        except Exception as e:
+            print(f"⚠️ Tarihsel veri yeniden üretim hatası: {e}")
+        finally:
+            _history_reload_lock.release()
+    
+    threading.Thread(target=run, name='history-reload', daemon=True).start()
+    return True
+
+
+def start_background_tasks():
+    """Süreç başına arka plan işleri (sunucu.py her işçi süreçte çağırır)"""
+    warmup.start()
+    realtime_feed.start()
+
+
+def firebase_enabled():
+    """Firebase kullanılabilir mi (istemci henüz başlatılmadıysa şimdi başlatır)"""
+    return USE_FIREBASE and warmup.require('firebase')
+
+
+# Yerel SQLite veritabanı (opsiyonel) - simülasyon '--storage sqlite' ile
+# yazar; dosya varsa son kayıt / geçmiş / risk sorguları indekslerden yapılır
+local_db = None
+
 
-# Uygulama başlarken modeli yükle
-init_model()
+def local_database():
+    """Yerel veritabanı (dosya yoksa None; ilk kullanımda açılır)"""
+    global local_db
+    if local_db is None and os.path.exists(LOCAL_DATABASE['path']):
+        local_db = open_backend('sqlite')
+    return local_db
+
+
+csv_storage = CsvBackend(realtime_feed.data_file)
+
+
+def query_backend():
+    """Geçmiş / risk sorguları için depo: Firestore, yerel veritabanı, CSV sırasıyla"""
+    if firebase_enabled():
+        return remote_storage
+    return local_database() or csv_storage
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """API sağlık kontrolü"""
+    """API sağlık kontrolü (süreç ayakta mı - ısınmayı beklemez)"""
     return jsonify({
         'status': 'ok',
         'model_loaded': model is not None,
@@ -63,6 +196,14 @@ def health_check():
     })
 
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Hazır olma kontrolü: ısınma adımları bitene kadar 503"""
+    warmup.start()
+    status = warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
 @app.route('/api/transformers', methods=['GET'])
 def get_transformers():
     """Tüm trafoların listesini döner"""
@@ -83,6 +224,19 @@ def get_transformers():
     })
 
 
+def _latest_data_fields(data):
+    """Firebase belgesi veya CSV satırından trafo detay alanları (NumPy tipleri olduğu gibi)"""
+    latest_data = {field: data.get(field, 0) for field in SENSOR_FIELDS}
+    latest_data.update({
+        'risk_score': data.get('risk_score', 0),
+        'risk_level': data.get('risk_level', 'unknown'),
+        'risk_color': data.get('risk_color', 'gray'),
+        'is_anomaly': data.get('is_anomaly', False),
+        'timestamp': data.get('timestamp', datetime.now().isoformat())
+    })
+    return latest_data
+
+
 @app.route('/api/transformer/<int:transformer_id>', methods=['GET'])
 def get_transformer_details(transformer_id):
     """Belirli bir trafonun detaylarını döner"""
@@ -93,51 +247,33 @@ def get_transformer_details(transformer_id):
     latest_data = None
     
     # Firebase'den veri çek (birincil)
-    if USE_FIREBASE:
+    if firebase_enabled():
         try:
-            latest_dict = get_latest_by_transformer(FIRESTORE_COLLECTION, transformer_id)
+            latest_dict = remote_storage.latest(transformer_id)
             if transformer_id in latest_dict:
-                data = latest_dict[transformer_id]
-                latest_data = {
-                    'toprak_direnci': float(data.get('toprak_direnci', 0)),
-                    'kacak_akim': float(data.get('kacak_akim', 0)),
-                    'toprak_potansiyel': float(data.get('toprak_potansiyel', 0)),
-                    'toprak_nemi': float(data.get('toprak_nemi', 0)),
-                    'toprak_sicakligi': float(data.get('toprak_sicakligi', 0)),
-                    'korozyon_seviyesi': float(data.get('korozyon_seviyesi', 0)),
-                    'risk_score': float(data.get('risk_score', 0)),
-                    'risk_level': data.get('risk_level', 'unknown'),
-                    'risk_color': data.get('risk_color', 'gray'),
-                    'is_anomaly': bool(data.get('is_anomaly', False)),
-                    'timestamp': data.get('timestamp', datetime.now().isoformat())
-                }
+                latest_data = _latest_data_fields(latest_dict[transformer_id])
         except Exception as e:
             print(f"⚠️ Firebase transformer detay okuma hatası: {e}")
     
-    # CSV'den veri çek (fallback)
+    # Yerel veritabanından son kayıt ((transformer_id, timestamp) indeksi)
+    if latest_data is None and local_database() is not None:
+        try:
+            record = local_db.latest(transformer_id).get(transformer_id)
+            if record is not None:
+                latest_data = _latest_data_fields(record)
+        except Exception as e:
+            print(f"⚠️ Veritabanı transformer detay okuma hatası: {e}")
+    
+    # CSV'den veri çek (fallback) - canlı akışın son kaydı; dosya döndürülse
+    # de (veri_saklama) trafonun son okuması kaybolmaz
     if latest_data is None:
-        realtime_file = 'data/realtime_data.csv'
-        if os.path.exists(realtime_file):
-            try:
-                df = pd.read_csv(realtime_file)
-                transformer_data = df[df['transformer_id'] == transformer_id]
-                if not transformer_data.empty:
-                    latest = transformer_data.iloc[-1]
-                    latest_data = {
-                        'toprak_direnci': float(latest.get('toprak_direnci', 0)),
-                        'kacak_akim': float(latest.get('kacak_akim', 0)),
-                        'toprak_potansiyel': float(latest.get('toprak_potansiyel', 0)),
-                        'toprak_nemi': float(latest.get('toprak_nemi', 0)),
-                        'toprak_sicakligi': float(latest.get('toprak_sicakligi', 0)),
-                        'korozyon_seviyesi': float(latest.get('korozyon_seviyesi', 0)),
-                        'risk_score': float(latest.get('risk_score', 0)),
-                        'risk_level': latest.get('risk_level', 'unknown'),
-                        'risk_color': latest.get('risk_color', 'gray'),
-                        'is_anomaly': bool(latest.get('is_anomaly', False)),
-                        'timestamp': latest.get('timestamp', datetime.now().isoformat())
-                    }
-            except Exception as e:
-                print(f"⚠️ CSV transformer detay okuma hatası: {e}")
+        try:
+            realtime_feed.poll()
+            record = realtime_feed.latest.get(transformer_id)
+            if record is not None:
+                latest_data = _latest_data_fields(record)
+        except Exception as e:
+            print(f"⚠️ CSV transformer detay okuma hatası: {e}")
     
     return jsonify({
         'id': loc['id'],
@@ -151,169 +287,285 @@ def get_transformer_details(transformer_id):
 
 @app.route('/api/realtime-data', methods=['GET'])
 def get_realtime_data():
-    """Gerçek zamanlı veriyi döner (Firebase veya CSV)"""
-    realtime_file = 'data/realtime_data.csv'
+    """
+    Gerçek zamanlı veriyi döner (Firebase veya CSV).
     
-    # Tüm trafolar için sonuç listesi oluştur
-    result = []
+    Her yanıt bir veri versiyonu ve ETag taşır:
+      - If-None-Match aynı ETag ise 304 (gövde yok)
+      - ?since=<version> sadece o versiyondan sonra değişen trafoları döner
+      - ?bbox=min_lon,min_lat,max_lon,max_lat sadece harita görünümündeki trafolar
+    """
+    global remote_generation
+    import pandas as pd
     
-    # Önce tüm trafo lokasyonlarını varsayılan değerlerle ekle
-    for transformer_id in range(1, NUM_TRANSFORMERS + 1):
-        result.append({
-            'transformer_id': transformer_id,
-            'name': TRANSFORMER_LOCATIONS[transformer_id - 1]['name'],
-            'latitude': TRANSFORMER_LOCATIONS[transformer_id - 1]['latitude'],
-            'longitude': TRANSFORMER_LOCATIONS[transformer_id - 1]['longitude'],
-            'region': TRANSFORMER_LOCATIONS[transformer_id - 1]['region'],
-            'toprak_direnci': 0,
-            'kacak_akim': 0,
-            'toprak_potansiyel': 0,
-            'toprak_nemi': 0,
-            'toprak_sicakligi': 0,
-            'korozyon_seviyesi': 0,
-            'risk_score': 0,
-            'risk_level': 'unknown',
-            'risk_color': 'gray',
-            'is_anomaly': False,
-            'timestamp': datetime.now().isoformat()
-        })
+    realtime_file = 'data/realtime_data.csv'
+    source = 'default'
+    message = 'Simülasyonu başlatın'
     
-    # Firebase'den veri çek (birincil)
-    if USE_FIREBASE:
+    transformer_ids = None
+    if request.args.get('bbox'):
+        try:
+            transformer_ids = realtime_feed.spatial_index.in_bbox(*parse_bbox(request.args['bbox']))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    # Firebase'den veri çek (birincil) - tüm istekler aynı önbelleği paylaşır
+    # (TTL başına tek toplu sorgu); akışa sadece yenilenen anlık görüntü uygulanır
+    if firebase_enabled():
         try:
-            latest_data = get_latest_by_transformer(FIRESTORE_COLLECTION)
-            
-            # Firebase'den gelen verileri result listesine güncelle
-            for transformer_id in range(1, NUM_TRANSFORMERS + 1):
-                if transformer_id in latest_data:
-                    data = latest_data[transformer_id]
-                    # Result listesinde bu trafo ID'sine sahip kaydı bul ve güncelle
-                    for i, item in enumerate(result):
-                        if item['transformer_id'] == transformer_id:
-                            result[i] = {
-                                'transformer_id': int(data.get('transformer_id', transformer_id)),
-                                'name': TRANSFORMER_LOCATIONS[transformer_id - 1]['name'],
-                                'latitude': TRANSFORMER_LOCATIONS[transformer_id - 1]['latitude'],
-                                'longitude': TRANSFORMER_LOCATIONS[transformer_id - 1]['longitude'],
-                                'region': TRANSFORMER_LOCATIONS[transformer_id - 1]['region'],
-                                'toprak_direnci': float(data.get('toprak_direnci', 0)),
-                                'kacak_akim': float(data.get('kacak_akim', 0)),
-                                'toprak_potansiyel': float(data.get('toprak_potansiyel', 0)),
-                                'toprak_nemi': float(data.get('toprak_nemi', 0)),
-                                'toprak_sicakligi': float(data.get('toprak_sicakligi', 0)),
-                                'korozyon_seviyesi': float(data.get('korozyon_seviyesi', 0)),
-                                'risk_score': float(data.get('risk_score', 0)),
-                                'risk_level': data.get('risk_level', 'unknown'),
-                                'risk_color': data.get('risk_color', 'gray'),
-                                'is_anomaly': bool(data.get('is_anomaly', False)),
-                                'timestamp': data.get('timestamp', datetime.now().isoformat())
-                            }
-                            break
-            
-            return jsonify({
-                'data': result,
-                'count': len(result),
-                'timestamp': datetime.now().isoformat(),
-                'message': 'Veriler Firebase\'den yüklendi',
-                'source': 'firebase'
-            })
+            generation, latest_data = remote_storage.latest_cache.snapshot()
+            if generation != remote_generation:
+                # Sadece son uygulanandan yeni kayıtlar (istatistik / bildirim tekrarı olmaz)
+                fresh = [
+                    record for transformer_id, record in latest_data.items()
+                    if remote_applied.get(transformer_id) != record.get('timestamp')
+                ]
+                if fresh:
+                    realtime_feed.apply_records(pd.DataFrame(fresh))
+                    remote_applied.update((record['transformer_id'], record.get('timestamp')) for record in fresh)
+                remote_generation = generation
+            source = 'firebase'
+            message = 'Veriler Firebase\'den yüklendi'
         except Exception as e:
             print(f"⚠️ Firebase okuma hatası: {e}")
             # Hata durumunda CSV'ye düş
     
-    # CSV'den veri çek (fallback)
-    if os.path.exists(realtime_file):
+    # CSV'den veri çek (fallback) - sadece son okumadan sonra eklenen satırlar okunur
+    if source == 'default' and os.path.exists(realtime_file):
         try:
-            df = pd.read_csv(realtime_file)
-            
-            # Son 100 kaydı al
-            limit = int(request.args.get('limit', 100))
-            df = df.tail(limit)
-            
-            # Her trafo için son veriyi al ve result listesini güncelle
-            for transformer_id in range(1, NUM_TRANSFORMERS + 1):
-                trafo_data = df[df['transformer_id'] == transformer_id]
-                if not trafo_data.empty:
-                    latest = trafo_data.iloc[-1]
-                    # Result listesinde bu trafo ID'sine sahip kaydı bul ve güncelle
-                    for i, item in enumerate(result):
-                        if item['transformer_id'] == transformer_id:
-                            result[i] = {
-                                'transformer_id': int(latest.get('transformer_id', transformer_id)),
-                                'name': TRANSFORMER_LOCATIONS[transformer_id - 1]['name'],
-                                'latitude': TRANSFORMER_LOCATIONS[transformer_id - 1]['latitude'],
-                                'longitude': TRANSFORMER_LOCATIONS[transformer_id - 1]['longitude'],
-                                'region': TRANSFORMER_LOCATIONS[transformer_id - 1]['region'],
-                                'toprak_direnci': float(latest.get('toprak_direnci', 0)),
-                                'kacak_akim': float(latest.get('kacak_akim', 0)),
-                                'toprak_potansiyel': float(latest.get('toprak_potansiyel', 0)),
-                                'toprak_nemi': float(latest.get('toprak_nemi', 0)),
-                                'toprak_sicakligi': float(latest.get('toprak_sicakligi', 0)),
-                                'korozyon_seviyesi': float(latest.get('korozyon_seviyesi', 0)),
-                                'risk_score': float(latest.get('risk_score', 0)),
-                                'risk_level': latest.get('risk_level', 'unknown'),
-                                'risk_color': latest.get('risk_color', 'gray'),
-                                'is_anomaly': bool(latest.get('is_anomaly', False)),
-                                'timestamp': latest.get('timestamp', datetime.now().isoformat())
-                            }
-                            break
-        
+            realtime_feed.poll()
+            source = 'csv'
+            message = 'Veriler yüklendi'
         except Exception as e:
             print(f"⚠️ CSV okuma hatası: {e}")
-            # Hata durumunda varsayılan değerlerle devam et
+            # Hata durumunda mevcut değerlerle devam et
     
-    return jsonify({
+    # Sıkıştırılmış yanıtların ETag'i zayıf (W/) olduğundan zayıf karşılaştırma
+    etag = realtime_feed.etag
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    
+    # Farklı epoch (sunucu yeniden başlamış) ise tam veri gönder
+    since = request.args.get('since', type=int)
+    client_epoch = request.args.get('epoch')
+    if since is not None and (client_epoch is None or client_epoch == realtime_feed.epoch) \
+            and since <= realtime_feed.version:
+        epoch, version, result = realtime_feed.changed_since(since, transformer_ids)
+        changed_only = True
+    else:
+        epoch, version, result = realtime_feed.snapshot(transformer_ids)
+        changed_only = False
+    
+    response = jsonify({
         'data': result,
         'count': len(result),
+        'version': version,
+        'epoch': epoch,
+        'changed_only': changed_only,
         'timestamp': datetime.now().isoformat(),
-        'message': 'Veriler yüklendi' if os.path.exists(realtime_file) else 'Simülasyonu başlatın',
-        'source': 'csv' if os.path.exists(realtime_file) else 'default'
+        'message': message,
+        'source': source
     })
+    # ETag gövdeyle aynı kilit altında okunan versiyondan (araya giren
+    # güncelleme istemciye almadığı veri için 304 döndürtmez)
+    response.set_etag(realtime_feed.format_etag(epoch, version))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/transformers/<int:transformer_id>/history', methods=['GET'])
+def get_transformer_history(transformer_id):
+    """
+    Trafonun canlı kayıt geçmişi (zaman sıralı). Parametreler:
+      - days: Pencere (varsayılan 7 gün, en yeni kayda göre değil şimdiye göre)
+      - limit: En fazla kayıt (varsayılan 500, en fazla 5000)
+    
+    Firestore ya da yerel veritabanı varsa pencere indeksle okunur; yoksa
+    realtime_data.csv ve döndürülmüş ham bölümler taranır.
+    """
+    try:
+        days = request.args.get('days', 7, type=float)
+        limit = min(max(request.args.get('limit', 500, type=int), 1), 5000)
+        start_date = datetime.now() - timedelta(days=days)
+        
+        backend = query_backend()
+        history = backend.history(transformer_id, start=start_date, limit=limit)
+        
+        return jsonify({
+            'transformer_id': transformer_id,
+            'history': history,
+            'count': len(history),
+            'source': backend.name
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/risk-readings', methods=['GET'])
+def get_risk_readings():
+    """
+    Risk eşiğini aşan ham kayıtlar, en yeni önce (/api/alerts olay
+    bazlıdır, bu uç her okumayı döner). Yerel veritabanında risk_score
+    indeksinden okunur. Parametreler:
+      - min_risk: Risk alt sınırı (varsayılan ALERT_CONFIG['open_threshold'])
+      - transformer_id: Sadece bu trafo
+      - before: Önceki yanıttaki next_before
+      - limit: Sayfa boyutu (varsayılan 50, en fazla 500)
+    """
+    try:
+        backend = query_backend()
+        readings, next_before = backend.alerts(
+            min_risk=request.args.get('min_risk', ALERT_CONFIG['open_threshold'], type=float),
+            transformer_id=request.args.get('transformer_id', type=int),
+            before=request.args.get('before'),
+            limit=min(max(request.args.get('limit', 50, type=int), 1), 500)
+        )
+        
+        return jsonify({
+            'readings': readings,
+            'count': len(readings),
+            'next_before': next_before,
+            'source': backend.name
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/regions', methods=['GET'])
+def get_regions():
+    """
+    Bölge başına risk özeti: trafo sayısı, sınırlar/merkez ve seviye
+    dağılımı, ortalama/min/max risk. Sayaçlar veri geldikçe artımlı
+    güncellenir.
+    """
+    try:
+        realtime_feed.poll()
+        regions = realtime_feed.region_summaries()
+        return jsonify({
+            'regions': regions,
+            'count': len(regions),
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/transformers/within', methods=['GET'])
+def get_transformers_within():
+    """
+    Alan içindeki trafolar ve son durumları. Parametreler (biri gerekli):
+      - bbox=min_lon,min_lat,max_lon,max_lat
+      - lat, lon, radius_km: Merkeze uzaklık (yakından uzağa, distance_km alanıyla)
+    """
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    radius_km = request.args.get('radius_km', type=float)
+    
+    try:
+        realtime_feed.poll()
+        
+        if request.args.get('bbox'):
+            try:
+                bbox = parse_bbox(request.args['bbox'])
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            _epoch, version, result = realtime_feed.snapshot(realtime_feed.spatial_index.in_bbox(*bbox))
+        elif lat is not None and lon is not None and radius_km is not None:
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                return jsonify({'error': 'lat -90..90, lon -180..180 aralığında olmalı'}), 400
+            if not 0 < radius_km < math.inf:
+                return jsonify({'error': 'radius_km pozitif ve sonlu olmalı'}), 400
+            matches = realtime_feed.spatial_index.within_radius(lat, lon, radius_km)
+            _epoch, version, result = realtime_feed.snapshot([transformer_id for transformer_id, _d in matches])
+            result = [dict(record, distance_km=distance) for record, (_id, distance) in zip(result, matches)]
+        else:
+            return jsonify({'error': 'bbox veya lat, lon, radius_km gerekli'}), 400
+        
+        return jsonify({
+            'data': result,
+            'count': len(result),
+            'version': version,
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/stream', methods=['GET'])
+def stream_realtime():
+    """
+    Server-Sent Events canlı akışı.
+    İlk mesaj tüm trafoların durumu (snapshot), sonrakiler her tick'te
+    sadece değişen trafolar ve yeni bildirimler (delta).
+    """
+    realtime_feed.start()
+    subscriber = realtime_feed.subscribe()
+    
+    return Response(
+        stream_with_context(realtime_feed.stream(subscriber)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Proxy tamponlamasını kapat
+        }
+    )
 
 
 @app.route('/api/historical-data/<int:transformer_id>', methods=['GET'])
 def get_historical_data(transformer_id):
-    """Tarihsel veriyi döner (grafik için)"""
-    data_file = DATA_GENERATION['output_file']
+    """
+    Tarihsel veriyi döner (grafik için).
     
-    if not os.path.exists(data_file):
-        return jsonify({'error': 'Tarihsel veri bulunamadı'}), 404
+    ?format=columnar ile satır listesi yerine kolon başına tek dizi
+    döner ({'timestamp': [...], 'toprak_direnci': [...], ...}).
+    """
+    # Depo ısınma adımında (CSV sonradan değiştiyse arka planda) üretilir;
+    # istek içinde üretilmez, üretim sürerken ilerlemeyle 503 döner
+    warmup.start()
+    building = warmup.step_status('history') in ('pending', 'running')
+    if not building and not is_current(DATA_GENERATION['columnar_dir'], DATA_GENERATION['output_file']):
+        building = reload_sensor_columns_async()
+    if building:
+        progress = {key: history_load[key] for key in ('state', 'rows', 'progress')}
+        response = jsonify({'error': 'Tarihsel veri hazırlanıyor', 'history': progress})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    if history_load['state'] == 'failed':
+        return jsonify({'error': f"Tarihsel veri yüklenemedi: {history_load['error']}"}), 503
     
     try:
+        # Memmap kolon deposu: CSV ayrıştırılmaz, trafonun satırları bitişik dilimdir
+        columns = sensor_columns
+        if columns is None:
+            return jsonify({'error': 'Tarihsel veri bulunamadı'}), 404
+        
         # Tarih aralığı parametreleri
         days = int(request.args.get('days', 7))  # Varsayılan 7 gün
         
-        df = pd.read_csv(data_file)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        
-        # Belirli trafo için filtrele
-        trafo_data = df[df['transformer_id'] == transformer_id].copy()
-        
         # Tarih aralığı
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        trafo_data = trafo_data[
-            (trafo_data['timestamp'] >= start_date) & 
-            (trafo_data['timestamp'] <= end_date)
-        ]
-        
-        # JSON formatına çevir
-        result = trafo_data[[
-            'timestamp', 'toprak_direnci', 'kacak_akim', 
+        # JSON formatına çevir (Timestamp/NumPy tipleri yanıt katmanında çevrilir)
+        rows = columns.rows(transformer_id, start_date, end_date)
+        trafo_data = columns.frame(rows, [
+            'timestamp', 'toprak_direnci', 'kacak_akim',
             'toprak_potansiyel', 'toprak_nemi', 'toprak_sicakligi',
             'korozyon_seviyesi', 'anomali'
-        ]].to_dict('records')
-        
-        # Timestamp'i string'e çevir
-        for record in result:
-            if isinstance(record['timestamp'], pd.Timestamp):
-                record['timestamp'] = record['timestamp'].isoformat()
+        ])
+        columnar = wants_columnar()
         
         return jsonify({
             'transformer_id': transformer_id,
-            'data': result,
-            'count': len(result),
+            'format': 'columnar' if columnar else 'records',
+            'data': frame_payload(trafo_data, columnar=columnar),
+            'count': len(trafo_data),
             'date_range': {
                 'start': start_date.isoformat(),
                 'end': end_date.isoformat()
@@ -326,108 +578,131 @@ def get_historical_data(transformer_id):
 
 @app.route('/api/alerts', methods=['GET'])
 def get_alerts():
-    """Bildirimleri döner"""
-    realtime_file = 'data/realtime_data.csv'
+    """
+    Bildirimleri döner (en yeni önce).
     
-    if not os.path.exists(realtime_file):
+    Bildirimler canlı akışa veri geldiğinde indekslenir; istek sırasında
+    CSV okunmaz. Parametreler:
+      - limit: Sayfa boyutu (varsayılan 50, en fazla 500)
+      - before: Bu id'den eski bildirimler (önceki yanıttaki next_before)
+      - transformer_id: Sadece bu trafonun bildirimleri
+      - severity: 'high', 'medium' veya 'info' (kapanan olaylar)
+    
+    Bildirimler her tick için değil, olay durumu değiştiğinde (açıldı,
+    yükseldi, kapandı) üretilir; aktif olay sayıları 'incidents' alanındadır.
+    """
+    if not os.path.exists(realtime_feed.data_file) and not len(realtime_feed.alert_index):
         return jsonify({'alerts': []})
     
     try:
-        df = pd.read_csv(realtime_file)
+        # Son okumadan sonra eklenen satırları indekse al
+        realtime_feed.poll()
         
-        # Yüksek riskli trafoları bul
-        alerts = []
-        high_risk = df[df['risk_score'] >= 70]
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        before = request.args.get('before', type=int)
+        transformer_id = request.args.get('transformer_id', type=int)
+        severity = request.args.get('severity')
         
-        for _, row in high_risk.iterrows():
-            alerts.append({
-                'timestamp': row.get('timestamp', datetime.now().isoformat()),
-                'transformer_id': int(row['transformer_id']),
-                'name': TRANSFORMER_LOCATIONS[int(row['transformer_id']) - 1]['name'],
-                'risk_score': float(row.get('risk_score', 0)),
-                'risk_level': row.get('risk_level', 'high'),
-                'message': f"Trafo {int(row['transformer_id'])}: Yüksek risk tespit edildi! (Risk: {float(row.get('risk_score', 0)):.1f})",
-                'severity': 'high' if row.get('risk_score', 0) >= 80 else 'medium'
-            })
+        alerts, next_before = realtime_feed.alert_index.query(
+            limit=limit,
+            before=before,
+            transformer_id=transformer_id,
+            severity=severity
+        )
         
-        # Tarihe göre sırala (en yeni önce)
-        alerts.sort(key=lambda x: x['timestamp'], reverse=True)
+        return jsonify({
+            'alerts': alerts,
+            'count': len(alerts),
+            'total': realtime_feed.alert_index.count(transformer_id, severity),
+            'next_before': next_before,
+            'incidents': realtime_feed.alert_engine.counts()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/incidents', methods=['GET'])
+def get_incidents():
+    """
+    Olay listesi (en yeni önce). Parametreler:
+      - status: 'active' (varsayılan), 'open', 'acknowledged', 'resolved' veya 'all'
+      - transformer_id: Sadece bu trafonun olayları
+      - limit: En fazla olay sayısı (varsayılan 100, en fazla 1000)
+    """
+    try:
+        realtime_feed.poll()
         
-        # Son 50 bildirimi al
-        alerts = alerts[:50]
+        status = request.args.get('status', 'active')
+        if status not in ('active', 'open', 'acknowledged', 'resolved', 'all'):
+            return jsonify({'error': f'Geçersiz durum: {status}'}), 400
+        limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+        
+        incidents = realtime_feed.alert_engine.incidents(
+            status=None if status == 'all' else status,
+            transformer_id=request.args.get('transformer_id', type=int),
+            limit=limit
+        )
         
         return jsonify({
-            'alerts': alerts,
-            'count': len(alerts)
+            'incidents': incidents,
+            'count': len(incidents),
+            'summary': realtime_feed.alert_engine.counts()
         })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/incidents/<int:incident_id>/acknowledge', methods=['POST'])
+def acknowledge_incident(incident_id):
+    """
+    Aktif olayı onaylar (isteğe bağlı JSON gövdesi: {"note": "..."}).
+    
+    Onay paylaşılan kayda (AcknowledgementStore) yazılır; diğer işçiler
+    bir sonraki sorguda olayı onaylı gösterir.
+    """
+    data = request.get_json(silent=True) or {}
+    # Olay bu işçide henüz işlenmemiş olabilir
+    realtime_feed.poll()
+    incident = realtime_feed.alert_engine.acknowledge(incident_id, note=data.get('note'))
+    
+    if incident is None:
+        return jsonify({'error': 'Aktif olay bulunamadı'}), 404
+    
+    return jsonify({'success': True, 'incident': incident})
+
+
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
-    """Genel istatistikleri döner"""
-    realtime_file = 'data/realtime_data.csv'
-    
-    if not os.path.exists(realtime_file):
-        return jsonify({
-            'total_transformers': NUM_TRANSFORMERS,
-            'high_risk': 0,
-            'medium_risk': 0,
-            'low_risk': 0,
-            'isolated': 0,
-            'total_alerts': 0,
-            'estimated_savings': 0
-        })
+    """
+    Genel istatistikleri döner.
     
+    Sayaçlar canlı akışa veri geldikçe artımlı güncellenir; istek
+    sırasında CSV okunmaz. total_alerts bildirim motorunun açtığı olay
+    sayısı, active_alerts açık/onaylı olaylardır (/api/alerts ile aynı
+    model); high_risk_readings eşik üstü (risk >= 70) toplam okuma sayısıdır.
+    """
     try:
-        df = pd.read_csv(realtime_file)
-        
-        # Son verileri al (her trafo için en son kayıt)
-        latest_data = []
-        for transformer_id in range(1, NUM_TRANSFORMERS + 1):
-            trafo_data = df[df['transformer_id'] == transformer_id]
-            if not trafo_data.empty:
-                latest_data.append(trafo_data.iloc[-1])
-        
-        if not latest_data:
-            return jsonify({
-                'total_transformers': NUM_TRANSFORMERS,
-                'high_risk': 0,
-                'medium_risk': 0,
-                'low_risk': 0,
-                'isolated': 0,
-                'total_alerts': 0,
-                'estimated_savings': 0
-            })
-        
-        # Risk seviyelerine göre say
-        high_risk = sum(1 for d in latest_data if d.get('risk_score', 0) >= 70)
-        medium_risk = sum(1 for d in latest_data if 40 <= d.get('risk_score', 0) < 70)
-        low_risk = sum(1 for d in latest_data if d.get('risk_score', 0) < 40)
-        
-        # İzole edilmiş trafolar (risk >= 80)
-        isolated = sum(1 for d in latest_data if d.get('risk_score', 0) >= 80)
-        
-        # Toplam bildirim sayısı
-        total_alerts = len(df[df['risk_score'] >= 70])
-        
-        # Tahmini tasarruf hesaplama
-        # Her yüksek riskli trafo için önleyici bakım = reaktif bakımdan tasarruf
-        estimated_savings = high_risk * (
-            ECONOMICS['reactive_maintenance_cost'] - 
-            ECONOMICS['preventive_maintenance_cost']
-        )
+        # Son okumadan sonra eklenen satırları uygula
+        realtime_feed.poll()
+        summary = realtime_feed.statistics.summary()
+        incidents = realtime_feed.alert_engine.counts()
         
         return jsonify({
             'total_transformers': NUM_TRANSFORMERS,
-            'high_risk': high_risk,
-            'medium_risk': medium_risk,
-            'low_risk': low_risk,
-            'isolated': isolated,
-            'total_alerts': total_alerts,
-            'estimated_savings': round(estimated_savings, 2)
+            'high_risk': summary['risk_distribution']['high'],
+            'medium_risk': summary['risk_distribution']['medium'],
+            'low_risk': summary['risk_distribution']['low'],
+            'isolated': summary['isolated_count'],
+            'anomalies': summary['anomaly_count'],
+            'average_risk': summary['average_risk'],
+            'max_risk': summary['max_risk'],
+            'min_risk': summary['min_risk'],
+            'total_alerts': incidents['totals']['opened'],
+            'active_alerts': incidents['open'] + incidents['acknowledged'],
+            'high_risk_readings': summary['high_risk_readings'],
+            'estimated_savings': round(summary['estimated_savings'], 2)
         })
     
     except Exception as e:
@@ -437,7 +712,7 @@ def get_statistics():
 @app.route('/api/predict', methods=['POST'])
 def predict():
     """Yeni sensör verisi için anomali tahmini yapar"""
-    if model is None:
+    if not warmup.require('model') or model is None:
         return jsonify({'error': 'Model yüklenemedi'}), 500
     
     try:
@@ -464,7 +739,7 @@ def predict():
             risk_level = 'high'
         
         return jsonify({
-            'is_anomaly': bool(is_anomaly),
+            'is_anomaly': is_anomaly,
             'anomaly_score': round(anomaly_score, 4),
             'risk_score': risk_score,
             'risk_level': risk_level,
@@ -481,16 +756,23 @@ if __name__ == '__main__':
     print("=" * 60)
     print(f"📡 API Endpoints:")
     print(f"   • GET  /api/health - Sağlık kontrolü")
+    print(f"   • GET  /api/ready - Hazır olma kontrolü (ısınma)")
     print(f"   • GET  /api/transformers - Tüm trafolar")
     print(f"   • GET  /api/transformer/<id> - Trafo detayı")
     print(f"   • GET  /api/realtime-data - Gerçek zamanlı veri")
+    print(f"   • GET  /api/regions - Bölge risk özetleri")
+    print(f"   • GET  /api/transformers/within - Alan/yarıçap içindeki trafolar")
+    print(f"   • GET  /api/stream - Canlı akış (Server-Sent Events)")
     print(f"   • GET  /api/historical-data/<id> - Tarihsel veri")
     print(f"   • GET  /api/alerts - Bildirimler")
+    print(f"   • GET  /api/incidents - Olaylar")
+    print(f"   • POST /api/incidents/<id>/acknowledge - Olay onayı")
     print(f"   • GET  /api/statistics - İstatistikler")
     print(f"   • POST /api/predict - Anomali tahmini")
     print("=" * 60)
     print(f"🌐 Server: http://localhost:5000")
     print("=" * 60)
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    start_background_tasks()
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
 
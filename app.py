@@ -20,34 +20,56 @@ from config import (
 )
 
 # Simülasyon sınıflarını import et
-from simulasyon import TransformerSimulator, AnomalyDetectionSystem, DataStorage
+from simulasyon import FleetSimulator, AnomalyDetectionSystem, DataStorage
+from yanit_katmani import init_response_layer, wants_columnar, frame_payload
+from puanlama_dongusu import FleetScoringLoop
+from veri_saklama import read_transformer_rows, segment_paths
 
 app = Flask(__name__)
 CORS(app)  # Frontend'den gelen isteklere izin ver
+init_response_layer(app)  # orjson + gzip/brotli
 
 # Global değişkenler
 detection_system = None
 transformers = []
 storage = None
+scoring_loop = None
 
-def initialize_system():
-    """Sistemi başlatır"""
-    global detection_system, transformers, storage
+def initialize_system(shared_state=None):
+    """
+    Sistemi başlatır.
+    
+    Args:
+        shared_state: Üretim sunucusunda işçilerin okuduğu paylaşımlı görüntü
+            (paylasimli_durum.SharedFleetView). Verilirse puanlama ayrı bir
+            süreçte yapılır ve bu süreç model çalıştırmaz.
+    """
+    global detection_system, transformers, storage, scoring_loop
+    
+    if shared_state is not None:
+        scoring_loop = shared_state
+        print("[OK] Sistem baslatildi (paylasimli goruntu)")
+        return
     
     # Anomali tespit sistemini başlat
     detection_system = AnomalyDetectionSystem()
     
-    # Trafoları oluştur
-    transformers = [
-        TransformerSimulator(i+1) 
-        for i in range(NUM_TRANSFORMERS)
-    ]
+    # Trafoları oluştur (vektörel filo; her eleman trafo görünümü döner)
+    transformers = FleetSimulator(NUM_TRANSFORMERS)
     
     # Veri depolama
     storage = DataStorage()
     
+    # Arka plan puanlama: okuma endpoint'leri sadece son görüntüyü döner
+    scoring_loop = FleetScoringLoop(transformers, detection_system)
+    scoring_loop.start()
+    
     print("[OK] Sistem baslatildi")
 
+def snapshot_response(body):
+    """Önceden serileştirilmiş görüntü gövdesini JSON yanıtı olarak döner"""
+    return app.response_class(body, mimetype='application/json')
+
 # API Endpoints
 
 @app.route('/api/health', methods=['GET'])
@@ -61,44 +83,9 @@ def health_check():
 
 @app.route('/api/transformers', methods=['GET'])
 def get_transformers():
-    """Tüm trafoların listesini döndürür"""
+    """Tüm trafoların listesini döndürür (son puanlama görüntüsünden)"""
     try:
-        transformers_list = []
-        
-        for transformer in transformers:
-            # Son sensör verisini al
-            sensor_data = transformer.generate_sensor_data()
-            
-            # Anomali analizi yap
-            analysis = detection_system.analyze_sensor_data(sensor_data)
-            transformer.risk_score = analysis['risk_score']
-            
-            transformers_list.append({
-                'id': transformer.transformer_id,
-                'name': transformer.location['name'],
-                'region': transformer.location['region'],
-                'latitude': float(transformer.location['latitude']),
-                'longitude': float(transformer.location['longitude']),
-                'risk_score': round(analysis['risk_score'], 2),
-                'risk_level': analysis['risk_level'],
-                'is_anomaly': bool(analysis['is_anomaly']),
-                'isolation_status': bool(transformer.isolation_status),
-                'last_update': str(transformer.last_update.isoformat()),
-                'sensor_data': {
-                    'toprak_direnci': float(sensor_data['toprak_direnci']),
-                    'kacak_akim': float(sensor_data['kacak_akim']),
-                    'toprak_potansiyel': float(sensor_data['toprak_potansiyel']),
-                    'toprak_nemi': float(sensor_data['toprak_nemi']),
-                    'toprak_sicakligi': float(sensor_data['toprak_sicakligi']),
-                    'korozyon_seviyesi': float(sensor_data['korozyon_seviyesi'])
-                }
-            })
-        
-        return jsonify({
-            'success': True,
-            'count': len(transformers_list),
-            'transformers': transformers_list
-        })
+        return snapshot_response(scoring_loop.snapshot.transformers_json)
     
     except Exception as e:
         return jsonify({
@@ -116,34 +103,11 @@ def get_transformer(transformer_id):
                 'error': 'Geçersiz trafo ID'
             }), 404
         
-        transformer = transformers[transformer_id - 1]
-        sensor_data = transformer.generate_sensor_data()
-        analysis = detection_system.analyze_sensor_data(sensor_data)
-        transformer.risk_score = analysis['risk_score']
-        
+        snapshot = scoring_loop.snapshot
         return jsonify({
             'success': True,
-            'transformer': {
-                'id': transformer.transformer_id,
-                'name': transformer.location['name'],
-                'region': transformer.location['region'],
-                'latitude': float(transformer.location['latitude']),
-                'longitude': float(transformer.location['longitude']),
-                'risk_score': round(analysis['risk_score'], 2),
-                'risk_level': analysis['risk_level'],
-                'is_anomaly': bool(analysis['is_anomaly']),
-                'anomaly_score': float(analysis['anomaly_score']),
-                'isolation_status': bool(transformer.isolation_status),
-                'last_update': str(transformer.last_update.isoformat()),
-                'sensor_data': {
-                    'toprak_direnci': float(sensor_data['toprak_direnci']),
-                    'kacak_akim': float(sensor_data['kacak_akim']),
-                    'toprak_potansiyel': float(sensor_data['toprak_potansiyel']),
-                    'toprak_nemi': float(sensor_data['toprak_nemi']),
-                    'toprak_sicakligi': float(sensor_data['toprak_sicakligi']),
-                    'korozyon_seviyesi': float(sensor_data['korozyon_seviyesi'])
-                }
-            }
+            'version': snapshot.version,
+            'transformer': snapshot.by_id[transformer_id]
         })
     
     except Exception as e:
@@ -154,41 +118,32 @@ def get_transformer(transformer_id):
 
 @app.route('/api/transformers/<int:transformer_id>/history', methods=['GET'])
 def get_transformer_history(transformer_id):
-    """Trafo geçmiş verilerini döndürür"""
+    """Trafo geçmiş verilerini döndürür (?format=columnar ile kolon dizileri)"""
     try:
         # CSV dosyasından veri oku
         data_file = 'data/realtime_data.csv'
         
-        if not os.path.exists(data_file):
+        if not os.path.exists(data_file) and not segment_paths('raw'):
             return jsonify({
                 'success': True,
                 'history': []
             })
         
-        df = pd.read_csv(data_file)
-        df = df[df['transformer_id'] == transformer_id]
+        # Son 100 kaydı al (aktif dosya yetmezse döndürülmüş bölümlerden)
+        df = read_transformer_rows(transformer_id, 100, data_file)
         
-        # Son 100 kaydı al
-        df = df.tail(100)
-        
-        history = []
-        for _, row in df.iterrows():
-            history.append({
-                'timestamp': row['timestamp'],
-                'toprak_direnci': float(row.get('toprak_direnci', 0)),
-                'kacak_akim': float(row.get('kacak_akim', 0)),
-                'toprak_potansiyel': float(row.get('toprak_potansiyel', 0)),
-                'toprak_nemi': float(row.get('toprak_nemi', 0)),
-                'toprak_sicakligi': float(row.get('toprak_sicakligi', 0)),
-                'korozyon_seviyesi': float(row.get('korozyon_seviyesi', 0)),
-                'risk_score': float(row.get('risk_score', 0)),
-                'is_anomaly': bool(row.get('is_anomaly', False))
-            })
+        df = df.reindex(columns=[
+            'timestamp', 'toprak_direnci', 'kacak_akim',
+            'toprak_potansiyel', 'toprak_nemi', 'toprak_sicakligi',
+            'korozyon_seviyesi', 'risk_score', 'is_anomaly'
+        ])
+        columnar = wants_columnar()
         
         return jsonify({
             'success': True,
-            'count': len(history),
-            'history': history
+            'count': len(df),
+            'format': 'columnar' if columnar else 'records',
+            'history': frame_payload(df, columnar=columnar)
         })
     
     except Exception as e:
@@ -199,45 +154,9 @@ def get_transformer_history(transformer_id):
 
 @app.route('/api/dashboard/stats', methods=['GET'])
 def get_dashboard_stats():
-    """Dashboard için istatistikleri döndürür"""
+    """Dashboard için istatistikleri döndürür (son puanlama görüntüsünden)"""
     try:
-        # Tüm trafoları güncelle
-        risk_scores = []
-        anomaly_count = 0
-        isolated_count = 0
-        
-        for transformer in transformers:
-            sensor_data = transformer.generate_sensor_data()
-            analysis = detection_system.analyze_sensor_data(sensor_data)
-            transformer.risk_score = analysis['risk_score']
-            
-            risk_scores.append(analysis['risk_score'])
-            if analysis['is_anomaly']:
-                anomaly_count += 1
-            if not transformer.isolation_status:
-                isolated_count += 1
-        
-        # Risk seviyelerine göre sayılar
-        high_risk = sum(1 for r in risk_scores if r >= 70)
-        medium_risk = sum(1 for r in risk_scores if 40 <= r < 70)
-        low_risk = sum(1 for r in risk_scores if r < 40)
-        
-        return jsonify({
-            'success': True,
-            'stats': {
-                'total_transformers': NUM_TRANSFORMERS,
-                'anomaly_count': anomaly_count,
-                'isolated_count': isolated_count,
-                'risk_distribution': {
-                    'high': high_risk,
-                    'medium': medium_risk,
-                    'low': low_risk
-                },
-                'average_risk': round(sum(risk_scores) / len(risk_scores), 2) if risk_scores else 0,
-                'max_risk': round(max(risk_scores), 2) if risk_scores else 0,
-                'min_risk': round(min(risk_scores), 2) if risk_scores else 0
-            }
-        })
+        return snapshot_response(scoring_loop.snapshot.stats_json)
     
     except Exception as e:
         return jsonify({
@@ -255,22 +174,24 @@ def isolate_transformer(transformer_id):
                 'error': 'Geçersiz trafo ID'
             }), 404
         
-        transformer = transformers[transformer_id - 1]
         data = request.get_json() or {}
         action = data.get('action', 'isolate')  # 'isolate' veya 'restore'
         
         if action == 'isolate':
-            transformer.isolation_status = False
+            isolation_status = False
             message = f"Trafo {transformer_id} izole edildi"
         else:
-            transformer.isolation_status = True
+            isolation_status = True
             message = f"Trafo {transformer_id} izolasyondan çıkarıldı"
         
+        # Görüntü hemen yeniden yayınlanır (model tekrar çalıştırılmaz)
+        scoring_loop.set_isolation(transformer_id, isolation_status)
+        
         return jsonify({
             'success': True,
             'message': message,
             'transformer_id': transformer_id,
-            'isolation_status': transformer.isolation_status
+            'isolation_status': isolation_status
         })
     
     except Exception as e:
@@ -284,7 +205,7 @@ def get_alerts():
     """Bildirimleri döndürür"""
     try:
         # Son 50 bildirimi al
-        alerts = detection_system.alerts[-50:] if detection_system.alerts else []
+        alerts = scoring_loop.snapshot.alerts
         
         return jsonify({
             'success': True,
@@ -298,6 +219,51 @@ def get_alerts():
             'error': str(e)
         }), 500
 
+@app.route('/api/incidents', methods=['GET'])
+def get_incidents():
+    """Aktif olayları döndürür (isteğe bağlı transformer_id filtresi)"""
+    try:
+        incidents = scoring_loop.snapshot.incidents
+        transformer_id = request.args.get('transformer_id', type=int)
+        if transformer_id is not None:
+            incidents = [i for i in incidents if i['transformer_id'] == transformer_id]
+        
+        return jsonify({
+            'success': True,
+            'count': len(incidents),
+            'incidents': incidents
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/incidents/<int:incident_id>/acknowledge', methods=['POST'])
+def acknowledge_incident(incident_id):
+    """Aktif olayı onaylar"""
+    try:
+        data = request.get_json(silent=True) or {}
+        incident = scoring_loop.acknowledge(incident_id, data.get('note'))
+        
+        if incident is None:
+            return jsonify({
+                'success': False,
+                'error': 'Aktif olay bulunamadı'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'incident': incident
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Sistem konfigürasyonunu döndürür"""
@@ -348,6 +314,8 @@ if __name__ == '__main__':
     print("   GET  /api/dashboard/stats - Dashboard istatistikleri")
     print("   POST /api/transformers/<id>/isolate - Trafo izolasyonu")
     print("   GET  /api/alerts - Bildirimler")
+    print("   GET  /api/incidents - Aktif olaylar")
+    print("   POST /api/incidents/<id>/acknowledge - Olay onayi")
     print("   GET  /api/config - Sistem konfigurasyonu")
     print("\nServer: http://localhost:5000")
     print("=" * 60)
@@ -0,0 +1,120 @@
+"""
+Başlangıç Profili
+Sunucu modüllerinin import süresini (python -X importtime) ve hazır olma
+süresini (import + ısınma adımları) her ölçüm için temiz bir alt süreçte
+raporlar.
+
+    python baslangic_profili.py                      # api_server, chat_llm, app
+    python baslangic_profili.py --module api_server --top 20
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+MODULES = ['api_server', 'chat_llm', 'app']
+
+# Alt süreçte import + ısınma süresini ölçen kod (sonuç son satırda JSON)
+READY_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import {module} as module
+imported = time.perf_counter()
+warmup = getattr(module, 'warmup', None)
+steps = {{}}
+if warmup is not None:
+    warmup.run()
+    steps = {{name: step['duration'] for name, step in warmup.status()['steps'].items()}}
+print(json.dumps({{
+    'import': imported - started,
+    'ready': time.perf_counter() - started,
+    'steps': steps
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime çıktısını çözer.
+    
+    Returns:
+        list: (kümülatif mikrosaniye, kendi mikrosaniye, modül adı)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return rows
+
+
+def profile_imports(module):
+    """Modülün import ağacı (sadece import, ısınma adımları çalışmaz)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def profile_ready(module):
+    """Import ve hazır olma süreleri (saniye) + ısınma adımı süreleri"""
+    result = subprocess.run(
+        [sys.executable, '-c', READY_SCRIPT.format(module=module)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def report(module, top):
+    """Tek modülün raporunu yazdırır"""
+    print("=" * 60)
+    print(f"📦 {module}")
+    print("=" * 60)
+    
+    try:
+        rows = profile_imports(module)
+        timing = profile_ready(module)
+    except RuntimeError as e:
+        print(f"❌ Profil alınamadı: {e}")
+        return
+    
+    total = next((row[0] for row in rows if row[2] == module), 0)
+    print(f"Import süresi (importtime): {total / 1e6:.3f} sn")
+    print(f"Import süresi (duvar saati): {timing['import']:.3f} sn")
+    print(f"Hazır olma süresi (import + ısınma): {timing['ready']:.3f} sn")
+    for name, duration in timing['steps'].items():
+        print(f"   ısınma/{name}: {duration if duration is not None else '-'} sn")
+    
+    # En pahalı üst seviye paketler (alt modüller kendi paketinin içinde sayılır)
+    top_level = {}
+    for cumulative, _self, name in rows:
+        root = name.split('.')[0]
+        if root != module and name == root:
+            top_level[root] = max(top_level.get(root, 0), cumulative)
+    
+    print(f"\nEn yavaş {top} import (kümülatif):")
+    for root, cumulative in sorted(top_level.items(), key=lambda item: -item[1])[:top]:
+        print(f"   {cumulative / 1e3:8.1f} ms  {root}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sunucu modüllerinin başlangıç profili')
+    parser.add_argument('--module', action='append', choices=MODULES,
+                        help='Profillenecek modül (tekrarlanabilir, varsayılan: hepsi)')
+    parser.add_argument('--top', type=int, default=10, help='Listelenecek import sayısı')
+    args = parser.parse_args()
+    
+    for module in args.module or MODULES:
+        report(module, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark ortak fixture'ları
+Sentetik filolar (120 / 10k / 100k trafo), geçmiş veriler (1 gün / 1 yıl),
+eğitilmiş model ve geçici çalışma klasörü sağlar.
+
+Çalıştırma:
+    python -m pytest benchmarks/            # hızlı set
+    python -m pytest benchmarks/ --bench-full  # büyük kombinasyonlar dahil
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+sys.path.insert(0, str(REPO_ROOT))
+
+FLEET_SIZES = {
+    '120': 120,
+    '10k': 10_000,
+    '100k': 100_000
+}
+
+HISTORY_HOURS = {
+    '1gun': 24,
+    '1yil': 24 * 365
+}
+
+FAKE_FIRESTORE_LATENCY = 0.005     # Saniye - sahte Firestore uzak çağrı gecikmesi
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-full', action='store_true', default=False,
+                     help='Yavaş benchmark kombinasyonlarını da çalıştır (1 yıl geçmiş, satır bazlı 10k)')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'full: sadece --bench-full ile çalışan yavaş benchmark')
+    
+    # Sonuçları regresyon karşılaştırması için varsayılan olarak JSON'a yaz
+    if getattr(config.option, 'benchmark_json', None) is None and hasattr(config.option, 'benchmark_json'):
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        config.option.benchmark_json = str(RESULTS_DIR / f'benchmark_{stamp}.json')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--bench-full'):
+        return
+    skip_full = pytest.mark.skip(reason='--bench-full ile çalıştırın')
+    for item in items:
+        if 'full' in item.keywords:
+            item.add_marker(skip_full)
+
+
+def full_only(value, label=None):
+    """Parametreyi sadece --bench-full ile çalışacak şekilde işaretler"""
+    return pytest.param(value, id=label, marks=pytest.mark.full)
+
+
+def make_sensor_array(num_rows, seed=0):
+    """FEATURE_COLUMNS sırasıyla normal aralıkta sentetik sensör dizisi"""
+    from simulasyon import BASE_VALUE_RANGES, NOISE_STD
+    
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(BASE_VALUE_RANGES[:, 0], BASE_VALUE_RANGES[:, 1], size=(num_rows, 6))
+    return np.round(base + rng.normal(size=(num_rows, 6)) * NOISE_STD, 2)
+
+
+def make_history(num_transformers, hours, end=None, seed=0):
+    """
+    veri_uret çıktısı formatında (saatlik, zaman + trafo sıralı) sentetik
+    geçmiş üretir. veri_uret'in satır bazlı döngüsü yerine vektörel üretim.
+    """
+    from model_egit import FEATURE_COLUMNS
+    
+    if end is None:
+        end = datetime.now().replace(minute=0, second=0, microsecond=0)
+    timestamps = pd.date_range(end=end, periods=hours, freq='h')
+    
+    values = make_sensor_array(hours * num_transformers, seed)
+    df = pd.DataFrame(values, columns=FEATURE_COLUMNS)
+    df.insert(0, 'transformer_id', np.tile(np.arange(1, num_transformers + 1), hours))
+    df.insert(0, 'timestamp', np.repeat(timestamps, num_transformers))
+    df['anomali'] = (np.random.default_rng(seed).random(len(df)) < 0.02).astype(int)
+    return df
+
+
+def score_history(history, detection_system):
+    """Geçmişi realtime_data.csv formatına çevirir (tek seferde skorlanır)"""
+    from model_egit import FEATURE_COLUMNS
+    from simulasyon import REALTIME_COLUMNS, transformer_location
+    
+    analysis = detection_system.analyze_batch(history[FEATURE_COLUMNS].to_numpy())
+    locations = pd.DataFrame(
+        [transformer_location(int(tid)) for tid in np.unique(history['transformer_id'])]
+    ).set_index('id')
+    
+    df = history.drop(columns=['anomali']).copy()
+    df['timestamp'] = df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    for key in ('latitude', 'longitude', 'name', 'region'):
+        df[key] = locations[key].reindex(df['transformer_id']).to_numpy()
+    for key, column in analysis.items():
+        df[key] = column
+    return df[REALTIME_COLUMNS]
+
+
+@pytest.fixture(scope='session')
+def workspace(tmp_path_factory):
+    """
+    Geçici çalışma klasörü. Modüller 'data/' ve 'models/' yollarını göreli
+    kullandığı için oturum boyunca bu klasöre geçilir.
+    """
+    path = tmp_path_factory.mktemp('topraklama')
+    (path / 'data').mkdir()
+    (path / 'models').mkdir()
+    
+    previous = os.getcwd()
+    os.chdir(path)
+    yield path
+    os.chdir(previous)
+
+
+@pytest.fixture(scope='session')
+def trained_model(workspace):
+    """Sentetik normal veriyle eğitilip models/anomali_model.pkl'e kaydedilen model"""
+    from model_egit import train_isolation_forest, save_model
+    
+    model, scaler = train_isolation_forest(make_sensor_array(20_000, seed=1), contamination=0.1)
+    save_model(model, scaler)
+    return model, scaler
+
+
+@pytest.fixture(scope='session')
+def detection_system(trained_model):
+    from simulasyon import AnomalyDetectionSystem
+    return AnomalyDetectionSystem()
+
+
+@pytest.fixture(scope='session', params=list(FLEET_SIZES), ids=list(FLEET_SIZES))
+def fleet(request):
+    """Tohumlanmış FleetSimulator (120 / 10k / 100k trafo)"""
+    from simulasyon import FleetSimulator
+    return FleetSimulator(FLEET_SIZES[request.param], seed=0)
+
+
+@pytest.fixture
+def fake_firestore():
+    """
+    Sahte Firestore fabrikası: make(**backend_options) -> (istemci, FirestoreBackend).
+    Her uzak çağrı FAKE_FIRESTORE_LATENCY saniye sürer.
+    """
+    from depolama import FirestoreBackend
+    from sahte_firestore import FakeFirestoreClient
+    
+    def make(**backend_options):
+        client = FakeFirestoreClient(latency=FAKE_FIRESTORE_LATENCY)
+        return client, FirestoreBackend(client, **backend_options)
+    
+    return make
+
+
+@pytest.fixture(scope='session')
+def history_files(workspace, detection_system):
+    """
+    Geçmiş uzunluğuna göre data/sensor_data.csv ve data/realtime_data.csv
+    dosyalarını yazan fabrika (aynı uzunluk tekrar istenirse yeniden yazılmaz).
+    """
+    from config import NUM_TRANSFORMERS, DATA_GENERATION
+    
+    state = {'current': None}
+    
+    def write(label):
+        if state['current'] == label:
+            return
+        history = make_history(NUM_TRANSFORMERS, HISTORY_HOURS[label])
+        history.to_csv(DATA_GENERATION['output_file'], index=False, encoding='utf-8-sig')
+        score_history(history, detection_system).to_csv('data/realtime_data.csv', index=False)
+        state['current'] = label
+    
+    return write
+
+
+def record_latency(benchmark):
+    """Benchmark tur sürelerinden p50/p99 gecikmeyi JSON çıktısına ekler"""
+    # --benchmark-disable: fonksiyon bir kez çalışır, istatistik tutulmaz
+    if benchmark.disabled or benchmark.stats is None:
+        return
+    data = np.array(benchmark.stats.stats.data) * 1000
+    benchmark.extra_info['p50_ms'] = round(float(np.percentile(data, 50)), 3)
+    benchmark.extra_info['p99_ms'] = round(float(np.percentile(data, 99)), 3)
@@ -0,0 +1,97 @@
+"""
+API gecikme benchmark'ları
+api_server.py ve app.py endpoint'lerinin Flask test client üzerinden
+p50/p99 gecikmeleri (sonuçlar extra_info altında JSON'a yazılır).
+"""
+
+import pytest
+
+from conftest import full_only, record_latency
+
+API_SERVER_ENDPOINTS = [
+    '/api/health',
+    '/api/transformers',
+    '/api/transformer/1',
+    '/api/realtime-data',
+    '/api/historical-data/1',
+    '/api/alerts',
+    '/api/statistics'
+]
+
+APP_ENDPOINTS = [
+    '/api/health',
+    '/api/transformers',
+    '/api/transformers/1',
+    '/api/transformers/1/history',
+    '/api/dashboard/stats',
+    '/api/alerts',
+    '/api/config'
+]
+
+HISTORIES = ['1gun', full_only('1yil')]
+
+PREDICT_PAYLOAD = {
+    'toprak_direnci': 3.5,
+    'kacak_akim': 5.0,
+    'toprak_potansiyel': 1.0,
+    'toprak_nemi': 40.0,
+    'toprak_sicakligi': 20.0,
+    'korozyon_seviyesi': 15.0
+}
+
+
+@pytest.fixture(scope='session')
+def api_server_client(trained_model):
+    import api_server
+    api_server.init_model()
+    return api_server.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def app_client(trained_model):
+    import app
+    app.initialize_system()
+    return app.app.test_client()
+
+
+def _rounds(history):
+    return 50 if history == '1gun' else 5
+
+
+@pytest.mark.parametrize('history', HISTORIES)
+@pytest.mark.parametrize('path', API_SERVER_ENDPOINTS)
+def test_api_server_get(benchmark, api_server_client, history_files, history, path):
+    import api_server
+    history_files(history)
+    # Kolon deposu istek dışında üretilir; ölçümden önce bu geçmiş için hazırla
+    api_server.warmup.require('history')
+    api_server.load_sensor_columns()
+    
+    def request():
+        response = api_server_client.get(path)
+        assert response.status_code == 200
+    
+    benchmark.pedantic(request, rounds=_rounds(history), iterations=1, warmup_rounds=1)
+    record_latency(benchmark)
+
+
+def test_api_server_predict(benchmark, api_server_client):
+    def request():
+        response = api_server_client.post('/api/predict', json=PREDICT_PAYLOAD)
+        assert response.status_code == 200
+    
+    benchmark.pedantic(request, rounds=200, iterations=1, warmup_rounds=5)
+    record_latency(benchmark)
+
+
+@pytest.mark.parametrize('history', HISTORIES)
+@pytest.mark.parametrize('path', APP_ENDPOINTS)
+def test_app_get(benchmark, app_client, history_files, history, path):
+    history_files(history)
+    
+    def request():
+        response = app_client.get(path)
+        assert response.status_code == 200
+    
+    benchmark.pedantic(request, rounds=_rounds(history), iterations=1, warmup_rounds=1)
+    record_latency(benchmark)
@@ -0,0 +1,138 @@
+"""
+Depolama benchmark'ları
+DataStorage.save_data (kayıt başına) ve DataStorage.save_batch (tick başına)
+yazma verimi; sahte Firestore'da (sabit gecikmeli) tek tek ve toplu yazma
+ile pano yoklamasında son kayıt okumaları (önbellekli / önbelleksiz).
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture
+def storage(workspace):
+    from simulasyon import DataStorage
+    
+    storage = DataStorage(storage_type='csv')
+    storage.data_file = 'data/bench_realtime.csv'
+    yield storage
+    if os.path.exists(storage.data_file):
+        os.remove(storage.data_file)
+
+
+def test_save_data_per_record(benchmark, storage, detection_system):
+    from simulasyon import FleetSimulator
+    
+    fleet = FleetSimulator(120, seed=0)
+    values = fleet.generate_tick()
+    analysis = detection_system.analyze_batch(values)
+    records = fleet.to_dataframe(values, analysis).to_dict('records')
+    sensor_keys = list(records[0])[:12]
+    pairs = [
+        ({k: r[k] for k in sensor_keys}, {k: r[k] for k in list(r)[12:]})
+        for r in records
+    ]
+    
+    def save_all():
+        for sensor_data, analysis_result in pairs:
+            storage.save_data(sensor_data, analysis_result)
+    
+    benchmark.extra_info['rows'] = len(pairs)
+    benchmark.pedantic(save_all, rounds=5, iterations=1)
+
+
+def test_save_batch(benchmark, storage, detection_system, fleet):
+    values = fleet.generate_tick()
+    analysis = detection_system.analyze_batch(values)
+    df = fleet.to_dataframe(values, analysis)
+    
+    benchmark.extra_info['rows'] = len(df)
+    benchmark.pedantic(storage.save_batch, args=(df,), rounds=5, iterations=1)
+
+
+@pytest.fixture
+def tick_records(detection_system):
+    from simulasyon import FleetSimulator
+    
+    fleet = FleetSimulator(120, seed=0)
+    values = fleet.generate_tick()
+    return fleet.to_dataframe(values, detection_system.analyze_batch(values))
+
+
+@pytest.mark.parametrize('batch_size', [1, 250], ids=['kayit_basina', 'tamponlu'])
+def test_firestore_fake_add(benchmark, fake_firestore, tick_records, batch_size):
+    client, backend = fake_firestore(batch_size=batch_size)
+    records = tick_records.to_dict('records')
+    
+    def add_all():
+        for record in records:
+            backend.add(record)
+        backend.flush()
+    
+    benchmark.pedantic(add_all, setup=client.reset_stats, rounds=3, iterations=1)
+    benchmark.extra_info['rows'] = len(records)
+    benchmark.extra_info.update(client.stats)
+
+
+def test_firestore_fake_write_batch(benchmark, fake_firestore, tick_records):
+    client, backend = fake_firestore()
+    
+    benchmark.pedantic(backend.write_batch, args=(tick_records,), setup=client.reset_stats, rounds=3, iterations=1)
+    benchmark.extra_info['rows'] = len(tick_records)
+    benchmark.extra_info.update(client.stats)
+
+
+@pytest.mark.parametrize('ttl', [0, 2], ids=['onbelleksiz', 'onbellekli'])
+def test_firestore_fake_latest_polling(benchmark, fake_firestore, tick_records, ttl):
+    """8 pano x 20 yoklama (toplu son durum + tek trafo detayı)"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    client, backend = fake_firestore(latest_cache_ttl=ttl)
+    backend.write_batch(tick_records)
+    
+    def poll(dashboard):
+        for i in range(20):
+            backend.latest()
+            backend.latest(int(tick_records['transformer_id'].iloc[(dashboard * 20 + i) % len(tick_records)]))
+    
+    def setup():
+        backend.latest_cache.invalidate()
+        client.reset_stats()
+    
+    def poll_all():
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(poll, range(8)))
+    
+    benchmark.pedantic(poll_all, setup=setup, rounds=3, iterations=1)
+    benchmark.extra_info['requests'] = 8 * 20 * 2
+    benchmark.extra_info.update(client.stats)
+
+
+def test_alert_ring_concurrent_append(benchmark):
+    from concurrent.futures import ThreadPoolExecutor
+    from durum_deposu import AlertRingBuffer
+    
+    threads, per_thread, capacity = 8, 2000, 100
+    
+    def append_concurrently():
+        ring = AlertRingBuffer(capacity=capacity)
+        
+        def writer(worker):
+            for i in range(per_thread):
+                ring.append((worker, i))
+        
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(writer, range(threads)))
+        return ring
+    
+    ring = benchmark.pedantic(append_concurrently, rounds=5, iterations=1)
+    
+    # Hiçbir ekleme kaybolmaz, baş geri gitmez; halka tam ve yazarlar sırasını korur
+    assert ring.total == threads * per_thread
+    assert len(ring) == capacity
+    snapshot = ring.snapshot()
+    assert len(snapshot) == capacity
+    for worker in range(threads):
+        own = [i for w, i in snapshot if w == worker]
+        assert own == sorted(own)
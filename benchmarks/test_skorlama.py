@@ -0,0 +1,40 @@
+"""
+Skorlama benchmark'ları
+predict_anomaly satır bazlı (her okuma için ayrı çağrı) ile
+AnomalyDetectionSystem.analyze_batch (tek çağrı) karşılaştırması.
+"""
+
+import pytest
+
+from conftest import FLEET_SIZES, full_only, make_sensor_array
+
+
+@pytest.mark.parametrize('size', ['120', full_only('10k')])
+def test_predict_per_row(benchmark, detection_system, size):
+    from model_egit import FEATURE_COLUMNS
+    
+    rows = [
+        dict(zip(FEATURE_COLUMNS, values))
+        for values in make_sensor_array(FLEET_SIZES[size]).tolist()
+    ]
+    
+    def score_rows():
+        for row in rows:
+            detection_system.analyze_sensor_data(row)
+    
+    benchmark.extra_info['rows'] = len(rows)
+    benchmark.pedantic(score_rows, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize('size', list(FLEET_SIZES))
+def test_predict_batch(benchmark, detection_system, size):
+    sensor_array = make_sensor_array(FLEET_SIZES[size])
+    
+    benchmark.extra_info['rows'] = len(sensor_array)
+    benchmark(detection_system.analyze_batch, sensor_array)
+
+
+def test_fleet_tick(benchmark, fleet):
+    """Filo için bir tick'lik sensör verisi üretimi (rng.normal(size=(N, 6)))"""
+    benchmark.extra_info['rows'] = len(fleet)
+    benchmark(fleet.generate_tick)
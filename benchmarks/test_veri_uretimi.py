@@ -0,0 +1,28 @@
+"""
+Veri üretimi benchmark'ı
+veri_uret.generate_all_data süresi (1 gün / 1 yıl geçmiş).
+"""
+
+import pytest
+
+from conftest import HISTORY_HOURS, full_only
+
+
+@pytest.mark.parametrize('history', ['1gun', full_only('1yil')])
+def test_generate_all_data(benchmark, workspace, history):
+    from datetime import datetime, timedelta
+    import veri_uret
+    
+    start = datetime(2024, 1, 1)
+    end = start + timedelta(hours=HISTORY_HOURS[history] - 1)
+    
+    benchmark.pedantic(
+        veri_uret.generate_all_data,
+        kwargs={
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'output_file': 'data/bench_sensor_data.csv'
+        },
+        rounds=1,
+        iterations=1
+    )
@@ -0,0 +1,129 @@
+"""
+Bildirim İndeksi
+Canlı akışa gelen bildirimleri geliş sırasıyla saklar; trafo, önem
+derecesi ve ikisinin birleşimi için artan id listeleri (posting list)
+tutar. En yeni N bildirim, filtre ne olursa olsun O(N) ile döner.
+"""
+
+import threading
+from bisect import bisect_left
+
+# Varsayılan saklanan bildirim sayısı (aşılınca en eskiler atılır)
+DEFAULT_MAX_ALERTS = 100000
+
+
+class AlertIndex:
+    """
+    Sadece eklenen, zaman sıralı bildirim indeksi.
+    
+    Her bildirime artan bir 'id' verilir. Sayfalama bu id ile yapılır:
+    query(before=<id>) verilen id'den daha eski bildirimleri döner.
+    """
+    
+    def __init__(self, max_alerts=DEFAULT_MAX_ALERTS):
+        self.max_alerts = max_alerts
+        self._alerts = []           # id sırasıyla bildirimler
+        self._base = 1              # self._alerts[0]'ın id'si
+        self._next_id = 1
+        self._postings = {}         # filtre anahtarı -> artan id listesi
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _keys(transformer_id, severity):
+        return (
+            ('transformer', transformer_id),
+            ('severity', severity),
+            ('transformer_severity', transformer_id, severity)
+        )
+    
+    def extend(self, alerts):
+        """
+        Yeni bildirimleri ekler (her birine 'id' alanı yazılır).
+        
+        Args:
+            alerts: Geliş sırasıyla bildirim dict listesi
+        """
+        if not alerts:
+            return
+        with self._lock:
+            for alert in alerts:
+                alert_id = self._next_id
+                self._next_id += 1
+                alert['id'] = alert_id
+                self._alerts.append(alert)
+                for key in self._keys(alert['transformer_id'], alert['severity']):
+                    self._postings.setdefault(key, []).append(alert_id)
+            
+            # Sınır iki katına çıkınca toplu kırp (ekleme başına amortize O(1))
+            if len(self._alerts) > 2 * self.max_alerts:
+                self._compact_locked()
+    
+    def _compact_locked(self):
+        drop = len(self._alerts) - self.max_alerts
+        self._alerts = self._alerts[drop:]
+        self._base += drop
+        for key in list(self._postings):
+            ids = self._postings[key]
+            start = bisect_left(ids, self._base)
+            if start == len(ids):
+                del self._postings[key]
+            elif start:
+                self._postings[key] = ids[start:]
+    
+    def clear(self):
+        """Tüm bildirimleri siler (id'ler artmaya devam eder)"""
+        with self._lock:
+            self._alerts = []
+            self._base = self._next_id
+            self._postings = {}
+    
+    def _ids_locked(self, transformer_id, severity):
+        """Filtreye uyan id listesi (None = filtre yok, tüm bildirimler)"""
+        if transformer_id is not None and severity is not None:
+            return self._postings.get(('transformer_severity', transformer_id, severity), [])
+        if transformer_id is not None:
+            return self._postings.get(('transformer', transformer_id), [])
+        if severity is not None:
+            return self._postings.get(('severity', severity), [])
+        return None
+    
+    def query(self, limit=50, before=None, transformer_id=None, severity=None):
+        """
+        En yeni bildirimleri döner (yeniden eskiye).
+        
+        Args:
+            limit: En fazla bildirim sayısı
+            before: Sadece bu id'den eski bildirimler (sayfalama imleci)
+            transformer_id: Trafo filtresi
+            severity: Önem derecesi filtresi ('high' / 'medium')
+        
+        Returns:
+            tuple: (bildirim listesi, sonraki sayfa için before değeri veya None)
+        """
+        limit = max(int(limit), 0)
+        with self._lock:
+            ids = self._ids_locked(transformer_id, severity)
+            if ids is None:
+                # Filtre yok: id = base + konum
+                end = len(self._alerts)
+                if before is not None:
+                    end = min(max(before - self._base, 0), end)
+                start = max(end - limit, 0)
+                page = self._alerts[start:end]
+            else:
+                end = len(ids) if before is None else bisect_left(ids, before)
+                start = max(end - limit, 0)
+                page = [self._alerts[alert_id - self._base] for alert_id in ids[start:end]]
+        
+        page.reverse()
+        next_before = page[-1]['id'] if page and start > 0 else None
+        return page, next_before
+    
+    def count(self, transformer_id=None, severity=None):
+        """Filtreye uyan saklı bildirim sayısı"""
+        with self._lock:
+            ids = self._ids_locked(transformer_id, severity)
+            return len(self._alerts) if ids is None else len(ids)
+    
+    def __len__(self):
+        return len(self._alerts)
@@ -0,0 +1,364 @@
+"""
+Bildirim Motoru
+Yüksek risk bildirimlerini her tick için değil, her olay (incident) için
+üretir. Olay yaşam döngüsü: açık (open) → onaylandı (acknowledged) →
+kapandı (resolved).
+
+- Histerezis: olay risk >= open_threshold ile açılır, risk
+  resolve_threshold'un altına inene kadar açık kalır (eşik etrafındaki
+  salınım yeni olay üretmez).
+- Bekleme (cooldown): kapanan olaydan sonra aynı trafo için
+  cooldown_minutes boyunca (veri zamanı) yeni olay açılmaz.
+- Olay açıkken gelen yüksek okumalar bildirim üretmez; olay üzerinde
+  sayılır (occurrences, peak_risk) ve bastırılan bildirim sayısına eklenir.
+- Onaylar (AcknowledgementStore) süreçler arasında paylaşılır: aynı veriyi
+  işleyen her işçi (sunucu.py) olayı (trafo, açılış zamanı) anahtarıyla
+  tanır ve başka işçide yapılan onayı bir sonraki sorguda uygular.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from config import ALERT_CONFIG, RISK_SCORING
+
+ACTIVE_STATUSES = ('open', 'acknowledged')
+
+
+def _risk_level(risk_score):
+    if risk_score < RISK_SCORING['low']['max']:
+        return 'low'
+    if risk_score < RISK_SCORING['medium']['max']:
+        return 'medium'
+    return 'high'
+
+
+def _to_datetime(timestamp):
+    if isinstance(timestamp, datetime):
+        return timestamp
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp)
+    import pandas as pd
+    return pd.Timestamp(timestamp).to_pydatetime()
+
+
+class AcknowledgementStore:
+    """
+    Olay onaylarının süreçler arası paylaşılan kaydı (SQLite WAL).
+    
+    Onay (scope, trafo, açılış zamanı) anahtarıyla tutulur; scope veri
+    kaynağının kimliğidir (canli_akis epoch), böylece baştan başlayan veri
+    eski onayları devralmaz. Bağlantı süreç başınadır (fork sonrası yeniden açılır).
+    """
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS acknowledgements ("
+        "scope TEXT NOT NULL, transformer_id INTEGER NOT NULL, opened_at TEXT NOT NULL, "
+        "acknowledged_at TEXT NOT NULL, note TEXT, "
+        "PRIMARY KEY (scope, transformer_id, opened_at))"
+    )
+    
+    def __init__(self, path=ALERT_CONFIG['acknowledgements_path']):
+        self.path = path
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def _connect_locked(self):
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            with self._connection:
+                self._connection.execute(self.SCHEMA)
+            self._pid = os.getpid()
+        return self._connection
+    
+    def add(self, scope, transformer_id, opened_at, acknowledged_at, note):
+        """Onayı kaydeder (aynı olay daha önce onaylandıysa değişmez)"""
+        with self._lock:
+            connection = self._connect_locked()
+            with connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO acknowledgements VALUES (?, ?, ?, ?, ?)",
+                    (scope, transformer_id, opened_at, acknowledged_at, note)
+                )
+    
+    def since(self, cursor):
+        """
+        Returns:
+            tuple: (cursor'dan sonra eklenen onaylar, yeni cursor)
+        """
+        with self._lock:
+            rows = self._connect_locked().execute(
+                "SELECT rowid, scope, transformer_id, opened_at, acknowledged_at, note "
+                "FROM acknowledgements WHERE rowid > ? ORDER BY rowid",
+                (cursor,)
+            ).fetchall()
+        return [row[1:] for row in rows], rows[-1][0] if rows else cursor
+
+
+class AlertEngine:
+    """
+    Trafo başına olay durumu tutan bildirim motoru.
+    
+    evaluate() bir tick'in risk skorlarını alır ve sadece durum
+    değişikliklerini (açıldı / yükseldi / kapandı) bildirim olarak döner.
+    Süreler okumaların zaman damgasına göre hesaplanır; aynı veri aynı
+    sırayla işlendiğinde aynı olaylar üretilir.
+    """
+    
+    def __init__(self, config=None, name_of=None, acknowledgements=None, scope=''):
+        config = {**ALERT_CONFIG, **(config or {})}
+        self.open_threshold = config['open_threshold']
+        self.high_threshold = config['high_threshold']
+        self.resolve_threshold = config['resolve_threshold']
+        self.cooldown = timedelta(minutes=config['cooldown_minutes'])
+        self.name_of = name_of or (lambda transformer_id: f"Trafo {transformer_id}")
+        
+        self._active = {}               # transformer_id -> açık/onaylı olay
+        self._by_id = {}                # incident_id -> aktif olay
+        self._resolved = deque(maxlen=config['max_resolved_history'])
+        self._cooldown_until = {}       # transformer_id -> yeni olay açılabilecek zaman
+        self._next_id = 1
+        self._totals = {'opened': 0, 'escalated': 0, 'resolved': 0, 'acknowledged': 0, 'suppressed': 0}
+        self._lock = threading.Lock()
+        
+        # Paylaşılan onaylar (None = sadece bu süreç)
+        self.acknowledgements = acknowledgements
+        self.scope = scope
+        self._acks = {}                 # (scope, transformer_id, opened_at) -> (acknowledged_at, note)
+        self._ack_cursor = 0
+    
+    # --- Değerlendirme ---
+    
+    def evaluate(self, transformer_ids, risk_scores, timestamp):
+        """
+        Bir tick'in risk skorlarını değerlendirir.
+        
+        Args:
+            transformer_ids: (N,) trafo ID'leri
+            risk_scores: (N,) risk skorları
+            timestamp: Okuma zamanı (datetime veya ISO metin)
+        
+        Returns:
+            list: Durum değişikliği bildirimleri (bildirim indeksi formatında)
+        """
+        ids = np.asarray(transformer_ids)
+        risks = np.asarray(risk_scores, dtype=float)
+        when = _to_datetime(timestamp)
+        events = []
+        
+        with self._lock:
+            self._sync_locked()
+            # Eşik üstü okumalar: yeni olay, yükselme veya bastırılan tekrar
+            above = np.flatnonzero(risks >= self.open_threshold)
+            for transformer_id, risk in zip(ids[above].tolist(), risks[above].tolist()):
+                incident = self._active.get(transformer_id)
+                if incident is None:
+                    until = self._cooldown_until.get(transformer_id)
+                    if until is not None and when < until:
+                        self._totals['suppressed'] += 1
+                        continue
+                    incident = self._open_locked(transformer_id, risk, when)
+                    events.append(self._event(incident, 'opened', risk, when))
+                    continue
+                
+                incident['occurrences'] += 1
+                incident['last_risk'] = risk
+                incident['peak_risk'] = max(incident['peak_risk'], risk)
+                incident['updated_at'] = when.isoformat()
+                if incident['severity'] == 'medium' and risk >= self.high_threshold:
+                    incident['severity'] = 'high'
+                    self._totals['escalated'] += 1
+                    events.append(self._event(incident, 'escalated', risk, when))
+                else:
+                    self._totals['suppressed'] += 1
+            
+            # Histerezis alt eşiğinin altına inen aktif olaylar kapanır
+            if self._active:
+                below = np.flatnonzero(risks < self.resolve_threshold)
+                for transformer_id, risk in zip(ids[below].tolist(), risks[below].tolist()):
+                    incident = self._active.get(transformer_id)
+                    if incident is not None:
+                        self._resolve_locked(incident, risk, when)
+                        events.append(self._event(incident, 'resolved', risk, when))
+        
+        return events
+    
+    def _open_locked(self, transformer_id, risk, when):
+        incident = {
+            'incident_id': self._next_id,
+            'transformer_id': transformer_id,
+            'name': self.name_of(transformer_id),
+            'status': 'open',
+            'severity': 'high' if risk >= self.high_threshold else 'medium',
+            'opened_at': when.isoformat(),
+            'updated_at': when.isoformat(),
+            'acknowledged_at': None,
+            'acknowledged_note': None,
+            'resolved_at': None,
+            'first_risk': risk,
+            'last_risk': risk,
+            'peak_risk': risk,
+            'occurrences': 1
+        }
+        self._next_id += 1
+        self._active[transformer_id] = incident
+        self._by_id[incident['incident_id']] = incident
+        self._totals['opened'] += 1
+        # Başka işçi bu olayı (bu süreç yetişmeden) onaylamış olabilir
+        ack = self._acks.get((self.scope, transformer_id, incident['opened_at']))
+        if ack is not None:
+            self._apply_ack_locked(incident, *ack)
+        return incident
+    
+    def _resolve_locked(self, incident, risk, when):
+        incident['status'] = 'resolved'
+        incident['last_risk'] = risk
+        incident['resolved_at'] = when.isoformat()
+        incident['updated_at'] = when.isoformat()
+        del self._active[incident['transformer_id']]
+        del self._by_id[incident['incident_id']]
+        self._resolved.append(incident)
+        self._cooldown_until[incident['transformer_id']] = when + self.cooldown
+        self._totals['resolved'] += 1
+    
+    def _event(self, incident, event_type, risk, when):
+        """Olay değişikliğinden bildirim kaydı"""
+        transformer_id = incident['transformer_id']
+        if event_type == 'opened':
+            message = f"Trafo {transformer_id}: Yüksek risk tespit edildi! (Risk: {risk:.1f})"
+        elif event_type == 'escalated':
+            message = f"Trafo {transformer_id}: Risk kritik seviyeye yükseldi! (Risk: {risk:.1f})"
+        else:
+            message = (f"Trafo {transformer_id}: Risk normale döndü "
+                       f"(Risk: {risk:.1f}, en yüksek: {incident['peak_risk']:.1f})")
+        
+        return {
+            'timestamp': when.isoformat(),
+            'type': event_type,
+            'incident_id': incident['incident_id'],
+            'transformer_id': transformer_id,
+            'name': incident['name'],
+            'risk_score': round(risk, 2),
+            'risk_level': _risk_level(risk),
+            'message': message,
+            'severity': 'info' if event_type == 'resolved' else incident['severity'],
+            'status': incident['status']
+        }
+    
+    # --- Yönetim ---
+    
+    def acknowledge(self, incident_id, note=None, timestamp=None):
+        """
+        Aktif olayı onaylar (olay kapanana kadar aktif kalır).
+        
+        Returns:
+            dict: Olayın kopyası, olay bulunamazsa (veya kapanmışsa) None
+        """
+        with self._lock:
+            self._sync_locked()
+            incident = self._by_id.get(incident_id)
+            if incident is None:
+                return None
+            if incident['status'] == 'open':
+                when = _to_datetime(timestamp) if timestamp is not None else datetime.now()
+                self._apply_ack_locked(incident, when.isoformat(), note)
+                if self.acknowledgements is not None:
+                    self.acknowledgements.add(
+                        self.scope, incident['transformer_id'], incident['opened_at'], when.isoformat(), note
+                    )
+            return dict(incident)
+    
+    def _apply_ack_locked(self, incident, acknowledged_at, note):
+        incident['status'] = 'acknowledged'
+        incident['acknowledged_at'] = acknowledged_at
+        incident['acknowledged_note'] = note
+        self._totals['acknowledged'] += 1
+    
+    def _sync_locked(self):
+        """Diğer süreçlerin onaylarını okur ve açık olaylara uygular"""
+        if self.acknowledgements is None:
+            return
+        rows, self._ack_cursor = self.acknowledgements.since(self._ack_cursor)
+        for scope, transformer_id, opened_at, acknowledged_at, note in rows:
+            self._acks[(scope, transformer_id, opened_at)] = (acknowledged_at, note)
+            incident = self._active.get(transformer_id)
+            if scope == self.scope and incident is not None and incident['opened_at'] == opened_at \
+                    and incident['status'] == 'open':
+                self._apply_ack_locked(incident, acknowledged_at, note)
+    
+    def reset(self, scope=None):
+        """
+        Tüm olay durumunu siler (veri kaynağı baştan başladığında).
+        
+        Args:
+            scope: Yeni veri kaynağının kimliği (paylaşılan onaylar bu kapsamda eşleşir)
+        """
+        with self._lock:
+            if scope is not None:
+                self.scope = scope
+                self._acks = {key: ack for key, ack in self._acks.items() if key[0] == scope}
+            self._active.clear()
+            self._by_id.clear()
+            self._resolved.clear()
+            self._cooldown_until.clear()
+            for key in self._totals:
+                self._totals[key] = 0
+    
+    # --- Sorgular ---
+    
+    def get(self, incident_id):
+        """Olay kopyası (aktif veya son kapananlar arasında)"""
+        with self._lock:
+            self._sync_locked()
+            incident = self._by_id.get(incident_id)
+            if incident is None:
+                incident = next((i for i in self._resolved if i['incident_id'] == incident_id), None)
+            return dict(incident) if incident is not None else None
+    
+    def incidents(self, status=None, transformer_id=None, limit=None):
+        """
+        Olay listesi (en yeni önce).
+        
+        Args:
+            status: 'open', 'acknowledged', 'resolved', 'active' veya None (hepsi)
+            transformer_id: Trafo filtresi
+            limit: En fazla olay sayısı
+        """
+        with self._lock:
+            self._sync_locked()
+            if status in ('active',) + ACTIVE_STATUSES:
+                pool = list(self._by_id.values())
+            elif status == 'resolved':
+                pool = list(self._resolved)
+            else:
+                pool = list(self._by_id.values()) + list(self._resolved)
+            
+            result = [
+                dict(incident) for incident in pool
+                if (status in (None, 'active') or incident['status'] == status)
+                and (transformer_id is None or incident['transformer_id'] == transformer_id)
+            ]
+        result.sort(key=lambda incident: incident['incident_id'], reverse=True)
+        return result[:limit] if limit is not None else result
+    
+    def counts(self):
+        """Özet sayılar: aktif olaylar ve motor başlangıcından beri toplamlar"""
+        with self._lock:
+            self._sync_locked()
+            active = list(self._active.values())
+            return {
+                'open': sum(1 for incident in active if incident['status'] == 'open'),
+                'acknowledged': sum(1 for incident in active if incident['status'] == 'acknowledged'),
+                'active_high': sum(1 for incident in active if incident['severity'] == 'high'),
+                'active_medium': sum(1 for incident in active if incident['severity'] == 'medium'),
+                'totals': dict(self._totals)
+            }
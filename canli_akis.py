@@ -0,0 +1,429 @@
+"""
+Canlı Veri Akışı
+Simülasyonun yazdığı realtime_data.csv dosyasını tek bir arka plan iş
+parçacığıyla takip eder ve her tick'te sadece değişen trafoları ve yeni
+bildirimleri tüm abonelere (Server-Sent Events) yayınlar.
+"""
+
+import io
+import queue
+import threading
+import time
+from datetime import datetime
+
+from config import NUM_TRANSFORMERS, TRANSFORMER_LOCATIONS
+from yanit_katmani import dumps
+from bildirim_indeksi import AlertIndex
+from bildirim_motoru import AcknowledgementStore, AlertEngine
+from istatistik_toplayici import FleetStatistics
+from konum_indeksi import SpatialIndex
+from veri_saklama import CsvTail
+
+SENSOR_FIELDS = [
+    'toprak_direnci',
+    'kacak_akim',
+    'toprak_potansiyel',
+    'toprak_nemi',
+    'toprak_sicakligi',
+    'korozyon_seviyesi'
+]
+
+# Değişim karşılaştırmasında kullanılan alanlar (timestamp hariç)
+COMPARE_FIELDS = SENSOR_FIELDS + ['risk_score', 'risk_level', 'is_anomaly']
+
+# Bu riskin üstündeki trafolar izole sayılır (otomatik izolasyon eşiği)
+ISOLATION_RISK = 80
+
+
+def build_record(row):
+    """CSV satırını /api/realtime-data kayıt formatına çevirir"""
+    transformer_id = int(row['transformer_id'])
+    location = TRANSFORMER_LOCATIONS[transformer_id - 1]
+    record = {
+        'transformer_id': transformer_id,
+        'name': location['name'],
+        'latitude': location['latitude'],
+        'longitude': location['longitude'],
+        'region': location['region']
+    }
+    for field in SENSOR_FIELDS:
+        record[field] = float(row.get(field, 0))
+    record.update({
+        'risk_score': float(row.get('risk_score', 0)),
+        'risk_level': row.get('risk_level', 'unknown'),
+        'risk_color': row.get('risk_color', 'gray'),
+        'is_anomaly': str(row.get('is_anomaly', False)) == 'True',
+        'timestamp': row.get('timestamp', datetime.now().isoformat())
+    })
+    return record
+
+
+def default_record(transformer_id):
+    """Henüz verisi olmayan trafo için varsayılan kayıt (/api/realtime-data ile aynı)"""
+    location = TRANSFORMER_LOCATIONS[transformer_id - 1]
+    record = {
+        'transformer_id': transformer_id,
+        'name': location['name'],
+        'latitude': location['latitude'],
+        'longitude': location['longitude'],
+        'region': location['region']
+    }
+    for field in SENSOR_FIELDS:
+        record[field] = 0
+    record.update({
+        'risk_score': 0,
+        'risk_level': 'unknown',
+        'risk_color': 'gray',
+        'is_anomaly': False,
+        'timestamp': datetime.now().isoformat()
+    })
+    return record
+
+
+class RealtimeFeed:
+    """
+    realtime_data.csv takipçisi ve yayıncısı.
+    
+    Dosya sadece bir kez (kaldığı yerden, yeni eklenen baytlar) okunur;
+    trafo başına son kayıt bellekte tutulur. Her yeni tick'te değişen
+    trafolar ve yeni bildirimler tek seferde serileştirilip tüm abone
+    kuyruklarına dağıtılır (N pano = 1 dosya okuması + N kuyruk yazması).
+    """
+    
+    def __init__(self, data_file='data/realtime_data.csv', poll_interval=1.0,
+                 read_block_size=8 * 1024 * 1024, max_recent_alerts=50, subscriber_queue_size=100,
+                 max_indexed_alerts=None):
+        self.data_file = data_file
+        self.poll_interval = poll_interval
+        self.read_block_size = read_block_size
+        self.subscriber_queue_size = subscriber_queue_size
+        
+        self.latest = {}                # transformer_id -> kayıt
+        # Dosya takibinde versiyon = okunan bayt konumu, epoch = dosyanın
+        # başlık + ilk satır özeti (döndürmeler boyunca korunur, bkz.
+        # veri_saklama.py). Böylece aynı dosyayı okuyan tüm işçi
+        # süreçleri (sunucu.py) aynı ETag'leri üretir. Dosya yokken (veya
+        # Firebase'den beslenirken) versiyon her değişen tick'te bir artar.
+        self.version = 0
+        self.versions = {}              # transformer_id -> son değiştiği versiyon
+        self.epoch = format(int(time.time() * 1000), 'x')
+        self.max_recent_alerts = max_recent_alerts     # Snapshot ile gönderilen bildirim
+        self.alert_index = AlertIndex() if max_indexed_alerts is None else AlertIndex(max_indexed_alerts)
+        # Onaylar işçi süreçleri arasında paylaşılır; kapsam dosya epoch'u
+        self.alert_engine = AlertEngine(
+            name_of=lambda tid: TRANSFORMER_LOCATIONS[tid - 1]['name'],
+            acknowledgements=AcknowledgementStore(),
+            scope=self.epoch
+        )
+        self.statistics = FleetStatistics(NUM_TRANSFORMERS)
+        self.spatial_index = SpatialIndex(TRANSFORMER_LOCATIONS)
+        self.region_statistics = {
+            region: FleetStatistics(len(ids)) for region, ids in self.spatial_index.regions.items()
+        }
+        
+        self._lock = threading.Lock()          # Durum + abone listesi
+        self._start_lock = threading.Lock()
+        self._poll_lock = threading.Lock()     # Dosya okuma konumu
+        self._subscribers = set()
+        self._tail = CsvTail(data_file, read_block_size)
+        self._thread = None
+        self._stop = threading.Event()
+    
+    # --- Takip ---
+    
+    def start(self):
+        """Arka plan takip iş parçacığını başlatır (birden çok çağrı güvenli)"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            # İlk okuma: mevcut dosyayı yakala, geçmişi yayınlama
+            self.poll(publish=False)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='realtime-feed', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️ Canlı akış okuma hatası: {e}")
+    
+    def poll(self, publish=True):
+        """Dosyaya eklenen yeni satırları okur ve uygular"""
+        with self._poll_lock:
+            self._poll_locked(publish)
+    
+    def _poll_locked(self, publish):
+        import pandas as pd     # İlk okumada yüklenir (import süresini kısaltır)
+        
+        # Döndürülen dosyanın kalanı bölümden okunur ve yeni dosyaya kesintisiz
+        # geçilir; silinip yeniden oluşturulan dosya (veri_temizle) baştan okunur
+        for event, payload in self._tail.read():
+            if event == 'start':
+                with self._lock:
+                    self.epoch = payload['epoch']
+                    self.versions.clear()
+                    self.alert_index.clear()
+                    self.alert_engine.reset(scope=self.epoch)
+                    self.statistics.reset()
+                    for statistics in self.region_statistics.values():
+                        statistics.reset()
+                continue
+            
+            csv_bytes, position = payload
+            df = pd.read_csv(io.BytesIO(csv_bytes), dtype={'is_anomaly': str})
+            self.apply_records(df, publish=publish, version=position)
+    
+    # --- Durum güncelleme ---
+    
+    def apply_records(self, df, publish=True, version=None):
+        """
+        Yeni kayıtları uygular; değişen trafoları ve bildirimleri yayınlar.
+        
+        Args:
+            df: realtime_data.csv kolonlarıyla DataFrame
+            publish: Abonelere delta gönder
+            version: Yeni versiyon (dosya konumu); None ise bir artırılır
+        """
+        df = df[(df['transformer_id'] >= 1) & (df['transformer_id'] <= NUM_TRANSFORMERS)]
+        
+        alerts = self._evaluate_alerts(df)
+        
+        records = [
+            build_record(row)
+            for row in df.drop_duplicates('transformer_id', keep='last').to_dict('records')
+        ]
+        
+        # Durum güncellemesi ve yayın aynı kilit altında: yeni abone
+        # snapshot ile ilk delta arasında hiçbir tick'i kaçırmaz
+        with self._lock:
+            changed = []
+            for record in records:
+                previous = self.latest.get(record['transformer_id'])
+                if previous is None or any(previous[f] != record[f] for f in COMPARE_FIELDS):
+                    changed.append(record)
+                self.latest[record['transformer_id']] = record
+            
+            if records:
+                risks = [record['risk_score'] for record in records]
+                self.statistics.update_many(
+                    [record['transformer_id'] for record in records],
+                    risks,
+                    is_anomaly=[record['is_anomaly'] for record in records],
+                    isolated=[risk >= ISOLATION_RISK for risk in risks],
+                    readings=df['risk_score'].to_numpy(dtype=float) if 'risk_score' in df else risks
+                )
+                self._update_region_statistics(records, df)
+            
+            self.alert_index.extend(alerts)
+            if not changed and not alerts:
+                if version is not None:
+                    self.version = version
+                return
+            
+            self.version = version if version is not None else self.version + 1
+            for record in changed:
+                self.versions[record['transformer_id']] = self.version
+            if publish:
+                self._publish_locked('delta', {
+                    'version': self.version,
+                    'timestamp': datetime.now().isoformat(),
+                    'changed': changed,
+                    'alerts': alerts
+                })
+    
+    def _update_region_statistics(self, records, df):
+        """Bölge istatistiklerini sadece veri gelen bölgeler için günceller"""
+        by_region = {}
+        for record in records:
+            by_region.setdefault(record['region'], []).append(record)
+        
+        if 'risk_score' in df:
+            regions = self.spatial_index.region_of(df['transformer_id'].to_numpy())
+            readings = df['risk_score'].groupby(regions).agg(list).to_dict()
+        else:
+            readings = {}
+        
+        for region, region_records in by_region.items():
+            risks = [record['risk_score'] for record in region_records]
+            self.region_statistics[region].update_many(
+                [record['transformer_id'] for record in region_records],
+                risks,
+                is_anomaly=[record['is_anomaly'] for record in region_records],
+                isolated=[risk >= ISOLATION_RISK for risk in risks],
+                readings=readings.get(region, risks)
+            )
+    
+    def _evaluate_alerts(self, df):
+        """Satırları tick (timestamp) grupları halinde bildirim motorundan geçirir"""
+        if df.empty:
+            return []
+        if 'timestamp' not in df:
+            return self.alert_engine.evaluate(
+                df['transformer_id'].to_numpy(), df['risk_score'].to_numpy(dtype=float), datetime.now()
+            )
+        
+        alerts = []
+        for timestamp, group in df.groupby('timestamp', sort=False):
+            alerts.extend(self.alert_engine.evaluate(
+                group['transformer_id'].to_numpy(),
+                group['risk_score'].to_numpy(dtype=float),
+                timestamp
+            ))
+        return alerts
+    
+    # --- Sorgular ---
+    
+    @staticmethod
+    def format_etag(epoch, version):
+        """Epoch + versiyon için ETag değeri (tırnaksız)"""
+        return f'{epoch}-{version}'
+    
+    @property
+    def etag(self):
+        """Geçerli veri versiyonu için ETag değeri (tırnaksız)"""
+        with self._lock:
+            return self.format_etag(self.epoch, self.version)
+    
+    def snapshot(self, transformer_ids=None):
+        """
+        Trafoların son durumu (verisi olmayanlar varsayılan değerlerle).
+        
+        Args:
+            transformer_ids: Sıralı trafo ID'leri (None = tüm filo)
+        
+        Returns:
+            tuple: (epoch, versiyon, kayıt listesi) - aynı kilit altında okunur
+        """
+        if transformer_ids is None:
+            transformer_ids = range(1, NUM_TRANSFORMERS + 1)
+        with self._lock:
+            return self.epoch, self.version, [
+                self.latest.get(tid) or default_record(tid)
+                for tid in transformer_ids
+            ]
+    
+    def changed_since(self, since, transformer_ids=None):
+        """
+        Verilen versiyondan sonra değişen trafolar.
+        
+        Args:
+            since: İstemcinin son gördüğü versiyon
+            transformer_ids: Sıralı trafo ID'leri (None = tüm filo)
+        
+        Returns:
+            tuple: (epoch, versiyon, kayıt listesi) - aynı kilit altında okunur
+        """
+        with self._lock:
+            candidates = sorted(self.latest) if transformer_ids is None else transformer_ids
+            return self.epoch, self.version, [
+                self.latest[tid]
+                for tid in candidates
+                if self.versions.get(tid, 0) > since
+            ]
+    
+    def region_summaries(self):
+        """
+        Bölge başına risk özeti (artımlı sayaçlardan, sabit zaman).
+        
+        Returns:
+            list: Bölge adına göre sıralı özetler
+        """
+        return [
+            {
+                'region': region,
+                'transformer_count': len(self.spatial_index.regions[region]),
+                **self.spatial_index.region_bounds(region),
+                'stats': self.region_statistics[region].summary()
+            }
+            for region in sorted(self.spatial_index.regions)
+        ]
+    
+    # --- Yayın ---
+    
+    def subscribe(self):
+        """Yeni abone kuyruğu döner (ilk mesaj tam durum - snapshot)"""
+        subscriber = queue.Queue(maxsize=self.subscriber_queue_size)
+        with self._lock:
+            subscriber.put(self._snapshot_event_locked())
+            self._subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+    
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+    
+    def snapshot_event(self):
+        """Yeni bağlanan pano için tüm trafoların son durumu"""
+        with self._lock:
+            return self._snapshot_event_locked()
+    
+    def _snapshot_event_locked(self):
+        return self.format_event('snapshot', {
+            'version': self.version,
+            'timestamp': datetime.now().isoformat(),
+            'data': [
+                self.latest.get(tid) or default_record(tid)
+                for tid in range(1, NUM_TRANSFORMERS + 1)
+            ],
+            'alerts': self.alert_index.query(limit=self.max_recent_alerts)[0]
+        })
+    
+    @staticmethod
+    def format_event(event, payload):
+        """SSE mesajı (tek sefer serileştirilir, tüm abonelere aynı bayt dizisi)"""
+        return f"event: {event}\ndata: {dumps(payload)}\n\n"
+    
+    def publish(self, event, payload):
+        """Mesajı tüm abonelere gönderir"""
+        with self._lock:
+            self._publish_locked(event, payload)
+    
+    def _publish_locked(self, event, payload):
+        message = self.format_event(event, payload)
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Yavaş istemci - bağlantıyı kapat, yeniden bağlanınca snapshot alır
+                self._subscribers.discard(subscriber)
+                self._close(subscriber)
+    
+    @staticmethod
+    def _close(subscriber):
+        """Kuyruğu boşaltıp akışı sonlandıran işareti bırakır"""
+        try:
+            while True:
+                subscriber.get_nowait()
+        except queue.Empty:
+            pass
+        subscriber.put_nowait(None)
+    
+    def stream(self, subscriber, heartbeat=15):
+        """
+        Abone kuyruğundan SSE mesajları üretir (Flask Response için generator).
+        
+        Args:
+            subscriber: subscribe() ile alınan kuyruk
+            heartbeat: Boşta kalma süresi sonrası gönderilen ping aralığı (saniye)
+        """
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': ping\n\n'
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
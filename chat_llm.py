@@ -1,14 +1,20 @@
 """
 Dinamik Chat Sistemi - LLM Entegrasyonu
 Model eğitimi ve dinamik analiz için
+
+LLM istemcisi, anomali modeli ve tarihsel veri import sırasında değil,
+arka plan ısınma görevinde yüklenir (bkz. isinma.py, /api/chat/ready).
 """
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import pandas as pd
+import io
 import os
 import json
+import threading
+import time
 from datetime import datetime, timedelta
+import numpy as np
 import requests
 from typing import Dict, List, Optional
 
@@ -18,9 +24,12 @@ from config import (
     NUM_TRANSFORMERS,
     TRANSFORMER_LOCATIONS,
     SENSOR_RANGES,
-    RISK_SCORING
+    RISK_SCORING,
+    CHAT_DATA
 )
-from simulasyon import TransformerSimulator, AnomalyDetectionSystem
+from isinma import WarmUp
+from veri_saklama import CsvTail, segment_paths
+from kolon_deposu import open_sensor_columns
 
 app = Flask(__name__)
 CORS(app)
@@ -32,47 +41,260 @@ api_base_url = 'http://localhost:5000/api'
 model = None
 scaler = None
 
-# LLM için (Ollama veya OpenAI)
-try:
-    import ollama
-    USE_OLLAMA = True
-    print("[OK] Ollama bulundu - Yerel LLM kullanilacak")
-except ImportError:
-    USE_OLLAMA = False
-    try:
-        from openai import OpenAI
-        client = OpenAI()
-        USE_OPENAI = True
-        print("[OK] OpenAI bulundu")
-    except:
-        USE_OPENAI = False
-        print("[!] LLM bulunamadi - Basit analiz kullanilacak")
+# LLM için (Ollama veya OpenAI) - detect_llm() ısınma adımında belirlenir
+USE_OLLAMA = False
+USE_OPENAI = False
+
+warmup = WarmUp('chat_llm')
+
+# realtime_data.csv tek seferde en fazla bu kadar bayt okunur
+REALTIME_READ_BLOCK = 8 * 1024 * 1024
+
+# Trafo başına birleştirilmeden bekleyen parça sınırı (aşılınca birleştirilip budanır)
+REALTIME_MAX_PENDING = 32
 
 
 class ChatDataAccess:
     """Chat için veri erişim katmanı - Dinamik veri çekme"""
     
-    def __init__(self):
+    def __init__(self, retention_days=CHAT_DATA['retention_days']):
         self.api_base = api_base_url
         self.sensor_data_path = 'data/sensor_data.csv'
         self.realtime_data_path = 'data/realtime_data.csv'
-        self.sensor_df = None
-        self.realtime_df = None
-        
+        self.retention_days = retention_days
+        
+        # (SensorColumns, saklama alt sınırı); tek atamayla yayınlanır
+        self._history = None
+        self._progress_lock = threading.Lock()
+        self._progress = {'state': 'pending', 'rows': 0, 'progress': 0.0, 'duration': None, 'error': None}
+        
+        # Canlı veri: trafo başına zaman sıralı DataFrame + henüz birleştirilmemiş yeni parçalar.
+        # Yenileme sadece dosyaya eklenen baytları okur (RealtimeFeed ile aynı CsvTail).
+        self._realtime = {}             # transformer_id -> DataFrame
+        self._realtime_pending = {}     # transformer_id -> [DataFrame, ...]
+        self._realtime_latest = None    # En yeni kayıt zamanı (saklama süresi buna göre)
+        self._realtime_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._realtime_tail = CsvTail(self.realtime_data_path, REALTIME_READ_BLOCK)
+        self._refresh_info = {'rows_appended': 0, 'last_refresh': None}
+        self._refresh_thread = None
+        self._refresh_stop = threading.Event()
+    
+    @property
+    def has_history(self):
+        """Tarihsel veri yüklendi mi (yükleme bitene kadar False)"""
+        return self._history is not None
+    
     def load_historical_data(self):
-        """Tarihsel verileri yükle"""
+        """
+        Tarihsel verileri memmap kolon deposundan açar (kolon_deposu.py).
+        
+        Depo yoksa ya da CSV değişmişse CSV'den bir kez üretilir; bu sürerken
+        chat geçmiş bağlamı olmadan yanıt verir. İlerleme load_progress() ile
+        izlenir. Veri süreç belleğine kopyalanmaz; diğer süreçlerle aynı
+        sayfa önbelleği paylaşılır.
+        """
+        started = time.perf_counter()
         try:
-            if os.path.exists(self.sensor_data_path):
-                print(f"Tarihsel veri yukleniyor: {self.sensor_data_path}")
-                self.sensor_df = pd.read_csv(self.sensor_data_path)
-                self.sensor_df['timestamp'] = pd.to_datetime(self.sensor_df['timestamp'])
-                print(f"[OK] {len(self.sensor_df):,} kayit yuklendi")
-            if os.path.exists(self.realtime_data_path):
-                self.realtime_df = pd.read_csv(self.realtime_data_path)
-                if 'timestamp' in self.realtime_df.columns:
-                    self.realtime_df['timestamp'] = pd.to_datetime(self.realtime_df['timestamp'])
+            print(f"Tarihsel veri yukleniyor: {self.sensor_data_path}")
+            self._set_progress(state='loading')
+            columns = open_sensor_columns(
+                self.sensor_data_path,
+                progress=lambda rows, ratio: self._set_progress(rows=rows, progress=round(ratio, 3))
+            )
+            if columns is not None:
+                # Saklama süresi en yeni kayda göre; eski satırlar sadece okunmaz
+                latest = columns.column('timestamp').max() if len(columns) else None
+                cutoff = latest - np.timedelta64(self.retention_days, 'D') if latest is not None else None
+                self._history = (columns, cutoff)
+                self._set_progress(rows=len(columns))
+                print(f"[OK] {len(columns):,} kayit acildi ({time.perf_counter() - started:.2f} sn)")
+            self.load_realtime_segments()
+            self.refresh_realtime()
+            self._set_progress(
+                state='ready' if self._history is not None else 'missing',
+                progress=1.0,
+                duration=round(time.perf_counter() - started, 3)
+            )
         except Exception as e:
             print(f"Veri yukleme hatasi: {e}")
+            self._set_progress(state='failed', error=str(e), duration=round(time.perf_counter() - started, 3))
+            raise
+    
+    def history_for(self, transformer_id):
+        """
+        Trafonun saklama süresi içindeki zaman sıralı tarihsel kayıtları.
+        
+        Returns:
+            DataFrame veya None: Veri yüklenmediyse ya da trafo kaydı yoksa None
+        """
+        history = self._history
+        if history is None:
+            return None
+        columns, cutoff = history
+        rows = columns.rows(transformer_id, start=cutoff)
+        if rows.stop <= rows.start:
+            return None
+        return columns.frame(rows)
+    
+    def _set_progress(self, **values):
+        with self._progress_lock:
+            self._progress.update(values)
+    
+    def load_progress(self):
+        """Tarihsel veri yükleme ve canlı veri yenileme durumu (/api/chat/health)"""
+        with self._progress_lock:
+            progress = dict(self._progress)
+        with self._realtime_lock:
+            progress['realtime'] = {
+                'transformers': len(self._realtime.keys() | self._realtime_pending.keys()),
+                'rows_appended': self._refresh_info['rows_appended'],
+                'last_refresh': self._refresh_info['last_refresh'],
+                'latest_timestamp': self._realtime_latest.isoformat() if self._realtime_latest is not None else None,
+                'retention_days': self.retention_days
+            }
+        return progress
+    
+    # --- Canlı veri (artımlı yenileme) ---
+    
+    def refresh_realtime(self):
+        """
+        realtime_data.csv'ye son okumadan sonra eklenen satırları okur.
+        
+        Dosya bölüme döndürülmüşse (veri_saklama) kalan satırlar bölümden
+        okunur; silinip yeniden oluşturulmuşsa (veri_temizle) bellekteki
+        canlı veri atılır ve dosya baştan okunur.
+        
+        Returns:
+            int: Eklenen satır sayısı
+        """
+        import pandas as pd
+        
+        with self._refresh_lock:
+            added = 0
+            for event, payload in self._realtime_tail.read():
+                if event == 'start':
+                    if payload['restart']:
+                        self._reset_realtime()
+                    continue
+                df = pd.read_csv(io.BytesIO(payload[0]))
+                self._append_realtime(df)
+                added += len(df)
+            
+            with self._realtime_lock:
+                self._refresh_info['rows_appended'] += added
+                self._refresh_info['last_refresh'] = datetime.now().isoformat()
+            return added
+    
+    def load_realtime_segments(self):
+        """
+        Döndürülmüş ham bölümleri (veri_saklama) ilk yüklemede okur; aktif
+        dosya refresh_realtime ile takip edilir.
+        
+        Returns:
+            int: Okunan satır sayısı
+        """
+        import pandas as pd
+        
+        rows = 0
+        for path in segment_paths('raw'):
+            try:
+                df = pd.read_csv(path)
+            except (FileNotFoundError, pd.errors.EmptyDataError):
+                continue    # Okuma sırasında özetlenip silinmiş
+            self._append_realtime(df)
+            rows += len(df)
+        return rows
+    
+    def _reset_realtime(self):
+        with self._realtime_lock:
+            self._realtime = {}
+            self._realtime_pending = {}
+            self._realtime_latest = None
+    
+    def _append_realtime(self, df):
+        """Yeni satırları trafo bazında parçalara ekler"""
+        import pandas as pd
+        
+        if len(df) == 0 or 'transformer_id' not in df.columns or 'timestamp' not in df.columns:
+            return
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        latest = df['timestamp'].max()
+        
+        with self._realtime_lock:
+            if self._realtime_latest is None or latest > self._realtime_latest:
+                self._realtime_latest = latest
+            for transformer_id, group in df.groupby('transformer_id', sort=False):
+                pending = self._realtime_pending.setdefault(int(transformer_id), [])
+                pending.append(group)
+                if len(pending) >= REALTIME_MAX_PENDING:
+                    self._consolidate_locked(int(transformer_id))
+    
+    def _consolidate_locked(self, transformer_id):
+        """Bekleyen parçaları trafonun çerçevesine ekler ve saklama süresi dışını budar"""
+        import pandas as pd
+        
+        pending = self._realtime_pending.pop(transformer_id, None)
+        frame = self._realtime.get(transformer_id)
+        if pending:
+            frame = pd.concat(([frame] if frame is not None else []) + pending, ignore_index=True)
+            frame = frame.sort_values('timestamp', kind='stable').reset_index(drop=True)
+        if frame is None:
+            return None
+        
+        cutoff = self._realtime_latest - pd.Timedelta(days=self.retention_days)
+        if len(frame) and frame['timestamp'].iloc[0] < cutoff:
+            frame = frame.iloc[frame['timestamp'].searchsorted(cutoff):].reset_index(drop=True)
+        if len(frame) == 0:
+            self._realtime.pop(transformer_id, None)
+            return None
+        self._realtime[transformer_id] = frame
+        return frame
+    
+    def realtime_for(self, transformer_id):
+        """
+        Trafonun saklama süresi içindeki canlı kayıtları (zaman sıralı).
+        
+        Returns:
+            DataFrame veya None: Canlı kaydı yoksa None
+        """
+        with self._realtime_lock:
+            return self._consolidate_locked(transformer_id)
+    
+    @property
+    def realtime_df(self):
+        """Tüm canlı kayıtlar (zaman sıralı, tüm trafolar birleştirilir)"""
+        import pandas as pd
+        
+        with self._realtime_lock:
+            frames = [
+                self._consolidate_locked(transformer_id)
+                for transformer_id in list(self._realtime.keys() | self._realtime_pending.keys())
+            ]
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True).sort_values('timestamp', kind='stable').reset_index(drop=True)
+    
+    def start_refresh(self, interval=CHAT_DATA['refresh_interval']):
+        """Canlı veriyi periyodik yenileyen arka plan iş parçacığını başlatır (birden çok çağrı güvenli)"""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, args=(interval,), name='chat-realtime-refresh', daemon=True
+        )
+        self._refresh_thread.start()
+    
+    def stop_refresh(self):
+        self._refresh_stop.set()
+    
+    def _refresh_loop(self, interval):
+        while not self._refresh_stop.wait(interval):
+            try:
+                self.refresh_realtime()
+            except Exception as e:
+                print(f"⚠️ Canlı veri yenileme hatası: {e}")
     
     def get_transformer_current(self, transformer_id):
         """Güncel trafo verisini API'den al - DINAMIK"""
@@ -107,16 +329,23 @@ class ChatDataAccess:
     def get_transformer_history(self, transformer_id, days=30):
         """Trafo geçmiş verilerini al"""
         try:
-            response = requests.get(f"{self.api_base}/transformers/{transformer_id}/history", timeout=5)
-            if response.status_code == 200:
-                return response.json().get('history', [])
+            response = requests.get(
+                f"{self.api_base}/transformers/{transformer_id}/history",
+                params={'days': days},
+                timeout=5
+            )
+            # API sadece canlı kayıtları döner; boşsa sensör geçmişiyle birlikte yerelden
+            if response.status_code == 200 and response.json().get('history'):
+                return response.json()['history']
         except:
             pass
         
-        # CSV'den geçmiş veri
-        if self.sensor_df is not None:
-            df = self.sensor_df[self.sensor_df['transformer_id'] == transformer_id].copy()
-            df = df.sort_values('timestamp')
+        # CSV'den geçmiş veri (trafo indeksinden, zaman sıralı) + canlı kayıtlar
+        frames = [df for df in (self.history_for(transformer_id), self.realtime_for(transformer_id)) if df is not None]
+        if frames:
+            import pandas as pd
+            
+            df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
             cutoff_date = datetime.now() - timedelta(days=days)
             df = df[df['timestamp'] >= cutoff_date]
             return df.to_dict('records')
@@ -146,7 +375,7 @@ class ChatDataAccess:
     
     def find_similar_cases(self, transformer_data):
         """Benzer durumları bul - DINAMIK ANALIZ"""
-        if self.sensor_df is None:
+        if not self.has_history:
             return []
         
         sensor_data = transformer_data.get('sensor_data', {})
@@ -158,8 +387,8 @@ class ChatDataAccess:
             if trafo_id == transformer_data.get('id'):
                 continue
             
-            df = self.sensor_df[self.sensor_df['transformer_id'] == trafo_id]
-            if len(df) == 0:
+            df = self.history_for(trafo_id)
+            if df is None or len(df) == 0:
                 continue
             
             # Son kayıtları al
@@ -537,23 +766,61 @@ data_access = ChatDataAccess()
 analyzer = DynamicAnalyzer()
 llm_generator = LLMResponseGenerator()
 
-# Verileri yükle
-data_access.load_historical_data()
 
-# Model yükle
-try:
+@warmup.step('llm', required=False)
+def detect_llm():
+    """Kullanılabilir LLM'i belirler (Ollama, yoksa OpenAI, yoksa basit analiz)"""
+    global ollama, client, USE_OLLAMA, USE_OPENAI
+    try:
+        import ollama
+        USE_OLLAMA = True
+        print("[OK] Ollama bulundu - Yerel LLM kullanilacak")
+    except ImportError:
+        USE_OLLAMA = False
+        try:
+            from openai import OpenAI
+            client = OpenAI()
+            USE_OPENAI = True
+            print("[OK] OpenAI bulundu")
+        except Exception:
+            USE_OPENAI = False
+            print("[!] LLM bulunamadi - Basit analiz kullanilacak")
+    llm_generator.use_ollama = USE_OLLAMA
+    llm_generator.use_openai = USE_OPENAI if not USE_OLLAMA else False
+
+
+@warmup.step('model', required=False)
+def init_model():
+    """Anomali tespit modelini yükler"""
+    global model, scaler
     model, scaler = load_model()
     analyzer.model = model
     analyzer.scaler = scaler
     print("[OK] Anomali tespit modeli yuklendi")
-except Exception as e:
-    print(f"[!] Model yuklenemedi: {e}")
+
+
+@warmup.step('history')
+def init_history():
+    """Tarihsel verileri yükler (chat bu adımı beklemez; ilerleme /api/chat/health'te)"""
+    data_access.load_historical_data()
+
+
+def start_background_tasks():
+    """Süreç başına arka plan işleri (sunucu.py her işçi süreçte çağırır)"""
+    warmup.start()
+    data_access.start_refresh()
 
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Dinamik chat endpoint - LLM ile"""
     try:
+        # LLM ve model henüz yüklenmediyse bu istekte yüklenir (ya da beklenir);
+        # tarihsel veri beklenmez, yüklenene kadar geçmiş bağlamı boş kalır
+        warmup.start()
+        warmup.require('llm')
+        warmup.require('model')
+        
         data = request.get_json()
         question = data.get('question', '')
         transformer_id = data.get('transformer_id', None)
@@ -608,6 +875,7 @@ def chat():
             'context': {
                 'transformer_id': transformer_id,
                 'has_analysis': analysis is not None,
+                'has_history': data_access.has_history,
                 'has_llm': llm_generator.use_ollama or llm_generator.use_openai
             }
         })
@@ -619,6 +887,14 @@ def chat():
         }), 500
 
 
+@app.route('/api/chat/ready', methods=['GET'])
+def chat_ready():
+    """Hazır olma kontrolü: ısınma adımları bitene kadar 503"""
+    warmup.start()
+    status = warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
 @app.route('/api/chat/health', methods=['GET'])
 def chat_health():
     """Chat sistemi sağlık kontrolü"""
@@ -626,7 +902,9 @@ def chat_health():
         'status': 'ok',
         'llm_available': llm_generator.use_ollama or llm_generator.use_openai,
         'model_loaded': model is not None,
-        'data_loaded': data_access.sensor_df is not None,
+        'data_loaded': data_access.has_history,
+        'history': data_access.load_progress(),
+        'warmup': warmup.status(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -635,9 +913,15 @@ if __name__ == '__main__':
     print("=" * 60)
     print("Dinamik Chat Backend API Baslatiliyor...")
     print("=" * 60)
+    
+    # LLM ve model tespiti hızlıdır; tarihsel veri arka planda yüklenmeye devam eder
+    warmup.require('llm')
+    warmup.require('model')
+    start_background_tasks()
+    
     print(f"LLM Durumu: {'Ollama' if USE_OLLAMA else 'OpenAI' if USE_OPENAI else 'Yok (Fallback)'}")
     print(f"Model Durumu: {'Yuklu' if model else 'Yuklenemedi'}")
-    print(f"Veri Durumu: {'Yuklu' if data_access.sensor_df is not None else 'Yuklenemedi'}")
+    print(f"Veri Durumu: arka planda yukleniyor (GET /api/chat/ready)")
     print("=" * 60)
     print("Endpoint: POST /api/chat")
     print("Health: GET /api/chat/health")
@@ -3,10 +3,12 @@ Proje Konfigürasyon Dosyası
 Topraklama İzleme ve Anomali Tespiti Sistemi
 """
 
-import random
+import os
 
-# Trafo Sayısı ve Konfigürasyonu
-NUM_TRANSFORMERS = 120  # Toplam trafo sayısı
+from trafo_kayitlari import TransformerRegistry
+
+# Trafo Sayısı ve Konfigürasyonu (NUM_TRANSFORMERS ortam değişkeniyle değiştirilebilir)
+NUM_TRANSFORMERS = int(os.environ.get('NUM_TRANSFORMERS', 120))  # Toplam trafo sayısı
 
 # İzmir Bölgesi Sınırları (Rastgele dağılım için)
 IZMIR_BOUNDS = {
@@ -24,19 +26,21 @@ IZMIR_REGIONS = [
     'Selçuk', 'Foça', 'Aliağa', 'Menemen', 'Bergama'
 ]
 
-# Trafo Lokasyonları (İzmir bölgesinde rastgele dağıtılmış)
-TRANSFORMER_LOCATIONS = []
-for i in range(NUM_TRANSFORMERS):
-    lat = random.uniform(IZMIR_BOUNDS['lat_min'], IZMIR_BOUNDS['lat_max'])
-    lon = random.uniform(IZMIR_BOUNDS['lon_min'], IZMIR_BOUNDS['lon_max'])
-    region = random.choice(IZMIR_REGIONS)
-    TRANSFORMER_LOCATIONS.append({
-        'id': i+1,
-        'latitude': round(lat, 6),
-        'longitude': round(lon, 6),
-        'name': f'Trafo {i+1}',
-        'region': region
-    })
+# Trafo Kayıtları - tohumlu üretilip data/ altında saklanır; tüm süreçler
+# aynı konumları görür. İlk erişimde yüklenir (import sırasında değil).
+TRANSFORMER_REGISTRY = {
+    'path': os.environ.get('TRANSFORMER_REGISTRY_PATH', 'data/trafo_kayitlari.npz'),
+    'seed': 42
+}
+
+# Trafo Lokasyonları (İzmir bölgesinde dağıtılmış, liste gibi kullanılır)
+TRANSFORMER_LOCATIONS = TransformerRegistry(
+    NUM_TRANSFORMERS,
+    TRANSFORMER_REGISTRY['path'],
+    IZMIR_BOUNDS,
+    IZMIR_REGIONS,
+    seed=TRANSFORMER_REGISTRY['seed']
+)
 
 # Sensör Parametreleri - Normal Değer Aralıkları
 SENSOR_RANGES = {
@@ -103,7 +107,8 @@ DATA_GENERATION = {
     'start_date': '2024-01-01',
     'end_date': '2024-12-31',
     'frequency': '1H',  # Her saat bir veri
-    'output_file': 'data/sensor_data.csv'
+    'output_file': 'data/sensor_data.csv',
+    'columnar_dir': 'data/sensor_data.cols'  # memmap kolon deposu (kolon_deposu.py, CSV'den üretilir)
 }
 
 # Model Parametreleri
@@ -127,6 +132,52 @@ RISK_SCORING = {
     'high': {'min': 70, 'max': 100, 'color': 'red'}
 }
 
+# Bildirim Motoru - Olay bazlı bildirimler (her tick için değil, her olay için)
+ALERT_CONFIG = {
+    'open_threshold': 70,         # Risk bu değere ulaşınca olay açılır
+    'high_threshold': 80,         # Risk bu değere ulaşınca olay 'high' önem derecesine çıkar
+    'resolve_threshold': 60,      # Histerezis: risk bunun altına inince olay kapanır
+    'cooldown_minutes': 60,       # Kapanan olaydan sonra aynı trafo için yeni olay açılmaz (veri zamanı)
+    'max_resolved_history': 1000, # Bellekte tutulan kapanmış olay sayısı
+    'acknowledgements_path': 'data/incident_acks.db'  # api_server işçileri arasında paylaşılan olay onayları
+}
+
+# Canlı Veri Saklama (veri_saklama.py) - realtime_data.csv bölümleri ve özetleri
+REALTIME_RETENTION = {
+    'directory': 'data/realtime',
+    'segment_hours': 24,          # Aktif dosya bu zaman dilimi dolunca ham bölüme döndürülür (veri zamanı)
+    'max_segment_mb': 64,         # ... ya da bu boyutu aşınca
+    'raw_days': 7,                # Ham bölümler bu süreden sonra özetlenir
+    'rollup_minutes': 60,         # Özet zaman çözünürlüğü
+    'rollup_days': 365,           # Özetler bu süreden sonra silinir
+    'check_interval': 60          # Arka plan kontrol aralığı (saniye)
+}
+
+# Chat Veri Erişimi (chat_llm.py) - Bellekteki geçmiş ve canlı veri yenileme
+CHAT_DATA = {
+    'refresh_interval': 5,        # Saniye - realtime_data.csv'ye eklenen satırlar bu aralıkla okunur
+    'retention_days': 90          # Bellekte tutulan geçmiş (en yeni kayda göre, veri zamanı)
+}
+
+# Yerel Veritabanı (yerel_veritabani.py) - SQLite WAL, çevrimdışı depolama
+LOCAL_DATABASE = {
+    'path': 'data/realtime.db',   # api_server bu dosya varsa sorguları buradan yapar
+    'batch_size': 500,            # Tek tek eklenen kayıtlar bu sayıda birikince yazılır
+    'flush_interval': 2,          # ... ya da ilk bekleyen kayıttan bu kadar saniye sonra
+    'busy_timeout': 5             # Saniye - başka süreç yazarken kilit bekleme süresi
+}
+
+# Depolama Arayüzü (depolama.py) - Firestore ve sahte Firestore (sahte_firestore.py)
+STORAGE = {
+    'firebase_key': 'firebase-key.json',
+    'firestore_collection': 'realtime_data',           # Her okuma bir belge
+    'firestore_latest_collection': 'realtime_latest',  # Trafo başına son kayıt (belge id = trafo id)
+    'firestore_batch_size': 250,  # Tek tek eklenen kayıtlar bu sayıda birikince toplu yazılır
+    'flush_interval': 2,          # ... ya da ilk bekleyen kayıttan bu kadar saniye sonra
+    'latest_cache_ttl': 2,        # Saniye - trafo başına son kayıtlar bu süre önbellekten okunur
+    'fake_latency_ms': 50         # Sahte Firestore: her uzak çağrıya eklenen gecikme
+}
+
 # Ekonomi Modülü - Maliyet Hesaplamaları
 ECONOMICS = {
     'preventive_maintenance_cost': 5000,      # TL - Önleyici bakım maliyeti
@@ -0,0 +1,428 @@
+"""
+Depolama Arayüzü
+Canlı kayıtların (realtime_data.csv kolonları) yazıldığı ve sorgulandığı
+tüm depolar aynı arayüzü uygular:
+
+    write_batch(df)           Kayıtları tek seferde yazar (tick başına)
+    add(record)               Tek kaydı tampona ekler (batch_size / flush_interval)
+    latest(transformer_id)    Trafo başına son kayıt -> {transformer_id: kayıt}
+    history(id, start, end)   Trafonun zaman penceresi (zaman sıralı)
+    alerts(min_risk, ...)     Risk eşiğini aşan kayıtlar -> (kayıtlar, next_before)
+
+Uygulamalar:
+    CsvBackend          realtime_data.csv (+ döndürülmüş ham bölümler)
+    SqliteStore         yerel_veritabani.py
+    FirestoreBackend    Firestore istemcisi (firebase_admin veya sahte_firestore)
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from datetime import datetime
+
+from config import ALERT_CONFIG, STORAGE, LOCAL_DATABASE
+from veri_saklama import REALTIME_FILE, read_transformer_rows, segment_paths
+
+# Sabit genişlikli ISO zaman: metin karşılaştırması zaman sırasıyla aynıdır
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+BACKENDS = ['csv', 'sqlite', 'firestore', 'firestore-fake']
+
+
+def format_timestamp(value):
+    """datetime / pd.Timestamp / ISO metni -> TIMESTAMP_FORMAT"""
+    if value is None:
+        return datetime.now().strftime(TIMESTAMP_FORMAT)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def plain_record(record):
+    """Kayıttaki NumPy/pandas değerlerini Python tiplerine çevirir (zaman ISO metni)"""
+    plain = {}
+    for key, value in record.items():
+        if key == 'timestamp':
+            value = format_timestamp(value)
+        elif hasattr(value, 'item'):
+            value = value.item()
+        if isinstance(value, float) and value != value:
+            value = None
+        plain[key] = value
+    return plain
+
+
+class StorageBackend(ABC):
+    """
+    Depo arayüzü. Alt sınıflar sorguları (soyut metotlar) ve write_records
+    ya da write_batch'ten en az birini uygular; add() tamponlaması burada
+    ortaktır. Eksik sorgu metodu olan depo oluşturulurken TypeError verir.
+    """
+    
+    name = 'depo'
+    
+    def __init__(self, batch_size=1, flush_interval=0):
+        # write_batch ve write_records birbirini çağırır; biri uygulanmalı
+        cls = type(self)
+        if cls.write_batch is StorageBackend.write_batch and cls.write_records is StorageBackend.write_records:
+            raise TypeError(f"{cls.__name__}: write_batch veya write_records uygulanmalı")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._pending_since = None
+        self._buffer_lock = threading.Lock()
+    
+    # --- Yazma ---
+    
+    def write_batch(self, df):
+        """
+        Kayıtları tek seferde yazar.
+        
+        Args:
+            df: realtime_data.csv kolonlarıyla DataFrame
+        
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        return self.write_records(df.to_dict('records'))
+    
+    def write_records(self, records):
+        """Kayıt sözlüklerini tek seferde yazar"""
+        import pandas as pd
+        
+        return self.write_batch(pd.DataFrame(records))
+    
+    def add(self, record):
+        """
+        Tek kaydı tampona ekler; batch_size kayıt birikince ya da ilk
+        bekleyen kayıttan flush_interval saniye geçince toplu yazar.
+        """
+        with self._buffer_lock:
+            self._pending.append(record)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            due = len(self._pending) >= self.batch_size or \
+                time.monotonic() - self._pending_since >= self.flush_interval
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Tampondaki kayıtları yazar"""
+        with self._buffer_lock:
+            records, self._pending, self._pending_since = self._pending, [], None
+        if records:
+            self.write_records(records)
+    
+    def close(self):
+        self.flush()
+    
+    # --- Sorgular ---
+    
+    @abstractmethod
+    def latest(self, transformer_id=None):
+        """
+        Trafo başına en yeni kayıt.
+        
+        Returns:
+            dict: transformer_id -> kayıt (transformer_id verilirse en fazla bir anahtar)
+        """
+        raise NotImplementedError
+    
+    @abstractmethod
+    def history(self, transformer_id, start=None, end=None, limit=None):
+        """
+        Trafonun zaman penceresindeki kayıtları (zaman sıralı).
+        
+        Args:
+            start, end: Dahil alt / üst sınır (datetime veya ISO metni, None = sınırsız)
+            limit: En fazla satır (pencerenin en yeni satırları)
+        """
+        raise NotImplementedError
+    
+    @abstractmethod
+    def alerts(self, min_risk=ALERT_CONFIG['open_threshold'], transformer_id=None, before=None, limit=50):
+        """
+        Risk eşiğini aşan kayıtlar, en yeni önce.
+        
+        Args:
+            min_risk: Risk alt sınırı
+            transformer_id: Sadece bu trafo
+            before: Önceki sayfanın next_before değeri (depoya özgü imleç)
+            limit: Sayfa boyutu
+        
+        Returns:
+            tuple: (kayıtlar, next_before - son sayfada None)
+        """
+        raise NotImplementedError
+
+
+class CsvBackend(StorageBackend):
+    """
+    realtime_data.csv. Yazmalar dosyaya eklenir (başlık dosya boşsa);
+    sorgular aktif dosyayı ve döndürülmüş ham bölümleri tarar (yavaş yol).
+    """
+    
+    name = 'CSV'
+    
+    def __init__(self, data_file=REALTIME_FILE, lock=None):
+        super().__init__()
+        self.data_file = data_file
+        # Birden çok süreç aynı CSV'ye yazıyorsa paylaşılan kilit (shard modu)
+        self.lock = lock
+    
+    def write_batch(self, df):
+        # Metin kilit dışında hazırlanır
+        csv_text = df.to_csv(header=False, index=False)
+        with self.lock if self.lock is not None else nullcontext():
+            # Başlık dosya boşsa yazılır: saklama görevi (veri_saklama) dosyayı
+            # döndürdüğü anda açılan dosya da doğru başlığı alır
+            with open(self.data_file, 'a', encoding='utf-8', newline='') as f:
+                if f.tell() == 0:
+                    f.write(','.join(df.columns) + '\n')
+                f.write(csv_text)
+        return len(df)
+    
+    def _frames(self):
+        """Aktif dosya ve ham bölümler, en yeni önce"""
+        import pandas as pd
+        
+        for path in [self.data_file] + list(reversed(segment_paths('raw'))):
+            try:
+                df = pd.read_csv(path)
+            except (FileNotFoundError, pd.errors.EmptyDataError):
+                continue
+            if 'transformer_id' in df.columns:
+                yield df
+    
+    @staticmethod
+    def _records(df):
+        return [plain_record(record) for record in df.to_dict('records')]
+    
+    def latest(self, transformer_id=None):
+        latest = {}
+        for df in self._frames():
+            if transformer_id is not None:
+                df = df[df['transformer_id'] == transformer_id]
+            df = df[~df['transformer_id'].isin(list(latest))]
+            for record in self._records(df.drop_duplicates('transformer_id', keep='last')):
+                latest[record['transformer_id']] = record
+            if transformer_id is not None and latest:
+                break
+        return latest
+    
+    def history(self, transformer_id, start=None, end=None, limit=None):
+        # Üst sınır varsa en yeni satırlar pencere dışında kalabilir; limit süzmeden sonra
+        rows = limit if limit is not None and end is None else 1 << 62
+        df = read_transformer_rows(transformer_id, rows, self.data_file)
+        records = self._records(df)
+        low = format_timestamp(start) if start is not None else None
+        high = format_timestamp(end) if end is not None else None
+        return [
+            record for record in records
+            if (low is None or record['timestamp'] >= low) and (high is None or record['timestamp'] <= high)
+        ][-limit if limit else None:]
+    
+    @staticmethod
+    def _alert_key(record):
+        return record['timestamp'], record['transformer_id']
+    
+    def alerts(self, min_risk=ALERT_CONFIG['open_threshold'], transformer_id=None, before=None, limit=50):
+        """İmleç 'zaman|trafo' (aynı tick'teki kayıtlar sayfa sınırında kaybolmaz)"""
+        cursor = None
+        if before is not None:
+            timestamp, _, cursor_id = str(before).rpartition('|')
+            cursor = (timestamp, int(cursor_id))
+        found = []
+        for df in self._frames():
+            df = df[df['risk_score'] >= min_risk]
+            if transformer_id is not None:
+                df = df[df['transformer_id'] == transformer_id]
+            records = [record for record in self._records(df) if cursor is None or self._alert_key(record) < cursor]
+            found.extend(sorted(records, key=self._alert_key, reverse=True))
+            if len(found) >= limit:
+                break
+        found = found[:limit]
+        if len(found) < limit:
+            return found, None
+        return found, '{}|{}'.format(*self._alert_key(found[-1]))
+
+
+class LatestCache:
+    """
+    Trafo başına son kayıtlar için okuma önbelleği (read-through, TTL).
+    
+    Süresi dolunca tek toplu sorguyla yenilenir; aynı anda gelen istekler
+    tek yüklemeyi bekler (istemci sayısından bağımsız olarak TTL başına bir
+    uzak okuma). Bu süreçteki yazmalar önbelleğe doğrudan işlenir.
+    
+    Args:
+        load: Önbellek boşken / süresi dolunca çağrılır -> {transformer_id: kayıt}
+        ttl: Saniye (0 = her okumada yükle)
+    """
+    
+    def __init__(self, load, ttl):
+        self._load = load
+        self.ttl = ttl
+        self._records = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._stamps = {}     # transformer_id -> son kaydın zamanı (değişiklik tespiti)
+        self.generation = 0   # Sadece içerik (bir trafonun son kaydı) değişince artar
+        self.stats = {'hits': 0, 'loads': 0}
+    
+    def _track_locked(self, records):
+        """Zamanı değişen trafo varsa generation'ı artırır"""
+        changed = False
+        for transformer_id, record in records.items():
+            if self._stamps.get(transformer_id) != record.get('timestamp'):
+                self._stamps[transformer_id] = record.get('timestamp')
+                changed = True
+        if changed:
+            self.generation += 1
+    
+    def snapshot(self):
+        """
+        Returns:
+            tuple: (generation, {transformer_id: kayıt})
+        """
+        with self._lock:
+            if self._records is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._records = self._load()
+                self._loaded_at = time.monotonic()
+                self._track_locked(self._records)
+                self.stats['loads'] += 1
+            else:
+                self.stats['hits'] += 1
+            return self.generation, dict(self._records)
+    
+    def get(self):
+        return self.snapshot()[1]
+    
+    def update(self, records):
+        """Yazılan son kayıtları önbelleğe işler (write-through; TTL değişmez)"""
+        with self._lock:
+            if self._records is not None and records:
+                self._records.update(records)
+                self._track_locked(records)
+    
+    def invalidate(self):
+        """Bir sonraki okuma uzak depodan yüklenir"""
+        with self._lock:
+            self._records = None
+
+
+class FirestoreBackend(StorageBackend):
+    """
+    Firestore. Her kayıt 'collection' koleksiyonunda bir belgedir; trafo
+    başına son kayıt ayrıca 'latest_collection' koleksiyonunda (belge id =
+    trafo id) tutulur, böylece son durum sorgusu tek toplu okumadır; bu
+    okuma latest_cache_ttl saniye önbellekte tutulur (LatestCache) ve tek
+    trafo sorguları da aynı önbellekten yanıtlanır (TTL 0 ise belge başına okuma).
+    Yazmalar WriteBatch ile (en fazla 500 işlem) toplu gönderilir.
+    
+    Gerekli bileşik indeksler: (transformer_id, timestamp) ve (risk_score, timestamp).
+    """
+    
+    name = 'Firestore'
+    MAX_BATCH_OPERATIONS = 500
+    
+    def __init__(self, client, collection=STORAGE['firestore_collection'],
+                 latest_collection=STORAGE['firestore_latest_collection'],
+                 batch_size=STORAGE['firestore_batch_size'], flush_interval=STORAGE['flush_interval'],
+                 latest_cache_ttl=STORAGE['latest_cache_ttl']):
+        super().__init__(batch_size, flush_interval)
+        self.client = client
+        self.collection = client.collection(collection)
+        self.latest_collection = client.collection(latest_collection)
+        self.latest_cache = LatestCache(self._load_latest, latest_cache_ttl)
+    
+    def write_records(self, records):
+        records = [plain_record(record) for record in records]
+        latest = {record['transformer_id']: record for record in records}
+        operations = [(self.collection.document(), record) for record in records] + [
+            (self.latest_collection.document(str(transformer_id)), record)
+            for transformer_id, record in latest.items()
+        ]
+        for first in range(0, len(operations), self.MAX_BATCH_OPERATIONS):
+            batch = self.client.batch()
+            for reference, record in operations[first:first + self.MAX_BATCH_OPERATIONS]:
+                batch.set(reference, record)
+            batch.commit()
+        self.latest_cache.update(latest)
+        return len(records)
+    
+    def _load_latest(self):
+        """Son kayıt koleksiyonunun tamamı (tek sorgu)"""
+        records = (snapshot.to_dict() for snapshot in self.latest_collection.stream())
+        return {record['transformer_id']: record for record in records}
+    
+    def latest(self, transformer_id=None):
+        if transformer_id is not None and self.latest_cache.ttl <= 0:
+            snapshot = self.latest_collection.document(str(transformer_id)).get()
+            return {transformer_id: snapshot.to_dict()} if snapshot.exists else {}
+        records = self.latest_cache.get()
+        if transformer_id is not None:
+            return {transformer_id: records[transformer_id]} if transformer_id in records else {}
+        return records
+    
+    def history(self, transformer_id, start=None, end=None, limit=None):
+        query = self.collection.where('transformer_id', '==', transformer_id)
+        if start is not None:
+            query = query.where('timestamp', '>=', format_timestamp(start))
+        if end is not None:
+            query = query.where('timestamp', '<=', format_timestamp(end))
+        query = query.order_by('timestamp', direction='DESCENDING')
+        if limit is not None:
+            query = query.limit(int(limit))
+        return [snapshot.to_dict() for snapshot in query.stream()][::-1]
+    
+    def alerts(self, min_risk=ALERT_CONFIG['open_threshold'], transformer_id=None, before=None, limit=50):
+        """İmleç son belgenin id'si (sıralama zaman + belge adı, aynı tick'te de tekil)"""
+        query = self.collection.where('risk_score', '>=', min_risk)
+        if transformer_id is not None:
+            query = query.where('transformer_id', '==', transformer_id)
+        query = query.order_by('timestamp', direction='DESCENDING')
+        if before is not None:
+            cursor = self.collection.document(str(before)).get()
+            if not cursor.exists:
+                return [], None
+            query = query.start_after(cursor)
+        snapshots = list(query.limit(int(limit)).stream())
+        records = [snapshot.to_dict() for snapshot in snapshots]
+        return records, snapshots[-1].id if len(snapshots) == limit else None
+
+
+def firestore_client(key_path=STORAGE['firebase_key']):
+    """firebase_admin ile Firestore istemcisi (uygulama süreç başına bir kez başlatılır)"""
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+    
+    if not os.path.exists(key_path):
+        raise FileNotFoundError(f"{key_path} bulunamadı")
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(credentials.Certificate(key_path))
+    return firestore.client()
+
+
+def open_backend(kind, lock=None):
+    """
+    Depo oluşturur.
+    
+    Args:
+        kind: 'csv', 'sqlite', 'firestore' veya 'firestore-fake'
+            (bellek içi Firestore, STORAGE['fake_latency_ms'] gecikmeli)
+        lock: CSV yazıcı kilidi (shard modu)
+    """
+    if kind == 'csv':
+        return CsvBackend(lock=lock)
+    if kind == 'sqlite':
+        from yerel_veritabani import SqliteStore
+        return SqliteStore(LOCAL_DATABASE['path'])
+    if kind == 'firestore':
+        return FirestoreBackend(firestore_client())
+    if kind == 'firestore-fake':
+        from sahte_firestore import FakeFirestoreClient
+        return FirestoreBackend(FakeFirestoreClient(latency=STORAGE['fake_latency_ms'] / 1000))
+    raise ValueError(f"Bilinmeyen depo türü: {kind}")
@@ -0,0 +1,158 @@
+"""
+Eşzamanlı Durum Deposu
+Çok iş parçacıklı sunucu için paylaşılan durum yapıları:
+  - SnapshotStore: copy-on-write görüntü; yazarlar sıralanır, okuyucular kilitsiz
+  - AlertRingBuffer: sabit kapasiteli, O(1) eklemeli bildirim halkası
+"""
+
+import itertools
+import threading
+
+
+class SnapshotStore:
+    """
+    Copy-on-write durum deposu.
+    
+    Durum değiştirilmez bir nesne olarak tutulur. Yazarlar yeni nesneyi
+    kilit altında eskisinden türetip referansı değiştirir; okuyucular
+    kilit almadan get() ile o anki tam görüntüyü alır (referans ataması
+    atomik olduğundan yarım güncellenmiş durum görülmez).
+    """
+    
+    def __init__(self, initial=None):
+        self._current = initial
+        self._version = 0 if initial is None else 1
+        self._lock = threading.Lock()
+    
+    def get(self):
+        """Güncel görüntü (kilitsiz)"""
+        return self._current
+    
+    @property
+    def version(self):
+        return self._version
+    
+    def set(self, value):
+        """Görüntüyü doğrudan değiştirir"""
+        with self._lock:
+            self._version += 1
+            self._current = value
+            return value
+    
+    def update(self, builder):
+        """
+        Yeni görüntüyü mevcut görüntüden türetir (yazarlar sırayla çalışır).
+        
+        Args:
+            builder: (mevcut görüntü, yeni versiyon) -> yeni görüntü fonksiyonu
+        
+        Returns:
+            Yeni görüntü
+        """
+        with self._lock:
+            version = self._version + 1
+            value = builder(self._current, version)
+            self._version = version
+            self._current = value
+            return value
+
+
+class AlertRingBuffer:
+    """
+    Sabit kapasiteli bildirim halkası.
+    
+    Her eklemede itertools.count ile (GIL altında atomik) bir sıra numarası
+    alınır ve kayıt (sıra, bildirim) olarak kendi yuvasına yazılır; liste hiç
+    kopyalanmaz, yalnızca baş göstergesi küçük bir kilitle ilerletilir.
+    Okuyucular kilit almaz, yuvadaki sıra numarasını kontrol ederek üzerine
+    yazılmış ya da henüz yazılmamış yuvaları atlar.
+    
+    Liste gibi kullanılabilir: append, extend, len, indeks, dilim
+    (alerts[-50:]) ve iterasyon (eskiden yeniye).
+    """
+    
+    def __init__(self, capacity=100):
+        if capacity < 1:
+            raise ValueError("Kapasite en az 1 olmalı")
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._counter = itertools.count()
+        self._head = 0      # Yazılmış son sıra numarası + 1
+        self._head_lock = threading.Lock()
+        self._start = 0     # drain()/clear() sonrası ilk geçerli sıra numarası
+    
+    def append(self, alert):
+        """Bildirim ekler (kapasite doluysa en eski bildirimin üzerine yazar)"""
+        seq = next(self._counter)
+        self._slots[seq % self.capacity] = (seq, alert)
+        # Kontrol-ve-ata kilitsiz olursa geç kalan yazar _head'i geri alabilir
+        with self._head_lock:
+            if seq >= self._head:
+                self._head = seq + 1
+    
+    def extend(self, alerts):
+        for alert in alerts:
+            self.append(alert)
+    
+    @property
+    def total(self):
+        """Şimdiye kadar eklenen toplam bildirim sayısı"""
+        return self._head
+    
+    def _range(self):
+        head = self._head
+        return max(self._start, head - self.capacity), head
+    
+    def _collect(self, first, head):
+        slots = self._slots
+        capacity = self.capacity
+        result = []
+        for seq in range(first, head):
+            entry = slots[seq % capacity]
+            # Yuva henüz yazılmamış ya da daha yeni bir bildirimle ezilmiş
+            if entry is not None and entry[0] == seq:
+                result.append(entry[1])
+        return result
+    
+    def snapshot(self):
+        """
+        Halkadaki bildirimler (eskiden yeniye).
+        
+        Returns:
+            list: Bildirim listesi (kopya)
+        """
+        return self._collect(*self._range())
+    
+    def latest(self, n):
+        """Son n bildirim (eskiden yeniye)"""
+        if n <= 0:
+            return []
+        first, head = self._range()
+        return self._collect(max(first, head - n), head)
+    
+    def drain(self):
+        """Mevcut bildirimleri döner ve halkayı boşaltır (tek tüketici için)"""
+        first, head = self._range()
+        self._start = head
+        return self._collect(first, head)
+    
+    def clear(self):
+        self._start = self._head
+    
+    def __len__(self):
+        first, head = self._range()
+        return head - first
+    
+    def __iter__(self):
+        return iter(self.snapshot())
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Sık kullanılan alerts[-n:] kalıbı tüm halkayı kopyalamaz
+            if index.start is not None and index.start < 0 and index.stop is None and index.step is None:
+                return self.latest(-index.start)
+            return self.snapshot()[index]
+        return self.snapshot()[index]
+    
+    def __repr__(self):
+        return f"AlertRingBuffer(capacity={self.capacity}, size={len(self)}, total={self.total})"
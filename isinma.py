@@ -0,0 +1,137 @@
+"""
+Isınma (Warm-up) Görevleri
+Sunucu süreçleri ağır bağımlılıkları (sklearn modeli, pandas, Firebase,
+LLM istemcisi, tarihsel veri) import sırasında değil, arka planda sırayla
+yükler. Süreç hemen istek almaya başlar; /api/ready tüm adımlar bitene
+kadar 503 döner (/api/health sadece sürecin ayakta olduğunu söyler).
+
+Bir adıma ısınma bitmeden ihtiyaç duyulursa require() o adımı çağıran
+iş parçacığında hemen çalıştırır ya da çalışmakta olan adımı bekler.
+"""
+
+import threading
+import time
+
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'ready', 'failed'
+
+
+class WarmUp:
+    """
+    Sıralı ısınma adımları.
+    
+    Her adım en fazla bir kez çalışır (arka plan iş parçacığında veya
+    require() ile ilk ihtiyaç duyan istekte).
+    """
+    
+    def __init__(self, name):
+        self.name = name
+        self.created_at = time.perf_counter()
+        self._steps = {}                # adım adı -> durum sözlüğü (ekleme sırasıyla)
+        self._condition = threading.Condition()
+        self._thread = None
+        self.finished_at = None
+    
+    def step(self, name, required=True):
+        """
+        Isınma adımı ekler (dekoratör).
+        
+        Args:
+            name: Adım adı (/api/ready çıktısında görünür)
+            required: False ise adımın hatası süreci hazır olmaktan alıkoymaz
+        """
+        def register(func):
+            self._steps[name] = {
+                'func': func,
+                'required': required,
+                'status': PENDING,
+                'duration': None,
+                'error': None,
+                'result': None
+            }
+            return func
+        return register
+    
+    # --- Çalıştırma ---
+    
+    def start(self):
+        """Bekleyen adımları arka plan iş parçacığında çalıştırır (birden çok çağrı güvenli)"""
+        with self._condition:
+            if self.finished_at is not None or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self.run, name=f'{self.name}-warmup', daemon=True)
+            self._thread.start()
+    
+    def run(self):
+        """Bekleyen adımları çağıran iş parçacığında sırayla çalıştırır"""
+        for name in list(self._steps):
+            self.require(name)
+        print(f"[OK] {self.name} hazir ({self.finished_at - self.created_at:.2f} sn)")
+    
+    def require(self, name, timeout=None):
+        """
+        Adımın tamamlanmasını sağlar: bekliyorsa hemen çalıştırır,
+        çalışıyorsa bitmesini bekler.
+        
+        Returns:
+            bool: Adım başarıyla tamamlandıysa True
+        """
+        step = self._steps[name]
+        with self._condition:
+            if step['status'] == RUNNING:
+                self._condition.wait_for(lambda: step['status'] != RUNNING, timeout)
+                return step['status'] == DONE
+            if step['status'] != PENDING:
+                return step['status'] == DONE
+            step['status'] = RUNNING
+        
+        started = time.perf_counter()
+        try:
+            result, status, error = step['func'](), DONE, None
+        except Exception as e:
+            result, status, error = None, FAILED, str(e)
+            print(f"⚠️ Isınma adımı başarısız ({self.name}/{name}): {e}")
+        
+        with self._condition:
+            step.update(status=status, result=result, error=error,
+                        duration=round(time.perf_counter() - started, 3))
+            if self.finished_at is None and self._all_finished_locked():
+                self.finished_at = time.perf_counter()
+            self._condition.notify_all()
+        return status == DONE
+    
+    # --- Durum ---
+    
+    @property
+    def ready(self):
+        """Tüm adımlar bitti ve zorunlu adımlar başarılı"""
+        return all(
+            step['status'] == DONE or (step['status'] == FAILED and not step['required'])
+            for step in self._steps.values()
+        )
+    
+    def wait(self, timeout=None):
+        """Tüm adımlar bitene kadar bekler"""
+        with self._condition:
+            return self._condition.wait_for(self._all_finished_locked, timeout)
+    
+    def _all_finished_locked(self):
+        return all(step['status'] in (DONE, FAILED) for step in self._steps.values())
+    
+    def step_status(self, name):
+        """Adımın durumu (çalıştırmaz, beklemez): pending / running / ready / failed"""
+        with self._condition:
+            return self._steps[name]['status']
+    
+    def status(self):
+        """/api/ready yanıt içeriği"""
+        with self._condition:
+            steps = {
+                name: {key: step[key] for key in ('status', 'required', 'duration', 'error')}
+                for name, step in self._steps.items()
+            }
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return {
+            'ready': self.ready,
+            'elapsed': round(end - self.created_at, 3),
+            'steps': steps
+        }
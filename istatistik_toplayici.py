@@ -0,0 +1,197 @@
+"""
+Artımlı Filo İstatistikleri
+/api/statistics (api_server.py) ve /api/dashboard/stats (app.py) için
+filo özetini her istekte tüm veriyi taramadan üretir. Her okuma geldiğinde
+sadece o trafonun eski ve yeni değerleri arasındaki fark sayaçlara
+uygulanır; özet sabit zamanda okunur.
+
+Risk skorları yüzde bir hassasiyetle tam sayı olarak tutulur
+(87.456 -> 8746); toplam ve ortalama kayan nokta hatası biriktirmez.
+"""
+
+import heapq
+import threading
+
+import numpy as np
+
+from config import ECONOMICS, RISK_SCORING
+
+RISK_LEVELS = ('low', 'medium', 'high')
+
+# Önleyici bakım ile reaktif bakım arasındaki fark (yüksek riskli trafo başına)
+SAVINGS_PER_HIGH_RISK = (
+    ECONOMICS['reactive_maintenance_cost'] - ECONOMICS['preventive_maintenance_cost']
+)
+
+# Min/max yığınlarında geçersiz kayıt bu oranı aşınca yığınlar yeniden kurulur
+HEAP_REBUILD_FACTOR = 4
+
+
+HIGH_RISK_SCALED = RISK_SCORING['high']['min'] * 100
+
+
+def _scaled(risk_score):
+    return int(round(float(risk_score) * 100))
+
+
+def _scaled_array(risk_scores):
+    return np.rint(np.asarray(risk_scores, dtype=float) * 100).astype(np.int64).tolist()
+
+
+def _level(scaled_risk):
+    if scaled_risk < RISK_SCORING['low']['max'] * 100:
+        return 'low'
+    if scaled_risk < RISK_SCORING['medium']['max'] * 100:
+        return 'medium'
+    return 'high'
+
+
+class FleetStatistics:
+    """
+    Trafo başına son değeri ve filo geneli sayaçları tutan toplayıcı.
+    
+    Bir trafonun risk seviyesi değiştiğinde (ör. orta -> yüksek) sadece iki
+    sayaç güncellenir. Min/max için geçersiz kayıtları tembel silinen iki
+    yığın kullanılır; yığın tepesi her güncellemeden sonra geçerli tutulur.
+    """
+    
+    def __init__(self, num_transformers=None):
+        self.num_transformers = num_transformers
+        self._lock = threading.Lock()
+        self._reset_locked()
+    
+    def reset(self):
+        """Tüm sayaçları sıfırlar (veri kaynağı baştan başladığında)"""
+        with self._lock:
+            self._reset_locked()
+    
+    def _reset_locked(self):
+        self._state = {}            # transformer_id -> (ölçekli risk, seviye, anomali, izole)
+        self._levels = dict.fromkeys(RISK_LEVELS, 0)
+        self._risk_sum = 0
+        self._anomaly_count = 0
+        self._isolated_count = 0
+        self._high_readings = 0     # Eşik üstü toplam okuma sayısı
+        self._readings = 0
+        self._min_heap = []         # (ölçekli risk, transformer_id)
+        self._max_heap = []         # (-ölçekli risk, transformer_id)
+    
+    # --- Güncelleme ---
+    
+    def update(self, transformer_id, risk_score, is_anomaly=False, isolated=False):
+        """Tek trafonun son okumasını uygular"""
+        risk = _scaled(risk_score)
+        with self._lock:
+            self._apply_locked(int(transformer_id), risk, bool(is_anomaly), bool(isolated))
+            self._count_readings_locked(1, int(risk >= HIGH_RISK_SCALED))
+            self._trim_heaps_locked()
+    
+    def update_many(self, transformer_ids, risk_scores, is_anomaly=None, isolated=None, readings=None):
+        """
+        Bir grup trafonun son okumalarını uygular.
+        
+        Args:
+            transformer_ids: (N,) trafo ID'leri (her trafo en fazla bir kez)
+            risk_scores: (N,) risk skorları
+            is_anomaly: (N,) anomali bayrakları (None = hepsi False)
+            isolated: (N,) izole bayrakları (None = hepsi False)
+            readings: Eşik üstü okuma sayacı için tüm okumaların risk
+                skorları (None = risk_scores; ara okumalar da sayılsın diye)
+        """
+        count = len(transformer_ids)
+        ids = np.asarray(transformer_ids).tolist()
+        scaled = _scaled_array(risk_scores)
+        anomalies = [False] * count if is_anomaly is None else np.asarray(is_anomaly, dtype=bool).tolist()
+        isolation = [False] * count if isolated is None else np.asarray(isolated, dtype=bool).tolist()
+        
+        all_readings = scaled if readings is None else _scaled_array(readings)
+        high = sum(1 for risk in all_readings if risk >= HIGH_RISK_SCALED)
+        
+        with self._lock:
+            for transformer_id, risk, anomaly, isolated_flag in zip(ids, scaled, anomalies, isolation):
+                self._apply_locked(transformer_id, risk, anomaly, isolated_flag)
+            self._count_readings_locked(len(all_readings), high)
+            self._trim_heaps_locked()
+    
+    def set_isolated(self, transformer_id, isolated):
+        """Sadece izolasyon durumunu değiştirir (risk sayaçlarına dokunmaz)"""
+        with self._lock:
+            state = self._state.get(transformer_id)
+            if state is None or state[3] == bool(isolated):
+                return
+            self._state[transformer_id] = state[:3] + (bool(isolated),)
+            self._isolated_count += 1 if isolated else -1
+    
+    def _apply_locked(self, transformer_id, risk, anomaly, isolated):
+        previous = self._state.get(transformer_id)
+        level = _level(risk)
+        
+        if previous is not None:
+            old_risk, old_level, old_anomaly, old_isolated = previous
+            if old_risk == risk and old_anomaly == anomaly and old_isolated == isolated:
+                return
+            self._risk_sum -= old_risk
+            self._levels[old_level] -= 1
+            self._anomaly_count -= old_anomaly
+            self._isolated_count -= old_isolated
+        
+        self._state[transformer_id] = (risk, level, anomaly, isolated)
+        self._risk_sum += risk
+        self._levels[level] += 1
+        self._anomaly_count += anomaly
+        self._isolated_count += isolated
+        
+        if previous is None or previous[0] != risk:
+            heapq.heappush(self._min_heap, (risk, transformer_id))
+            heapq.heappush(self._max_heap, (-risk, transformer_id))
+    
+    def _count_readings_locked(self, readings, high_readings):
+        self._readings += readings
+        self._high_readings += high_readings
+    
+    def _trim_heaps_locked(self):
+        """Yığın tepelerindeki eski (üzerine yazılmış) kayıtları atar"""
+        state = self._state
+        min_heap, max_heap = self._min_heap, self._max_heap
+        while min_heap and state[min_heap[0][1]][0] != min_heap[0][0]:
+            heapq.heappop(min_heap)
+        while max_heap and state[max_heap[0][1]][0] != -max_heap[0][0]:
+            heapq.heappop(max_heap)
+        
+        # Her trafo değiştikçe yığınlar büyür; sınır aşılınca güncel değerlerden yeniden kur
+        if len(min_heap) > HEAP_REBUILD_FACTOR * max(len(state), 1):
+            self._min_heap = [(risk, tid) for tid, (risk, _l, _a, _i) in state.items()]
+            self._max_heap = [(-risk, tid) for risk, tid in self._min_heap]
+            heapq.heapify(self._min_heap)
+            heapq.heapify(self._max_heap)
+    
+    # --- Sorgular ---
+    
+    def __len__(self):
+        """Verisi gelmiş trafo sayısı"""
+        return len(self._state)
+    
+    def summary(self):
+        """
+        Filo özeti (sabit zaman).
+        
+        Returns:
+            dict: Seviye dağılımı, anomali/izole sayıları, min/max/ortalama
+            risk, eşik üstü okuma sayısı ve tahmini tasarruf
+        """
+        with self._lock:
+            reporting = len(self._state)
+            high = self._levels['high']
+            return {
+                'total_transformers': self.num_transformers if self.num_transformers is not None else reporting,
+                'reporting': reporting,
+                'risk_distribution': dict(self._levels),
+                'anomaly_count': self._anomaly_count,
+                'isolated_count': self._isolated_count,
+                'average_risk': round(self._risk_sum / reporting / 100, 2) if reporting else 0,
+                'max_risk': -self._max_heap[0][0] / 100 if reporting else 0,
+                'min_risk': self._min_heap[0][0] / 100 if reporting else 0,
+                'high_risk_readings': self._high_readings,
+                'total_readings': self._readings,
+                'estimated_savings': high * SAVINGS_PER_HIGH_RISK
+            }
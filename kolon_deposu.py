@@ -0,0 +1,487 @@
+"""
+Kolon Deposu
+Tarihsel sensör verisini (sensor_data.csv) sabit genişlikli ikili kolonlar
+olarak saklar. Her kolon ayrı bir .npy dosyasıdır ve numpy.memmap ile
+açılır: aynı dosyayı açan tüm süreçler (api_server işçileri, chat_llm,
+model_egit) işletim sisteminin sayfa önbelleğindeki aynı sayfaları okur;
+CSV ayrıştırma ve süreç başına pandas kopyası yoktur.
+
+Dizin yapısı (DATA_GENERATION['columnar_dir']):
+    meta.json               Satır sayısı, kolon tipleri, kategori etiketleri, kaynak CSV
+    offsets.npy             int64 (max_id + 2) - trafo t'nin satırları [offsets[t], offsets[t+1])
+    timestamp.npy           datetime64[ns]
+    transformer_id.npy      int32
+    <sensör>.npy            float32 (toprak_direnci, kacak_akim, ...)
+    anomali.npy             int8
+
+realtime_data.csv de aynı biçime dönüştürülebilir (REALTIME_DTYPES,
+veri_aktar.py); name/region/risk_level gibi metin kolonları tamsayı kod
+olarak saklanır.
+
+Satırlar (transformer_id, timestamp) sırasındadır; bir trafonun tüm
+geçmişi bitişik bir dilimdir ve zaman aralığı searchsorted ile bulunur.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from config import DATA_GENERATION
+
+FORMAT_VERSION = 2
+
+SENSOR_COLUMNS = [
+    'toprak_direnci',
+    'kacak_akim',
+    'toprak_potansiyel',
+    'toprak_nemi',
+    'toprak_sicakligi',
+    'korozyon_seviyesi'
+]
+
+# Kolon -> disk tipi ('category' kolonları tamsayı kod + meta.json'da etiket listesi)
+COLUMN_DTYPES = {
+    'timestamp': 'datetime64[ns]',
+    'transformer_id': 'int32',
+    **{column: 'float32' for column in SENSOR_COLUMNS},
+    'anomali': 'int8'
+}
+
+# realtime_data.csv (simulasyon.REALTIME_COLUMNS)
+REALTIME_DTYPES = {
+    'timestamp': 'datetime64[ns]',
+    'transformer_id': 'int32',
+    **{column: 'float32' for column in SENSOR_COLUMNS},
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'name': 'category',
+    'region': 'category',
+    'is_anomaly': 'bool',
+    'anomaly_score': 'float32',
+    'risk_score': 'float32',
+    'risk_level': 'category',
+    'risk_color': 'category'
+}
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+# frame() float32 kolonları float64'e bu ondalıkla yuvarlayarak çevirir;
+# float32'nin ~7 anlamlı basamağı dışındaki gürültü JSON'a taşınmaz
+# (kaynak CSV 2 ondalıklı)
+FRAME_DECIMALS = 4
+
+# Başka bir süreç dönüştürürken beklenecek en uzun süre (saniye)
+BUILD_WAIT_SECONDS = 600
+
+# Satır sayma okuma bloğu (bayt)
+COUNT_BLOCK_SIZE = 1 << 22
+
+
+def _source_info(csv_path):
+    stat = os.stat(csv_path)
+    return {'path': os.path.abspath(csv_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def read_meta(directory):
+    try:
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(directory, csv_path):
+    """Kolon deposu var ve (kaynak CSV varsa) CSV'nin bu haliyle üretilmiş mi"""
+    meta = read_meta(directory)
+    if meta is None or meta.get('version') != FORMAT_VERSION:
+        return False
+    if csv_path is None or not os.path.exists(csv_path):
+        return True
+    source = _source_info(csv_path)
+    return meta.get('source', {}).get('size') == source['size'] and \
+        meta.get('source', {}).get('mtime_ns') == source['mtime_ns']
+
+
+def code_dtype(categories):
+    """Kategori sayısına yetecek en küçük kod tipi (-1 = boş değer)"""
+    if len(categories) < 2 ** 7:
+        return 'int8'
+    if len(categories) < 2 ** 15:
+        return 'int16'
+    return 'int32'
+
+
+def count_data_lines(handle, size):
+    """
+    Dosyanın ilk size baytındaki tamamlanmış veri satırı sayısı (başlık hariç).
+    
+    Sona eklenmekte olan yarım satır sayılmaz.
+    """
+    handle.seek(0)
+    lines = 0
+    remaining = size
+    while remaining > 0:
+        block = handle.read(min(COUNT_BLOCK_SIZE, remaining))
+        if not block:
+            break
+        lines += block.count(b'\n')
+        remaining -= len(block)
+    return max(lines - 1, 0)
+
+
+def _read_chunks(handle, schema, rows, chunksize):
+    """Şema tipleriyle parça parça okuma (sadece ilk rows veri satırı)"""
+    import pandas as pd
+    
+    handle.seek(0)
+    if rows == 0:
+        return
+    reader = pd.read_csv(
+        handle,
+        chunksize=chunksize,
+        nrows=rows,
+        encoding='utf-8-sig',
+        usecols=list(schema),
+        dtype={column: dtype for column, dtype in schema.items() if dtype != 'datetime64[ns]'}
+    )
+    for chunk in reader:
+        for column, dtype in schema.items():
+            if dtype == 'datetime64[ns]':
+                chunk[column] = pd.to_datetime(chunk[column], format='ISO8601')
+        yield chunk
+
+
+def _swap_in(temp_dir, directory):
+    """
+    Hazır geçici dizini hedefle atomik olarak değiştirir. Eski dosyaları
+    memmap ile açık tutan süreçler silinen dosyaları okumaya devam edebilir.
+    """
+    old_dir = f"{directory}.{os.getpid()}.old"
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(temp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _sort_transformer_slices(out, offsets, block_rows):
+    """
+    Dosya sırası trafo içinde zaman sırası değilse sadece bozuk trafo
+    dilimlerini yeniden sıralar (canlı CSV'de dilimler zaten sıralıdır).
+    
+    Returns:
+        int: Yeniden sıralanan trafo sayısı
+    """
+    timestamps = out['timestamp']
+    starts = offsets[:-1]
+    unsorted = set()
+    for first in range(0, len(timestamps), block_rows):
+        block = np.asarray(timestamps[first:first + block_rows + 1])
+        positions = np.flatnonzero(block[1:] < block[:-1]) + first + 1
+        if len(positions):
+            owners = np.searchsorted(offsets, positions, side='right') - 1
+            # Trafo sınırındaki düşüşler sıralama hatası değildir
+            unsorted.update(owners[starts[owners] != positions].tolist())
+    
+    for transformer_id in sorted(unsorted):
+        rows = slice(int(offsets[transformer_id]), int(offsets[transformer_id + 1]))
+        order = np.argsort(timestamps[rows], kind='stable')
+        for values in out.values():
+            values[rows] = np.asarray(values[rows])[order]
+    return len(unsorted)
+
+
+def build_from_csv(csv_path, directory, schema=None, chunksize=DEFAULT_CHUNK_ROWS, progress=None):
+    """
+    CSV'yi parça parça okuyup kolon deposuna dönüştürür; dosya hiçbir zaman
+    tamamen belleğe alınmaz.
+    
+    Tek dosya tanıtıcısı üzerinde üç geçiş yapılır (dönüştürme sırasında
+    dosya döndürülse de aynı içerik okunur, sona eklenen satırlar alınmaz):
+      0. Tamamlanmış satırlar sayılır (beklenen satır sayısı)
+      1. Trafo başına satır sayısı ve kategori etiketleri toplanır
+      2. Her parça, trafo dilimindeki yerine doğrudan .npy dosyalarına
+         (open_memmap) yazılır; sonuç (trafo, zaman) sırasındadır
+    Her geçişte satır sayısı doğrulanır, tutmazsa depo değiştirilmez.
+    
+    Args:
+        csv_path: Kaynak CSV (veri_uret/simulasyon çıktısı, utf-8-sig)
+        directory: Hedef dizin
+        schema: Kolon -> tip (varsayılan COLUMN_DTYPES; canlı veri için REALTIME_DTYPES)
+        chunksize: Parça büyüklüğü (satır)
+        progress: İsteğe bağlı geri çağırma progress(okunan_satır, oran)
+    
+    Returns:
+        dict: meta (+ 'build': geçiş süreleri ve yeniden sıralanan trafo sayısı)
+    
+    Raises:
+        ValueError: Satır sayısı tutmazsa ya da transformer_id negatif/boşsa
+    """
+    schema = dict(schema or COLUMN_DTYPES)
+    categorical = [column for column, dtype in schema.items() if dtype == 'category']
+    source = _source_info(csv_path)
+    timings = {}
+    
+    with open(csv_path, 'rb') as handle:
+        # 0. geçiş: beklenen satır sayısı
+        started = time.perf_counter()
+        expected = count_data_lines(handle, source['size'])
+        timings['count'] = time.perf_counter() - started
+        
+        def report(rows, step):
+            if progress is not None:
+                progress(rows, min((step + rows / max(expected, 1)) / 2, 1.0))
+        
+        # 1. geçiş: trafo başına satır sayısı, kategoriler, zaman aralığı
+        started = time.perf_counter()
+        counts = np.zeros(1, dtype=np.int64)
+        labels = {column: set() for column in categorical}
+        time_range = None
+        rows = 0
+        for chunk in _read_chunks(handle, schema, expected, chunksize):
+            ids = chunk['transformer_id'].to_numpy()
+            if len(ids) and ids.min() < 0:
+                raise ValueError(f"Negatif transformer_id: {csv_path}")
+            chunk_counts = np.bincount(ids)
+            if len(chunk_counts) > len(counts):
+                counts = np.concatenate([counts, np.zeros(len(chunk_counts) - len(counts), dtype=np.int64)])
+            counts[:len(chunk_counts)] += chunk_counts
+            for column in categorical:
+                labels[column].update(chunk[column].cat.categories.tolist())
+            low, high = chunk['timestamp'].min(), chunk['timestamp'].max()
+            time_range = (low, high) if time_range is None else (min(time_range[0], low), max(time_range[1], high))
+            rows += len(chunk)
+            report(rows, 0)
+        timings['scan'] = time.perf_counter() - started
+        if rows != expected:
+            raise ValueError(f"Satır sayısı tutmuyor: {expected:,} satır var, {rows:,} okundu ({csv_path})")
+        
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        categories = {column: sorted(labels[column]) for column in categorical}
+        disk_dtypes = {
+            column: code_dtype(categories[column]) if dtype == 'category' else dtype
+            for column, dtype in schema.items()
+        }
+        
+        temp_dir = f"{directory}.{os.getpid()}.tmp"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+        try:
+            # 2. geçiş: parçaları trafo dilimlerine dağıt
+            started = time.perf_counter()
+            np.save(os.path.join(temp_dir, 'offsets.npy'), offsets)
+            out = {
+                column: np.lib.format.open_memmap(
+                    os.path.join(temp_dir, f'{column}.npy'), mode='w+', dtype=dtype, shape=(rows,)
+                )
+                for column, dtype in disk_dtypes.items()
+            }
+            cursor = offsets[:-1].copy()
+            written = 0
+            for chunk in _read_chunks(handle, schema, expected, chunksize):
+                ids = chunk['transformer_id'].to_numpy()
+                # Parça içinde trafoya göre kararlı sıra: dosyadaki zaman sırası korunur
+                order = np.argsort(ids, kind='stable')
+                sorted_ids = ids[order]
+                chunk_counts = np.bincount(sorted_ids, minlength=len(cursor))
+                group_starts = np.concatenate([[0], np.cumsum(chunk_counts)[:-1]])
+                positions = cursor[sorted_ids] + np.arange(len(ids)) - group_starts[sorted_ids]
+                cursor += chunk_counts
+                
+                for column, dtype in schema.items():
+                    values = chunk[column]
+                    if dtype == 'category':
+                        values = values.cat.set_categories(categories[column]).cat.codes
+                    out[column][positions] = values.to_numpy()[order]
+                written += len(ids)
+                report(written, 1)
+            
+            if written != rows or not np.array_equal(cursor, offsets[1:]):
+                raise ValueError(f"Satır sayısı tutmuyor: {rows:,} bekleniyordu, {written:,} yazıldı ({csv_path})")
+            
+            resorted = _sort_transformer_slices(out, offsets, chunksize)
+            for values in out.values():
+                values.flush()
+            del out
+            timings['write'] = time.perf_counter() - started
+            
+            meta = {
+                'version': FORMAT_VERSION,
+                'rows': int(rows),
+                'columns': disk_dtypes,
+                'categories': categories,
+                'transformers': int(np.count_nonzero(counts)),
+                'time_range': [str(time_range[0]), str(time_range[1])] if time_range else None,
+                'source': source,
+                'created_at': time.time()
+            }
+            with open(os.path.join(temp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2, ensure_ascii=False)
+            _swap_in(temp_dir, directory)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+    
+    return {**meta, 'build': {'seconds': {k: round(v, 3) for k, v in timings.items()}, 'resorted': resorted}}
+
+
+class SensorColumns:
+    """
+    Memmap ile açılmış kolon deposu (salt okunur).
+    
+    column() ve slice() memmap görünümleri döner (kopya yok); frame()
+    sadece istenen satırlar için DataFrame oluşturur.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.meta = read_meta(directory)
+        if self.meta is None:
+            raise FileNotFoundError(f"Kolon deposu bulunamadı: {directory}")
+        self.offsets = np.load(os.path.join(directory, 'offsets.npy'), mmap_mode='r')
+        self._columns = {}
+    
+    def __len__(self):
+        return self.meta['rows']
+    
+    @property
+    def transformer_ids(self):
+        """Kaydı olan trafo ID'leri"""
+        return np.flatnonzero(np.diff(self.offsets)).tolist()
+    
+    def column(self, name):
+        """Tüm satırlar için kolon (memmap)"""
+        values = self._columns.get(name)
+        if values is None:
+            values = np.load(os.path.join(self.directory, f'{name}.npy'), mmap_mode='r')
+            self._columns[name] = values
+        return values
+    
+    def rows(self, transformer_id, start=None, end=None):
+        """
+        Trafonun (isteğe bağlı zaman aralığındaki) satır aralığı.
+        
+        Args:
+            start, end: Dahil alt / üst zaman sınırı (datetime veya None)
+        
+        Returns:
+            slice
+        """
+        if not 0 < transformer_id < len(self.offsets) - 1:
+            return slice(0, 0)
+        first, last = int(self.offsets[transformer_id]), int(self.offsets[transformer_id + 1])
+        if start is not None or end is not None:
+            timestamps = self.column('timestamp')[first:last]
+            if start is not None:
+                first += int(timestamps.searchsorted(np.datetime64(start, 'ns'), side='left'))
+            if end is not None:
+                last = int(self.offsets[transformer_id]) + \
+                    int(timestamps.searchsorted(np.datetime64(end, 'ns'), side='right'))
+        return slice(first, max(first, last))
+    
+    def slice(self, rows, columns=None):
+        """
+        Satır aralığı için kolon görünümleri (memmap dilimleri, kopya yok).
+        Kategorik kolonlar kod olarak döner (etiketler: categories()).
+        """
+        return {name: self.column(name)[rows] for name in (columns or self.meta['columns'])}
+    
+    def categories(self, name):
+        """Kategorik kolonun etiketleri (kategorik değilse None)"""
+        return self.meta.get('categories', {}).get(name)
+    
+    def frame(self, rows=None, columns=None):
+        """
+        Satır aralığından DataFrame (kolonlar pandas'a bir kez kopyalanır).
+        
+        Sensör kolonları float64 olarak (FRAME_DECIMALS ondalık), kategorik
+        kolonlar pandas Categorical olarak döner.
+        
+        Args:
+            rows: slice (None = tüm satırlar)
+            columns: Kolon adları (None = tümü)
+        """
+        import pandas as pd
+        
+        rows = slice(None) if rows is None else rows
+        data = {}
+        for name, values in self.slice(rows, columns).items():
+            labels = self.categories(name)
+            if labels is not None:
+                values = pd.Categorical.from_codes(values, labels)
+            elif values.dtype == np.float32:
+                values = np.round(values.astype(np.float64), FRAME_DECIMALS)
+            data[name] = values
+        return pd.DataFrame(data)
+    
+    def features(self, columns=SENSOR_COLUMNS, dtype=np.float64):
+        """Model eğitimi için (satır, özellik) matrisi"""
+        matrix = np.empty((len(self), len(columns)), dtype=dtype)
+        for position, name in enumerate(columns):
+            matrix[:, position] = self.column(name)
+        return matrix
+
+
+_open_lock = threading.Lock()
+_opened = {}        # dizin -> (meta.created_at, SensorColumns)
+
+
+def open_sensor_columns(csv_path=DATA_GENERATION['output_file'], directory=DATA_GENERATION['columnar_dir'],
+                        build=True, progress=None):
+    """
+    Kolon deposunu açar; yoksa ya da CSV değişmişse (build=True ise) CSV'den üretir.
+    
+    Aynı süreçte aynı depo bir kez açılır. Birden çok süreç aynı anda
+    dönüştürmeye başlarsa biri üretir, diğerleri kilit dosyasıyla bekler.
+    
+    Returns:
+        SensorColumns veya None: Ne depo ne CSV varsa None
+    """
+    with _open_lock:
+        if not is_current(directory, csv_path):
+            if not build or csv_path is None or not os.path.exists(csv_path):
+                if read_meta(directory) is None:
+                    return None
+            else:
+                _build_locked(csv_path, directory, progress)
+        
+        meta = read_meta(directory)
+        if meta is None:
+            return None
+        cached = _opened.get(directory)
+        if cached is None or cached[0] != meta['created_at']:
+            cached = (meta['created_at'], SensorColumns(directory))
+            _opened[directory] = cached
+        return cached[1]
+
+
+def _build_locked(csv_path, directory, progress):
+    """Süreçler arası kilit dosyasıyla tek dönüştürme"""
+    lock_path = f"{directory}.lock"
+    deadline = time.monotonic() + BUILD_WAIT_SECONDS
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            # Başka bir süreç dönüştürüyor; bitince güncel depoyu kullan
+            if is_current(directory, csv_path):
+                return
+            if time.monotonic() > deadline:
+                os.remove(lock_path)    # Yarıda kalmış dönüştürmenin kilidi
+                continue
+            time.sleep(0.2)
+    
+    try:
+        if not is_current(directory, csv_path):
+            started = time.perf_counter()
+            meta = build_from_csv(csv_path, directory, progress=progress)
+            print(f"[OK] Kolon deposu olusturuldu: {directory} ({meta['rows']:,} satir, "
+                  f"{time.perf_counter() - started:.2f} sn)")
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
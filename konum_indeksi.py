@@ -0,0 +1,170 @@
+"""
+Konum İndeksi
+Trafo konumlarını (config.TRANSFORMER_LOCATIONS) sabit boyutlu enlem/boylam
+hücrelerine ve bölgelere göre gruplar. Harita görünümü (bbox) ve yarıçap
+sorguları tüm filoyu taramaz; sadece sorgu alanıyla kesişen hücrelere bakar.
+"""
+
+import math
+from collections import defaultdict
+
+import numpy as np
+
+# Hücre boyutu (derece) - İzmir enleminde ~5.5 km x 4.4 km
+DEFAULT_CELL_SIZE = 0.05
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """İki nokta arasındaki büyük daire mesafesi (km)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_bbox(text):
+    """
+    bbox parametresini çözer.
+    
+    Args:
+        text: 'batı,güney,doğu,kuzey' (min_lon,min_lat,max_lon,max_lat;
+            Leaflet toBBoxString() sırası)
+    
+    Returns:
+        tuple: (min_lat, min_lon, max_lat, max_lon)
+    
+    Raises:
+        ValueError: Format veya değer aralığı hatalıysa
+    """
+    parts = text.split(',')
+    if len(parts) != 4:
+        raise ValueError("bbox formatı: min_lon,min_lat,max_lon,max_lat")
+    min_lon, min_lat, max_lon, max_lat = (float(part) for part in parts)
+    # nan ile karşılaştırmalar hep False döner; sonsuz değerler hücre hesabında taşar
+    if not all(math.isfinite(value) for value in (min_lon, min_lat, max_lon, max_lat)):
+        raise ValueError("bbox: değerler sonlu sayı olmalı")
+    if not (-90 <= min_lat <= 90 and -90 <= max_lat <= 90):
+        raise ValueError("bbox: enlem -90 ile 90 arasında olmalı")
+    if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise ValueError("bbox: boylam -180 ile 180 arasında olmalı")
+    if min_lat > max_lat or min_lon > max_lon:
+        raise ValueError("bbox: min değerler max değerlerden büyük olamaz")
+    return min_lat, min_lon, max_lat, max_lon
+
+
+class SpatialIndex:
+    """
+    Sabit grid + bölge indeksi.
+    
+    Konumlar başlangıçta bir kez indekslenir. bbox sorgusu kesişen
+    hücrelerdeki trafoları döner (tam içeride kalan hücreler kontrolsüz,
+    kenar hücreler nokta nokta kontrol edilir).
+    """
+    
+    def __init__(self, locations, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.locations = {location['id']: location for location in locations}
+        self._cells = defaultdict(list)         # (satır, sütun) -> trafo ID'leri
+        self.regions = defaultdict(list)        # bölge -> trafo ID'leri
+        
+        for location in locations:
+            self._cells[self._cell(location['latitude'], location['longitude'])].append(location['id'])
+            self.regions[location['region']].append(location['id'])
+        self._cells = dict(self._cells)
+        self.regions = dict(self.regions)
+        self._bounds = {region: self._compute_bounds(ids) for region, ids in self.regions.items()}
+        
+        # transformer_id -> bölge (toplu eşleme için dizi, indeks = ID)
+        self._region_by_id = np.empty(max(self.locations, default=0) + 1, dtype=object)
+        for transformer_id, location in self.locations.items():
+            self._region_by_id[transformer_id] = location['region']
+    
+    def _cell(self, latitude, longitude):
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+    
+    def __len__(self):
+        return len(self.locations)
+    
+    def in_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """
+        Dikdörtgen içindeki trafolar.
+        
+        Returns:
+            list: Sıralı trafo ID'leri
+        """
+        row_min, col_min = self._cell(min_lat, min_lon)
+        row_max, col_max = self._cell(max_lat, max_lon)
+        
+        # Sorgu alanı grid'den büyükse hücre hücre gezmek yerine dolu hücreleri tara
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cells):
+            cells = [cell for cell in self._cells if row_min <= cell[0] <= row_max and col_min <= cell[1] <= col_max]
+        else:
+            cells = [
+                (row, col)
+                for row in range(row_min, row_max + 1)
+                for col in range(col_min, col_max + 1)
+                if (row, col) in self._cells
+            ]
+        
+        result = []
+        for row, col in cells:
+            ids = self._cells[(row, col)]
+            if row_min < row < row_max and col_min < col < col_max:
+                result.extend(ids)      # İç hücre: tamamı alanın içinde
+                continue
+            for transformer_id in ids:
+                location = self.locations[transformer_id]
+                if min_lat <= location['latitude'] <= max_lat and min_lon <= location['longitude'] <= max_lon:
+                    result.append(transformer_id)
+        result.sort()
+        return result
+    
+    def within_radius(self, latitude, longitude, radius_km):
+        """
+        Merkeze verilen mesafedeki trafolar.
+        
+        Returns:
+            list: (trafo ID, mesafe km) - yakından uzağa
+        """
+        # Yarıçapı kapsayan dikdörtgenle adayları daralt, sonra gerçek mesafe
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+        dlon = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+        
+        result = []
+        for transformer_id in self.in_bbox(latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon):
+            location = self.locations[transformer_id]
+            distance = haversine_km(latitude, longitude, location['latitude'], location['longitude'])
+            if distance <= radius_km:
+                result.append((transformer_id, round(distance, 3)))
+        result.sort(key=lambda item: item[1])
+        return result
+    
+    def region_of(self, transformer_ids):
+        """Trafo ID dizisi için bölge adları dizisi"""
+        return self._region_by_id[np.asarray(transformer_ids, dtype=np.int64)]
+    
+    def region_bounds(self, region):
+        """
+        Bölgenin sınırları ve merkezi.
+        
+        Returns:
+            dict: bbox (min_lon, min_lat, max_lon, max_lat) ve center
+        """
+        bounds = self._bounds[region]
+        return {'bbox': list(bounds['bbox']), 'center': dict(bounds['center'])}
+    
+    def _compute_bounds(self, transformer_ids):
+        points = [self.locations[transformer_id] for transformer_id in transformer_ids]
+        latitudes = [point['latitude'] for point in points]
+        longitudes = [point['longitude'] for point in points]
+        return {
+            'bbox': [min(longitudes), min(latitudes), max(longitudes), max(latitudes)],
+            'center': {
+                'latitude': round(sum(latitudes) / len(latitudes), 6),
+                'longitude': round(sum(longitudes) / len(longitudes), 6)
+            }
+        }
@@ -3,16 +3,24 @@ Yapay Zeka Model Eğitim Scripti
 Isolation Forest algoritması ile anomali tespiti modeli eğitir.
 """
 
-import pandas as pd
 import numpy as np
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import classification_report, confusion_matrix, f1_score, precision_score, recall_score
-import joblib
 import os
 import sys
 from config import MODEL_CONFIG, DATA_GENERATION
 
+# pandas, scikit-learn ve joblib kullanan fonksiyonların içinde import edilir:
+# API süreçleri modül yüklenirken ~1 sn bu kütüphaneleri beklemez
+
+# Model girdisi olan sensör kolonları (sıra önemli - scaler bu sırayla eğitilir)
+FEATURE_COLUMNS = [
+    'toprak_direnci',
+    'kacak_akim',
+    'toprak_potansiyel',
+    'toprak_nemi',
+    'toprak_sicakligi',
+    'korozyon_seviyesi'
+]
+
 def load_and_prepare_data():
     """
     CSV dosyasından veriyi yükler ve model için hazırlar.
@@ -21,30 +29,27 @@ def load_and_prepare_data():
         X: Özellik matrisi
         y: Gerçek anomali etiketleri (doğrulama için)
     """
+    from kolon_deposu import open_sensor_columns
+    
     data_file = DATA_GENERATION['output_file']
     
-    if not os.path.exists(data_file):
+    # Kolon deposu (memmap) - yoksa ya da CSV değişmişse CSV'den bir kez üretilir
+    columns = open_sensor_columns(data_file)
+    if columns is None:
         print(f"[X] Veri dosyasi bulunamadi: {data_file}")
         print("Once 'python veri_uret.py' komutunu calistirin!")
         sys.exit(1)
     
-    print(f"Veri yukleniyor: {data_file}")
-    df = pd.read_csv(data_file)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    print(f"Veri yukleniyor: {columns.directory}")
+    
+    # Kolon deposu (trafo, zaman) sıralıdır; eğitim/test ayrımı için zaman sırasına dön
+    order = np.argsort(columns.column('timestamp'), kind='stable')
+    df = columns.frame().iloc[order].reset_index(drop=True)
     
     print(f"[OK] {len(df):,} kayit yuklendi")
     
     # Model için özellikleri seç (sensör değerleri)
-    feature_columns = [
-        'toprak_direnci',
-        'kacak_akim',
-        'toprak_potansiyel',
-        'toprak_nemi',
-        'toprak_sicakligi',
-        'korozyon_seviyesi'
-    ]
-    
-    X = df[feature_columns].values
+    X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
     y = df['anomali'].values  # Gerçek etiketler (doğrulama için)
     
     return X, y, df
@@ -62,6 +67,9 @@ def train_isolation_forest(X_train, contamination=0.1):
         model: Eğitilmiş model
         scaler: Veri ölçeklendirici
     """
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+    
     print("\nModel egitimi basliyor...")
     print(f"   Algoritma: Isolation Forest")
     print(f"   Beklenen anomali orani: {contamination*100:.1f}%")
@@ -97,6 +105,8 @@ def evaluate_model(model, scaler, X_test, y_test):
         X_test: Test verisi
         y_test: Gerçek etiketler
     """
+    from sklearn.metrics import classification_report, confusion_matrix, f1_score, precision_score, recall_score
+    
     print("\nModel degerlendirmesi yapiliyor...")
     
     # Test verisini ölçeklendir
@@ -157,15 +167,7 @@ def predict_anomaly(model, scaler, sensor_data):
     """
     # Dict ise array'e çevir
     if isinstance(sensor_data, dict):
-        feature_columns = [
-            'toprak_direnci',
-            'kacak_akim',
-            'toprak_potansiyel',
-            'toprak_nemi',
-            'toprak_sicakligi',
-            'korozyon_seviyesi'
-        ]
-        sensor_array = np.array([[sensor_data[col] for col in feature_columns]])
+        sensor_array = np.array([[sensor_data[col] for col in FEATURE_COLUMNS]])
     else:
         sensor_array = sensor_data.reshape(1, -1)
     
@@ -181,6 +183,29 @@ def predict_anomaly(model, scaler, sensor_data):
     return is_anomaly, anomaly_score
 
 
+def predict_anomaly_batch(model, scaler, sensor_array):
+    """
+    Birden çok sensör okuması için tek seferde anomali tahmini yapar.
+    
+    Args:
+        model: Eğitilmiş model
+        scaler: Veri ölçeklendirici
+        sensor_array: (N, 6) boyutlu dizi (FEATURE_COLUMNS sırasıyla)
+    
+    Returns:
+        is_anomaly: (N,) boyutlu bool dizi
+        anomaly_score: (N,) boyutlu anomali skoru dizisi
+    """
+    sensor_scaled = scaler.transform(np.asarray(sensor_array, dtype=float))
+    anomaly_score = model.score_samples(sensor_scaled)
+    
+    # model.predict() ağaçları ikinci kez dolaşır; aynı sonuç
+    # decision_function = score_samples - offset_ < 0 ile elde edilir
+    is_anomaly = (anomaly_score - model.offset_) < 0
+    
+    return is_anomaly, anomaly_score
+
+
 def calculate_risk_score(anomaly_score, sensor_data):
     """
     Anomali skorundan risk puanı hesaplar (0-100 arası).
@@ -219,6 +244,33 @@ def calculate_risk_score(anomaly_score, sensor_data):
     return round(risk_score, 2)
 
 
+def calculate_risk_score_batch(anomaly_score, sensor_array):
+    """
+    calculate_risk_score'un vektörel sürümü (0-100 arası risk puanları).
+    
+    Args:
+        anomaly_score: (N,) boyutlu anomali skoru dizisi
+        sensor_array: (N, 6) boyutlu sensör dizisi (FEATURE_COLUMNS sırasıyla)
+    
+    Returns:
+        risk_score: (N,) boyutlu risk puanı dizisi
+    """
+    sensor_array = np.asarray(sensor_array, dtype=float)
+    normalized_score = (np.asarray(anomaly_score) + 0.5) / 1.0
+    base_risk = (1 - normalized_score) * 100
+    
+    # Sensör değerlerine göre ek risk faktörleri (calculate_risk_score ile aynı eşikler)
+    risk_factors = (
+        np.where(sensor_array[:, FEATURE_COLUMNS.index('toprak_direnci')] > 10, 20, 0) +
+        np.where(sensor_array[:, FEATURE_COLUMNS.index('kacak_akim')] > 20, 15, 0) +
+        np.where(sensor_array[:, FEATURE_COLUMNS.index('korozyon_seviyesi')] > 50, 10, 0)
+    )
+    
+    risk_score = np.minimum(base_risk + risk_factors, 100)
+    
+    return np.round(risk_score, 2)
+
+
 def save_model(model, scaler, model_path=None):
     """
     Eğitilmiş modeli ve scaler'ı kaydeder.
@@ -236,6 +288,8 @@ def save_model(model, scaler, model_path=None):
     if model_dir and not os.path.exists(model_dir):
         os.makedirs(model_dir)
     
+    import joblib
+    
     # Modeli kaydet
     joblib.dump({
         'model': model,
@@ -262,6 +316,9 @@ def load_model(model_path=None):
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Model dosyası bulunamadı: {model_path}")
     
+    import joblib
+    
+    # Model nesnesi açılırken scikit-learn de import edilir (~1 sn)
     data = joblib.load(model_path)
     return data['model'], data['scaler']
 
@@ -0,0 +1,221 @@
+"""
+Paylaşımlı Durum (çok süreçli sunucu)
+Üretim sunucusunda (sunucu.py) filo görüntüsü tek bir puanlama sürecinde
+üretilir ve paylaşımlı belleğe yazılır; tüm işçi süreçleri aynı görüntüyü
+okur. İzolasyon ve olay onayı gibi yazma işlemleri komut kuyruğuyla puanlama sürecine
+iletilir.
+
+Bellek düzeni (seqlock):
+    [seq: uint64][uzunluk: uint64][veri ...]
+Yazar seq'i tek sayıya çekip veriyi yazar, sonra çift sayıya çeker.
+Okuyucu seq okuma öncesi ve sonrası aynı ve çift ise veriyi kabul eder;
+kilit yoktur, okuyucular yazarı hiç bekletmez.
+"""
+
+import pickle
+import queue
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from puanlama_dongusu import FleetScoringLoop, snapshot_from_payload, snapshot_to_payload
+
+SEQ = struct.Struct('<Q')
+HEADER = struct.Struct('<QQ')
+
+# Görüntü için ayrılan alan (bayt) - 120 trafo ~200 KB
+DEFAULT_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+class SeqlockBuffer:
+    """
+    Tek yazarlı, çok okuyuculu paylaşımlı bellek tamponu.
+    
+    Süreçler fork ile oluşturulmadan önce ana süreçte yaratılmalıdır;
+    işçiler aynı nesneyi miras alır (isimle yeniden bağlanmaya gerek yok).
+    """
+    
+    def __init__(self, size=DEFAULT_BUFFER_SIZE):
+        self.capacity = size
+        self.shm = shared_memory.SharedMemory(create=True, size=HEADER.size + size)
+        HEADER.pack_into(self.shm.buf, 0, 0, 0)
+        self._write_lock = threading.Lock()
+    
+    @property
+    def name(self):
+        return self.shm.name
+    
+    @property
+    def seq(self):
+        """Son tamamlanan yazmanın sıra numarası (0 = henüz yazılmadı)"""
+        return SEQ.unpack_from(self.shm.buf, 0)[0]
+    
+    def write(self, data):
+        """Veriyi yazar (yazarlar kendi aralarında sıralanır)"""
+        if len(data) > self.capacity:
+            raise ValueError(
+                f"Görüntü ({len(data):,} bayt) paylaşımlı tampondan büyük ({self.capacity:,} bayt)"
+            )
+        buf = self.shm.buf
+        with self._write_lock:
+            seq = SEQ.unpack_from(buf, 0)[0]
+            HEADER.pack_into(buf, 0, seq + 1, len(data))    # Yazılıyor (tek)
+            buf[HEADER.size:HEADER.size + len(data)] = data
+            SEQ.pack_into(buf, 0, seq + 2)                  # Tamam (çift)
+    
+    def read(self, retries=1000):
+        """
+        Tutarlı bir kopya okur.
+        
+        Returns:
+            tuple: (seq, bytes) - henüz yazılmadıysa (0, None)
+        """
+        buf = self.shm.buf
+        for _ in range(retries):
+            seq, length = HEADER.unpack_from(buf, 0)
+            if seq == 0:
+                return 0, None
+            if seq & 1:
+                time.sleep(0)       # Yazar çalışıyor
+                continue
+            data = bytes(buf[HEADER.size:HEADER.size + length])
+            if SEQ.unpack_from(buf, 0)[0] == seq:
+                return seq, data
+        raise RuntimeError("Paylaşımlı görüntü okunamadı (yazar çok sık güncelliyor)")
+    
+    def close(self):
+        self.shm.close()
+    
+    def unlink(self):
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedSnapshotPublisher:
+    """FleetScoringLoop.on_publish: her yeni görüntüyü tampona yazar"""
+    
+    def __init__(self, buffer):
+        self.buffer = buffer
+    
+    def __call__(self, snapshot):
+        payload = pickle.dumps(snapshot_to_payload(snapshot), protocol=pickle.HIGHEST_PROTOCOL)
+        self.buffer.write(payload)
+
+
+class SharedFleetView:
+    """
+    İşçi süreçlerindeki FleetScoringLoop yerine geçen salt okunur görünüm.
+    
+    app.py endpoint'leri aynı arayüzü kullanır: snapshot özelliği,
+    set_isolation() ve acknowledge(). Görüntü sadece seq değiştiğinde yeniden çözülür.
+    """
+    
+    def __init__(self, buffer, command_queue):
+        self.buffer = buffer
+        self.command_queue = command_queue
+        self._seq = None
+        self._snapshot = None
+    
+    @property
+    def snapshot(self):
+        seq = self.buffer.seq
+        if seq != self._seq:
+            seq, data = self.buffer.read()
+            self._snapshot = snapshot_from_payload(pickle.loads(data)) if data else None
+            self._seq = seq
+        return self._snapshot
+    
+    def wait_ready(self, timeout=30):
+        """İlk görüntü yayınlanana kadar bekler"""
+        deadline = time.monotonic() + timeout
+        while self.buffer.seq == 0:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def set_isolation(self, transformer_id, status, timeout=2.0):
+        """
+        İzolasyon komutunu puanlama sürecine gönderir ve yeni görüntüyü bekler.
+        
+        Returns:
+            FleetSnapshot: Güncel görüntü (zaman aşımında son görüntü)
+        """
+        seq = self.buffer.seq
+        self.command_queue.put(('set_isolation', int(transformer_id), bool(status)))
+        deadline = time.monotonic() + timeout
+        while self.buffer.seq == seq and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return self.snapshot
+    
+    def acknowledge(self, incident_id, note=None, timeout=2.0):
+        """
+        Olay onayını puanlama sürecine gönderir ve yeni görüntüyü bekler.
+        
+        Returns:
+            dict: Güncel görüntüdeki olay, bulunamazsa None
+        """
+        # Görüntüde aktif olmayan olay için puanlama süreci yayın yapmaz
+        if not any(i['incident_id'] == incident_id for i in self.snapshot.incidents):
+            return None
+        
+        seq = self.buffer.seq
+        self.command_queue.put(('acknowledge', int(incident_id), note))
+        deadline = time.monotonic() + timeout
+        while self.buffer.seq == seq and time.monotonic() < deadline:
+            time.sleep(0.005)
+        
+        for incident in self.snapshot.incidents:
+            if incident['incident_id'] == incident_id:
+                return dict(incident)
+        return None
+
+
+def run_scoring_process(buffer, command_queue, stop_event, interval=None):
+    """
+    Puanlama süreci: filoyu üretir/puanlar, görüntüyü tampona yazar ve
+    işçilerden gelen komutları uygular.
+    
+    Args:
+        buffer: SeqlockBuffer (ana süreçte oluşturulmuş)
+        command_queue: İşçilerden gelen komutlar
+        stop_event: Kapanış sinyali
+        interval: Puanlama aralığı (saniye)
+    """
+    from simulasyon import FleetSimulator, AnomalyDetectionSystem
+    
+    detection_system = AnomalyDetectionSystem()
+    fleet = FleetSimulator()
+    loop = FleetScoringLoop(
+        fleet,
+        detection_system,
+        interval=interval,
+        on_publish=SharedSnapshotPublisher(buffer)
+    )
+    loop.start()
+    print(f"[OK] Puanlama sureci basladi ({len(fleet)} trafo, {loop.interval} sn)")
+    
+    try:
+        while not stop_event.is_set():
+            try:
+                command = command_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            name, *args = command
+            try:
+                if name == 'set_isolation':
+                    loop.set_isolation(*args)
+                elif name == 'acknowledge':
+                    loop.acknowledge(*args)
+                else:
+                    print(f"⚠️ Bilinmeyen komut: {name}")
+            except Exception as e:
+                print(f"⚠️ Komut hatası ({name}): {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.stop()
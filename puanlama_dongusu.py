@@ -0,0 +1,290 @@
+"""
+Arka Plan Puanlama Döngüsü
+app.py için filonun sensör verisini belirli aralıklarla üretip tek seferde
+puanlar ve sonucu değiştirilemez bir anlık görüntü (snapshot) olarak yayınlar.
+Okuma endpoint'leri model çalıştırmaz; sadece son görüntüyü döner.
+"""
+
+import threading
+from collections import namedtuple
+from datetime import datetime
+from types import MappingProxyType
+
+import numpy as np
+
+from config import SIMULATION_CONFIG
+from durum_deposu import SnapshotStore
+from istatistik_toplayici import FleetStatistics
+from model_egit import FEATURE_COLUMNS
+from yanit_katmani import dumps_bytes
+
+# Görüntüde tutulan son bildirim sayısı (/api/alerts)
+SNAPSHOT_ALERT_LIMIT = 50
+
+# Tek tick'in yayınlanmış hali. Alanlar okuyuculara verildikten sonra
+# değiştirilmez; yeni tick yeni bir FleetSnapshot oluşturur.
+FleetSnapshot = namedtuple('FleetSnapshot', [
+    'version',            # Her yayında artan sayaç
+    'timestamp',          # Puanlama zamanı
+    'transformers',       # Trafo kayıtları (tuple)
+    'by_id',              # transformer_id -> kayıt (salt okunur)
+    'stats',              # /api/dashboard/stats içeriği
+    'alerts',             # Son bildirimler (eskiden yeniye, tuple)
+    'incidents',          # Aktif olaylar (en yeni önce, tuple)
+    'transformers_json',  # /api/transformers yanıt gövdesi (hazır bayt)
+    'stats_json'          # /api/dashboard/stats yanıt gövdesi (hazır bayt)
+])
+
+
+def dashboard_stats(summary):
+    """FleetStatistics.summary() çıktısını /api/dashboard/stats formatına çevirir"""
+    return {
+        'total_transformers': summary['total_transformers'],
+        'anomaly_count': summary['anomaly_count'],
+        'isolated_count': summary['isolated_count'],
+        'risk_distribution': summary['risk_distribution'],
+        'average_risk': summary['average_risk'],
+        'max_risk': summary['max_risk'],
+        'min_risk': summary['min_risk'],
+        'estimated_savings': summary['estimated_savings']
+    }
+
+
+def build_fleet_snapshot(fleet, values, analysis, timestamp, version, alerts=(), incidents=(), stats=None):
+    """
+    Bir tick'in sonuçlarından yayınlanacak anlık görüntüyü oluşturur.
+    
+    Args:
+        fleet: FleetSimulator objesi
+        values: generate_tick() çıktısı
+        analysis: AnomalyDetectionSystem.analyze_batch() çıktısı
+        timestamp: Puanlama zamanı
+        version: Görüntü versiyonu
+        alerts: Görüntüye eklenecek son bildirimler
+        incidents: Görüntüye eklenecek aktif olaylar
+        stats: Hazır filo istatistikleri (dashboard_stats formatı); None
+            ise bu tick'in dizilerinden hesaplanır
+    
+    Returns:
+        FleetSnapshot: Değiştirilemez görüntü
+    """
+    locations = fleet.location_columns()
+    isolation_status = fleet.isolation_status.copy()
+    last_update = timestamp.isoformat()
+    
+    # Kolonları bir kez Python listelerine çevir, kayıtları zip ile kur
+    ids = fleet.transformer_ids.tolist()
+    names = locations['name'].tolist()
+    regions = locations['region'].tolist()
+    latitudes = locations['latitude'].tolist()
+    longitudes = locations['longitude'].tolist()
+    risk_scores = np.round(analysis['risk_score'], 2).tolist()
+    risk_levels = analysis['risk_level'].tolist()
+    anomalies = analysis['is_anomaly'].tolist()
+    anomaly_scores = analysis['anomaly_score'].tolist()
+    isolation = isolation_status.tolist()
+    sensor_rows = values.tolist()
+    
+    transformers = tuple(
+        MappingProxyType({
+            'id': ids[i],
+            'name': names[i],
+            'region': regions[i],
+            'latitude': latitudes[i],
+            'longitude': longitudes[i],
+            'risk_score': risk_scores[i],
+            'risk_level': risk_levels[i],
+            'is_anomaly': anomalies[i],
+            'anomaly_score': anomaly_scores[i],
+            'isolation_status': isolation[i],
+            'last_update': last_update,
+            'sensor_data': MappingProxyType(dict(zip(FEATURE_COLUMNS, sensor_rows[i])))
+        })
+        for i in range(len(ids))
+    )
+    by_id = MappingProxyType({record['id']: record for record in transformers})
+    
+    if stats is None:
+        statistics = FleetStatistics()
+        statistics.update_many(ids, analysis['risk_score'], analysis['is_anomaly'], ~isolation_status)
+        stats = dashboard_stats(statistics.summary())
+    
+    # Liste yanıtı anomaly_score içermez (önceki /api/transformers formatı)
+    transformers_json = dumps_bytes({
+        'success': True,
+        'version': version,
+        'timestamp': last_update,
+        'count': len(transformers),
+        'transformers': [
+            {key: value for key, value in record.items() if key != 'anomaly_score'}
+            for record in transformers
+        ]
+    })
+    stats_json = dumps_bytes({
+        'success': True,
+        'version': version,
+        'timestamp': last_update,
+        'stats': stats
+    })
+    
+    return FleetSnapshot(
+        version=version,
+        timestamp=timestamp,
+        transformers=transformers,
+        by_id=by_id,
+        stats=MappingProxyType(stats),
+        alerts=tuple(alerts),
+        incidents=tuple(MappingProxyType(incident) for incident in incidents),
+        transformers_json=transformers_json,
+        stats_json=stats_json
+    )
+
+
+def snapshot_to_payload(snapshot):
+    """Görüntüyü süreçler arası aktarım için düz dict'e çevirir (pickle uyumlu)"""
+    return {
+        'version': snapshot.version,
+        'timestamp': snapshot.timestamp,
+        'transformers': [
+            dict(record, sensor_data=dict(record['sensor_data']))
+            for record in snapshot.transformers
+        ],
+        'stats': dict(snapshot.stats),
+        'alerts': list(snapshot.alerts),
+        'incidents': [dict(incident) for incident in snapshot.incidents],
+        'transformers_json': snapshot.transformers_json,
+        'stats_json': snapshot.stats_json
+    }
+
+
+def snapshot_from_payload(payload):
+    """snapshot_to_payload() çıktısından salt okunur görüntüyü yeniden kurar"""
+    transformers = tuple(
+        MappingProxyType(dict(record, sensor_data=MappingProxyType(record['sensor_data'])))
+        for record in payload['transformers']
+    )
+    return FleetSnapshot(
+        version=payload['version'],
+        timestamp=payload['timestamp'],
+        transformers=transformers,
+        by_id=MappingProxyType({record['id']: record for record in transformers}),
+        stats=MappingProxyType(payload['stats']),
+        alerts=tuple(payload['alerts']),
+        incidents=tuple(MappingProxyType(incident) for incident in payload['incidents']),
+        transformers_json=payload['transformers_json'],
+        stats_json=payload['stats_json']
+    )
+
+
+class FleetScoringLoop:
+    """
+    Filoyu arka planda puanlayan ve son görüntüyü yayınlayan döngü.
+    
+    Üretim + puanlama sadece bu iş parçacığında yapılır. Görüntü bir
+    SnapshotStore içinde tutulur: istekler kilitsiz okur ve her zaman
+    tutarlı, tam bir görüntü görür; yazarlar (tick, izolasyon) sıralanır.
+    """
+    
+    def __init__(self, fleet, detection_system, interval=None, on_publish=None):
+        self.fleet = fleet
+        self.detection_system = detection_system
+        self.interval = interval if interval is not None else SIMULATION_CONFIG['update_interval']
+        self.on_publish = on_publish    # Yeni görüntü callback'i (ör. paylaşımlı bellek)
+        
+        self.store = SnapshotStore()
+        self.statistics = FleetStatistics(len(fleet))
+        self._values = None
+        self._analysis = None
+        self._timestamp = None
+        
+        self._lock = threading.Lock()      # Filo dizileri (üretim + izolasyon)
+        self._thread = None
+        self._stop = threading.Event()
+    
+    @property
+    def snapshot(self):
+        """Son yayınlanan FleetSnapshot (kilitsiz okuma)"""
+        return self.store.get()
+    
+    def start(self):
+        """İlk tick'i hemen puanlar ve arka plan iş parçacığını başlatır"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.tick()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='fleet-scoring', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"⚠️ Puanlama döngüsü hatası: {e}")
+    
+    def tick(self):
+        """Filo için yeni sensör verisi üretir, puanlar ve yayınlar"""
+        timestamp = datetime.now()
+        with self._lock:
+            values = self.fleet.generate_tick(timestamp)
+            analysis = self.detection_system.analyze_batch(values)
+            self.fleet.risk_scores[:] = analysis['risk_score']
+            self.detection_system.process_alerts(self.fleet.transformer_ids, analysis['risk_score'], timestamp)
+            self.statistics.update_many(
+                self.fleet.transformer_ids,
+                analysis['risk_score'],
+                analysis['is_anomaly'],
+                ~self.fleet.isolation_status
+            )
+            
+            self._values = values
+            self._analysis = analysis
+            self._timestamp = timestamp
+            return self._publish_locked()
+    
+    def set_isolation(self, transformer_id, status):
+        """
+        Trafo izolasyon durumunu değiştirir ve görüntüyü yeniden yayınlar
+        (model tekrar çalıştırılmaz).
+        
+        Returns:
+            FleetSnapshot: Güncel görüntü
+        """
+        with self._lock:
+            index = self.fleet.positions_of([transformer_id])[0]
+            self.fleet.isolation_status[index] = status
+            self.statistics.set_isolated(transformer_id, not status)
+            if self._values is None:
+                return self.snapshot
+            return self._publish_locked()
+    
+    def acknowledge(self, incident_id, note=None):
+        """
+        Aktif olayı onaylar ve görüntüyü yeniden yayınlar.
+        
+        Returns:
+            dict: Onaylanan olay, bulunamazsa None
+        """
+        with self._lock:
+            incident = self.detection_system.alert_engine.acknowledge(incident_id, note)
+            if incident is not None and self._values is not None:
+                self._publish_locked()
+            return incident
+    
+    def _publish_locked(self):
+        snapshot = self.store.update(lambda _previous, version: build_fleet_snapshot(
+            self.fleet,
+            self._values,
+            self._analysis,
+            self._timestamp,
+            version,
+            alerts=self.detection_system.alerts.latest(SNAPSHOT_ALERT_LIMIT),
+            incidents=self.detection_system.alert_engine.incidents('active'),
+            stats=dashboard_stats(self.statistics.summary())
+        ))
+        if self.on_publish is not None:
+            self.on_publish(snapshot)
+        return snapshot
@@ -0,0 +1,206 @@
+"""
+Sahte Firestore
+google-cloud-firestore istemcisinin depolama.FirestoreBackend'in kullandığı
+alt kümesinin bellek içi uygulaması. İnternet ve firebase-key.json olmadan
+uzak yolun performansını ölçmek için her uzak çağrıya (commit, get, stream)
+sabit gecikme eklenir ve okuma/yazma sayıları tutulur.
+
+    client = FakeFirestoreClient(latency=0.05)
+    backend = FirestoreBackend(client)
+    ...
+    client.stats    # {'round_trips': ..., 'reads': ..., 'writes': ...}
+"""
+
+import copy
+import threading
+import time
+import uuid
+
+MAX_BATCH_OPERATIONS = 500
+
+OPERATORS = {
+    '==': lambda value, target: value == target,
+    '!=': lambda value, target: value != target,
+    '<': lambda value, target: value < target,
+    '<=': lambda value, target: value <= target,
+    '>': lambda value, target: value > target,
+    '>=': lambda value, target: value >= target,
+    'in': lambda value, target: value in target
+}
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+    
+    @property
+    def exists(self):
+        return self._data is not None
+    
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class FakeDocumentReference:
+    def __init__(self, collection, doc_id):
+        self._collection = collection
+        self.id = doc_id
+    
+    def set(self, data):
+        """Belgeyi yazar (tek uzak çağrı)"""
+        client = self._collection._client
+        client._round_trip(writes=1)
+        with client._lock:
+            self._collection._documents[self.id] = copy.deepcopy(data)
+    
+    def get(self):
+        """Belgeyi okur (tek uzak çağrı, bir okuma)"""
+        client = self._collection._client
+        client._round_trip(reads=1)
+        with client._lock:
+            return FakeDocumentSnapshot(self.id, self._collection._documents.get(self.id))
+
+
+class FakeQuery:
+    def __init__(self, collection, filters=(), orders=(), limit_count=None, cursor=None):
+        self._collection = collection
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit_count
+        self._cursor = cursor
+    
+    def _copy(self, **changes):
+        options = {
+            'filters': self._filters,
+            'orders': self._orders,
+            'limit_count': self._limit,
+            'cursor': self._cursor
+        }
+        options.update(changes)
+        return FakeQuery(self._collection, **options)
+    
+    def where(self, field, op, value):
+        if op not in OPERATORS:
+            raise ValueError(f"Desteklenmeyen operatör: {op}")
+        return self._copy(filters=self._filters + ((field, op, value),))
+    
+    def order_by(self, field, direction='ASCENDING'):
+        return self._copy(orders=self._orders + ((field, direction),))
+    
+    def limit(self, count):
+        return self._copy(limit_count=count)
+    
+    def start_after(self, snapshot):
+        """Sonuçlar verilen belgenin sıralamadaki konumundan sonra başlar"""
+        return self._copy(cursor=snapshot)
+    
+    def _sort_key(self, doc_id, data):
+        # Firestore gibi: eşitlikte belge adı (son sıralamanın yönünde)
+        return tuple(data[field] for field, _ in self._orders) + (doc_id,)
+    
+    def _after_cursor(self, doc_id, data):
+        cursor = self._sort_key(self._cursor.id, self._cursor.to_dict())
+        key = self._sort_key(doc_id, data)
+        directions = [direction for _field, direction in self._orders]
+        directions.append(directions[-1] if directions else 'ASCENDING')
+        for value, cursor_value, direction in zip(key, cursor, directions):
+            if value != cursor_value:
+                return value < cursor_value if direction == 'DESCENDING' else value > cursor_value
+        return False
+    
+    def _matches(self, data):
+        # Firestore gibi: filtre/sıralama alanı olmayan belgeler sonuçta yer almaz
+        fields = {field for field, _op, _value in self._filters} | {field for field, _ in self._orders}
+        if any(data.get(field) is None for field in fields):
+            return False
+        return all(OPERATORS[op](data[field], value) for field, op, value in self._filters)
+    
+    def stream(self):
+        """Sorguyu çalıştırır (tek uzak çağrı; okuma sayısı = dönen belge, en az 1)"""
+        client = self._collection._client
+        with client._lock:
+            results = [
+                (doc_id, copy.deepcopy(data))
+                for doc_id, data in self._collection._documents.items()
+                if self._matches(data)
+            ]
+        last_direction = self._orders[-1][1] if self._orders else 'ASCENDING'
+        results.sort(key=lambda item: item[0], reverse=last_direction == 'DESCENDING')
+        for field, direction in reversed(self._orders):
+            results.sort(key=lambda item: item[1][field], reverse=direction == 'DESCENDING')
+        if self._cursor is not None:
+            results = [(doc_id, data) for doc_id, data in results if self._after_cursor(doc_id, data)]
+        if self._limit is not None:
+            results = results[:self._limit]
+        client._round_trip(reads=max(len(results), 1))
+        return iter([FakeDocumentSnapshot(doc_id, data) for doc_id, data in results])
+    
+    def get(self):
+        return list(self.stream())
+
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, client, name):
+        super().__init__(self)
+        self._client = client
+        self.id = name
+        self._documents = {}
+    
+    def document(self, doc_id=None):
+        return FakeDocumentReference(self, doc_id if doc_id is not None else uuid.uuid4().hex[:20])
+
+
+class FakeWriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._operations = []
+    
+    def set(self, reference, data):
+        if len(self._operations) >= MAX_BATCH_OPERATIONS:
+            raise ValueError(f"Toplu yazma en fazla {MAX_BATCH_OPERATIONS} işlem içerebilir")
+        self._operations.append((reference, copy.deepcopy(data)))
+    
+    def commit(self):
+        """Tüm işlemleri tek uzak çağrıda yazar"""
+        self._client._round_trip(writes=len(self._operations))
+        with self._client._lock:
+            for reference, data in self._operations:
+                reference._collection._documents[reference.id] = data
+        self._operations = []
+
+
+class FakeFirestoreClient:
+    """
+    Bellek içi Firestore istemcisi.
+    
+    Args:
+        latency: Her uzak çağrıya eklenen gecikme (saniye)
+    """
+    
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._collections = {}
+        self.stats = {'round_trips': 0, 'reads': 0, 'writes': 0}
+    
+    def collection(self, name):
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = FakeCollectionReference(self, name)
+            return self._collections[name]
+    
+    def batch(self):
+        return FakeWriteBatch(self)
+    
+    def _round_trip(self, reads=0, writes=0):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.stats['round_trips'] += 1
+            self.stats['reads'] += reads
+            self.stats['writes'] += writes
+    
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {'round_trips': 0, 'reads': 0, 'writes': 0}
@@ -9,16 +9,36 @@ import numpy as np
 import time
 import json
 import os
+import multiprocessing as mp
+import queue
+import threading
+import traceback
 from datetime import datetime, timedelta
-from model_egit import load_model, predict_anomaly, calculate_risk_score
+from model_egit import (
+    load_model,
+    predict_anomaly,
+    calculate_risk_score,
+    predict_anomaly_batch,
+    calculate_risk_score_batch,
+    FEATURE_COLUMNS
+)
 from config import (
     NUM_TRANSFORMERS,
     TRANSFORMER_LOCATIONS,
     SENSOR_RANGES,
     SIMULATION_CONFIG,
     RISK_SCORING,
-    ECONOMICS
+    ECONOMICS,
+    DATA_GENERATION,
+    STORAGE
 )
+from durum_deposu import AlertRingBuffer
+from bildirim_motoru import AlertEngine
+from veri_saklama import RealtimeRetention
+from depolama import BACKENDS, CsvBackend, REALTIME_FILE, open_backend
+
+# Bellekte tutulan son bildirim sayısı
+ALERT_CAPACITY = 100
 
 class TransformerSimulator:
     """
@@ -118,6 +138,283 @@ class TransformerSimulator:
             self.base_values['toprak_potansiyel'] = 15.0
 
 
+# Vektörel filo simülasyonu için kolon bazlı parametreler (FEATURE_COLUMNS sırasıyla)
+BASE_VALUE_RANGES = np.array([
+    [2.5, 4.5],     # toprak_direnci
+    [2.0, 8.0],     # kacak_akim
+    [-2.0, 2.0],    # toprak_potansiyel
+    [30.0, 50.0],   # toprak_nemi
+    [15.0, 25.0],   # toprak_sicakligi
+    [5.0, 20.0]     # korozyon_seviyesi
+])
+NOISE_STD = np.array([0.3, 1.5, 1.0, 5.0, 3.0, 2.0])
+
+# Sınırlar TransformerSimulator ile aynı: sadece direnç ve kaçak akım kırpılır
+CLIP_LOWER = np.array([
+    SENSOR_RANGES['toprak_direnci']['min'],
+    SENSOR_RANGES['kacak_akim']['min'],
+    -np.inf, -np.inf, -np.inf, -np.inf
+])
+CLIP_UPPER = np.array([
+    SENSOR_RANGES['toprak_direnci']['max'] * 5,  # Anomali için daha yüksek sınır
+    SENSOR_RANGES['kacak_akim']['max'] * 10,
+    np.inf, np.inf, np.inf, np.inf
+])
+
+# realtime_data.csv kolon sırası (save_data'daki {**sensor_data, **analysis} ile aynı)
+REALTIME_COLUMNS = (
+    ['timestamp', 'transformer_id'] +
+    FEATURE_COLUMNS +
+    ['latitude', 'longitude', 'name', 'region',
+     'is_anomaly', 'anomaly_score', 'risk_score', 'risk_level', 'risk_color']
+)
+
+
+def location_columns_for(transformer_ids):
+    """
+    Trafo ID dizisi için lokasyon kolonları (latitude, longitude, name, region).
+    Tüm ID'ler kayıtlardaysa doğrudan indekslenir; aralık dışı ID'ler
+    transformer_location() ile koordinatsız kayıt alır.
+    """
+    ids = np.asarray(transformer_ids)
+    if len(ids) and ids.min() >= 1 and ids.max() <= len(TRANSFORMER_LOCATIONS):
+        # Kayıt kolonlarından doğrudan indeksleme (ID - 1)
+        registry = TRANSFORMER_LOCATIONS.columns()
+        return {key: registry[key][ids - 1] for key in ('latitude', 'longitude', 'name', 'region')}
+    locations = [transformer_location(int(tid)) for tid in ids]
+    return {
+        key: np.array([location[key] for location in locations])
+        for key in ('latitude', 'longitude', 'name', 'region')
+    }
+
+
+def transformer_location(transformer_id):
+    """
+    Trafo lokasyon kaydını döner. Konfigürasyondaki trafo sayısını aşan
+    sentetik filolarda (benchmark, shard testleri) koordinatsız kayıt üretir.
+    """
+    if 1 <= transformer_id <= len(TRANSFORMER_LOCATIONS):
+        return TRANSFORMER_LOCATIONS[transformer_id - 1]
+    return {
+        'id': transformer_id,
+        'latitude': float('nan'),
+        'longitude': float('nan'),
+        'name': f'Trafo {transformer_id}',
+        'region': 'Bilinmiyor'
+    }
+
+
+class FleetSimulator:
+    """
+    Filo simülatörü - Tüm trafoların sensör verisini tek seferde üretir.
+    
+    Temel değerler (N, 6) boyutlu bir dizide tutulur ve her tick tek bir
+    rng.normal(size=(N, 6)) çağrısıyla üretilir. Liste gibi indekslenip
+    dolaşılabilir; her eleman TransformerSimulator uyumlu bir görünümdür.
+    """
+    
+    def __init__(self, num_transformers=None, transformer_ids=None, seed=None):
+        if transformer_ids is None:
+            if num_transformers is None:
+                num_transformers = NUM_TRANSFORMERS
+            transformer_ids = range(1, num_transformers + 1)
+        
+        self.transformer_ids = np.asarray(list(transformer_ids), dtype=np.int64)
+        self.rng = np.random.default_rng(seed)
+        
+        n = len(self.transformer_ids)
+        self.base_values = self.rng.uniform(
+            BASE_VALUE_RANGES[:, 0],
+            BASE_VALUE_RANGES[:, 1],
+            size=(n, len(FEATURE_COLUMNS))
+        )
+        self.isolation_status = np.ones(n, dtype=bool)  # True = AÇIK, False = KAPALI
+        self.risk_scores = np.zeros(n)
+        self.last_update = datetime.now()
+        
+        self._positions = None
+        self._location_columns = None
+    
+    def __len__(self):
+        return len(self.transformer_ids)
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return FleetTransformerView(self, index)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield FleetTransformerView(self, index)
+    
+    def positions_of(self, transformer_ids):
+        """Trafo ID'lerini filo içindeki satır indekslerine çevirir"""
+        if self._positions is None:
+            self._positions = {
+                int(tid): i for i, tid in enumerate(self.transformer_ids)
+            }
+        return np.array([self._positions[int(tid)] for tid in transformer_ids], dtype=np.int64)
+    
+    def _finalize(self, values):
+        """Yuvarlama ve kırpma (TransformerSimulator.generate_sensor_data ile aynı)"""
+        values = np.round(values, 2)
+        return np.clip(values, CLIP_LOWER, CLIP_UPPER, out=values)
+    
+    def generate_tick(self, timestamp=None):
+        """
+        Tüm filo için bir tick'lik sensör verisi üretir.
+        
+        Args:
+            timestamp: Okuma zamanı (sanal saat; varsayılan: şimdi)
+        
+        Returns:
+            ndarray: (N, 6) boyutlu sensör değerleri (FEATURE_COLUMNS sırasıyla)
+        """
+        noise = self.rng.normal(size=self.base_values.shape)
+        noise *= NOISE_STD
+        noise += self.base_values
+        self.last_update = timestamp if timestamp is not None else datetime.now()
+        return self._finalize(noise)
+    
+    def generate_row(self, index):
+        """Tek bir trafo için sensör değerleri üretir (satır indeksi ile)"""
+        values = self.base_values[index] + self.rng.normal(size=len(FEATURE_COLUMNS)) * NOISE_STD
+        return self._finalize(values)
+    
+    def apply_failure_mode(self, transformer_ids, failure_type='gradual'):
+        """
+        Arıza modunu seçilen trafolara maskeli vektör güncellemesiyle uygular.
+        
+        Args:
+            transformer_ids: Trafo ID listesi veya (N,) boyutlu bool maske
+            failure_type: 'gradual' (kademeli) veya 'sudden' (ani)
+        """
+        mask = np.asarray(transformer_ids)
+        if mask.dtype != bool:
+            mask = np.isin(self.transformer_ids, mask)
+        
+        resistance = FEATURE_COLUMNS.index('toprak_direnci')
+        corrosion = FEATURE_COLUMNS.index('korozyon_seviyesi')
+        leakage = FEATURE_COLUMNS.index('kacak_akim')
+        potential = FEATURE_COLUMNS.index('toprak_potansiyel')
+        
+        if failure_type == 'gradual':
+            # Kademeli korozyon
+            self.base_values[mask, resistance] += 0.1
+            self.base_values[mask, corrosion] += 1.0
+        elif failure_type == 'sudden':
+            # Ani kaçak akım
+            self.base_values[mask, leakage] = 50.0
+            self.base_values[mask, potential] = 15.0
+    
+    def location_columns(self):
+        """Lokasyon bilgilerini kolon dizileri olarak döner (ilk çağrıda hazırlanır)"""
+        if self._location_columns is None:
+            self._location_columns = location_columns_for(self.transformer_ids)
+        return self._location_columns
+    
+    def to_dataframe(self, values, analysis, timestamp=None):
+        """
+        Bir tick'in sensör verisi ve analiz sonuçlarını realtime_data.csv
+        kolon sırasıyla DataFrame'e çevirir.
+        
+        Args:
+            values: generate_tick() çıktısı
+            analysis: AnomalyDetectionSystem.analyze_batch() çıktısı
+            timestamp: Okuma zamanı (varsayılan: şimdi)
+        
+        Returns:
+            DataFrame: Kaydedilmeye hazır kayıtlar
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        
+        columns = {
+            'timestamp': timestamp.isoformat(),
+            'transformer_id': self.transformer_ids
+        }
+        for i, col in enumerate(FEATURE_COLUMNS):
+            columns[col] = values[:, i]
+        columns.update(self.location_columns())
+        for key in ('is_anomaly', 'anomaly_score', 'risk_score', 'risk_level', 'risk_color'):
+            columns[key] = analysis[key]
+        
+        return pd.DataFrame(columns, columns=REALTIME_COLUMNS)
+
+
+class FleetTransformerView:
+    """
+    FleetSimulator içindeki tek bir trafonun TransformerSimulator uyumlu görünümü.
+    Durum (izolasyon, risk) filo dizilerinde tutulur; görünüm sadece indeks taşır.
+    """
+    
+    __slots__ = ('fleet', 'index')
+    
+    def __init__(self, fleet, index):
+        self.fleet = fleet
+        self.index = index
+    
+    @property
+    def transformer_id(self):
+        return int(self.fleet.transformer_ids[self.index])
+    
+    @property
+    def location(self):
+        return transformer_location(self.transformer_id)
+    
+    @property
+    def base_values(self):
+        return dict(zip(FEATURE_COLUMNS, self.fleet.base_values[self.index].tolist()))
+    
+    @property
+    def isolation_status(self):
+        return bool(self.fleet.isolation_status[self.index])
+    
+    @isolation_status.setter
+    def isolation_status(self, value):
+        self.fleet.isolation_status[self.index] = value
+    
+    @property
+    def risk_score(self):
+        return float(self.fleet.risk_scores[self.index])
+    
+    @risk_score.setter
+    def risk_score(self, value):
+        self.fleet.risk_scores[self.index] = value
+    
+    @property
+    def last_update(self):
+        return self.fleet.last_update
+    
+    def generate_sensor_data(self):
+        """
+        Yeni sensör verisi üretir (TransformerSimulator ile aynı format).
+        
+        Returns:
+            dict: Sensör verileri
+        """
+        values = self.fleet.generate_row(self.index)
+        location = self.location
+        data = {
+            'timestamp': datetime.now().isoformat(),
+            'transformer_id': self.transformer_id
+        }
+        data.update(zip(FEATURE_COLUMNS, values.tolist()))
+        data.update({
+            'latitude': location['latitude'],
+            'longitude': location['longitude'],
+            'name': location['name'],
+            'region': location['region']
+        })
+        return data
+    
+    def apply_failure_mode(self, failure_type='gradual'):
+        """Arıza modunu bu trafoya uygular"""
+        self.fleet.apply_failure_mode([self.transformer_id], failure_type)
+
+
 class AnomalyDetectionSystem:
     """
     Anomali tespit sistemi - Model ile gerçek zamanlı analiz
@@ -127,7 +424,9 @@ class AnomalyDetectionSystem:
         self.model = None
         self.scaler = None
         self.load_model()
-        self.alerts = []  # Bildirimler
+        self.alerts = AlertRingBuffer(ALERT_CAPACITY)  # Bildirimler (son 100)
+        # Olay bazlı bildirim (tekrarlar bastırılır)
+        self.alert_engine = AlertEngine(name_of=lambda tid: transformer_location(tid)['name'])
     
     def load_model(self):
         """Eğitilmiş modeli yükler"""
@@ -182,6 +481,54 @@ class AnomalyDetectionSystem:
             'risk_color': RISK_SCORING[risk_level]['color']
         }
     
+    def analyze_batch(self, sensor_array):
+        """
+        Bir tick'lik sensör dizisini tek seferde analiz eder.
+        
+        Args:
+            sensor_array: (N, 6) boyutlu sensör dizisi (FEATURE_COLUMNS sırasıyla)
+        
+        Returns:
+            dict: Kolon bazlı analiz sonuçları (her değer (N,) boyutlu dizi)
+        """
+        n = len(sensor_array)
+        if self.model is None:
+            return {
+                'is_anomaly': np.zeros(n, dtype=bool),
+                'anomaly_score': np.zeros(n),
+                'risk_score': np.zeros(n),
+                'risk_level': np.full(n, 'unknown', dtype=object),
+                'risk_color': np.full(n, 'gray', dtype=object)
+            }
+        
+        is_anomaly, anomaly_score = predict_anomaly_batch(
+            self.model,
+            self.scaler,
+            sensor_array
+        )
+        risk_score = calculate_risk_score_batch(anomaly_score, sensor_array)
+        
+        # Risk seviyesi belirle (analyze_sensor_data ile aynı eşikler)
+        risk_level = np.select(
+            [risk_score < RISK_SCORING['low']['max'],
+             risk_score < RISK_SCORING['medium']['max']],
+            ['low', 'medium'],
+            'high'
+        ).astype(object)
+        risk_color = np.select(
+            [risk_level == 'low', risk_level == 'medium'],
+            [RISK_SCORING['low']['color'], RISK_SCORING['medium']['color']],
+            RISK_SCORING['high']['color']
+        ).astype(object)
+        
+        return {
+            'is_anomaly': is_anomaly,
+            'anomaly_score': np.round(anomaly_score, 4),
+            'risk_score': risk_score,
+            'risk_level': risk_level,
+            'risk_color': risk_color
+        }
+    
     def check_auto_isolation(self, transformer, analysis_result):
         """
         Otomatik yük izolasyonu kontrolü yapar.
@@ -206,65 +553,133 @@ class AnomalyDetectionSystem:
             self.alerts.append(alert)
             print(f"🔴 {alert['message']}")
     
-    def add_alert(self, transformer_id, message, severity='medium'):
+    def check_auto_isolation_batch(self, fleet, analysis, timestamp=None, verbose=True):
+        """
+        Otomatik yük izolasyonu kontrolünü tüm filo için yapar.
+        
+        Args:
+            fleet: FleetSimulator objesi
+            analysis: analyze_batch() sonuçları
+            timestamp: Bildirim zamanı (sanal saat; varsayılan: şimdi)
+            verbose: Bildirimleri ekrana yaz
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        
+        if not SIMULATION_CONFIG['enable_auto_isolation']:
+            return
+        
+        # Sadece yeni izole edilecek trafolar için döngü (genelde çok az)
+        newly_isolated = np.flatnonzero((analysis['risk_score'] >= 80) & fleet.isolation_status)
+        fleet.isolation_status[newly_isolated] = False
+        
+        for index in newly_isolated:
+            transformer_id = int(fleet.transformer_ids[index])
+            alert = {
+                'timestamp': timestamp.isoformat(),
+                'type': 'auto_isolation',
+                'transformer_id': transformer_id,
+                'message': f"⚠️ Trafo {transformer_id} otomatik olarak izole edildi (Risk: {analysis['risk_score'][index]:.1f})",
+                'severity': 'high'
+            }
+            self.alerts.append(alert)
+            if verbose:
+                print(f"🔴 {alert['message']}")
+    
+    def process_alerts(self, transformer_ids, risk_scores, timestamp=None, verbose=False):
+        """
+        Bir tick'in risk skorlarını bildirim motorundan geçirir; sadece olay
+        değişiklikleri (açıldı / yükseldi / kapandı) bildirim olarak eklenir.
+        
+        Args:
+            transformer_ids: (N,) trafo ID'leri
+            risk_scores: (N,) risk skorları
+            timestamp: Okuma zamanı (sanal saat; varsayılan: şimdi)
+            verbose: Bildirimleri ekrana yaz
+        
+        Returns:
+            list: Eklenen bildirimler
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+        events = self.alert_engine.evaluate(transformer_ids, risk_scores, timestamp)
+        self.alerts.extend(events)
+        if verbose:
+            for event in events:
+                print(f"   ⚠️ {event['message']}")
+        return events
+    
+    def add_alert(self, transformer_id, message, severity='medium', timestamp=None):
         """Bildirim ekler"""
+        if timestamp is None:
+            timestamp = datetime.now()
         alert = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp.isoformat(),
             'type': 'alert',
             'transformer_id': transformer_id,
             'message': message,
             'severity': severity
         }
         self.alerts.append(alert)
-        
-        # Son 100 bildirimi tut
-        if len(self.alerts) > 100:
-            self.alerts = self.alerts[-100:]
 
 
 class DataStorage:
     """
-    Veri depolama - Firebase Firestore (birincil) ve CSV (yedek)
+    Veri depolama - birincil depo (Firestore, yerel SQLite veya sahte
+    Firestore) ve CSV (yedek). Tüm depolar depolama.StorageBackend arayüzünü
+    uygular; CSV her zaman yazılır çünkü canlı akış (canli_akis) ve saklama
+    görevi (veri_saklama) bu dosyayı okur.
     """
     
-    def __init__(self, storage_type='firebase'):
+    def __init__(self, storage_type='firebase', lock=None):
         self.storage_type = storage_type
-        self.data_file = 'data/realtime_data.csv'
-        self.use_firebase = False
-        self.firestore_db = None
+        # CSV yazıcı kilidi: tek süreçte saklama görevinin (RealtimeRetention)
+        # döndürmesiyle yarışmaması için iş parçacığı kilidi; birden çok süreç
+        # aynı CSV'ye yazıyorsa paylaşılan süreç kilidi (shard modu)
+        self.lock = lock if lock is not None else threading.Lock()
+        self.csv = CsvBackend(REALTIME_FILE, lock=self.lock)
+        self.primary = None
         
-        # Firebase başlat (eğer kullanılacaksa)
+        # Firebase kullan (firebase-key.json varsa), yoksa CSV
         if self.storage_type == 'firebase':
+            if os.path.exists(STORAGE['firebase_key']):
+                self.storage_type = 'firestore'
+            else:
+                print("ℹ️  firebase-key.json bulunamadı, CSV kullanılacak")
+                self.storage_type = 'csv'
+        
+        if self.storage_type != 'csv':
             try:
-                from firebase_config import init_firebase, get_firestore, FIRESTORE_COLLECTION
-                # firebase-key.json dosyası var mı kontrol et
-                if os.path.exists('firebase-key.json'):
-                    init_firebase('firebase-key.json')
-                    self.firestore_db = get_firestore()
-                    if self.firestore_db:
-                        self.use_firebase = True
-                        print("✅ Firebase depolama aktif")
-                    else:
-                        print("⚠️  Firebase başlatılamadı, CSV kullanılacak")
-                        self.storage_type = 'csv'
-                else:
-                    print("ℹ️  firebase-key.json bulunamadı, CSV kullanılacak")
-                    self.storage_type = 'csv'
+                self.primary = open_backend(self.storage_type)
+                print(f"✅ {self.primary.name} depolama aktif")
             except Exception as e:
-                print(f"⚠️  Firebase başlatma hatası: {e}")
+                print(f"⚠️  {self.storage_type} başlatma hatası: {e}")
                 print("💡 CSV kullanılacak")
                 self.storage_type = 'csv'
         
         # CSV için klasör oluştur
         self.ensure_directory()
     
+    @property
+    def data_file(self):
+        return self.csv.data_file
+    
+    @data_file.setter
+    def data_file(self, path):
+        self.csv.data_file = path
+    
+    @property
+    def backends(self):
+        """Yazılacak depolar (birincil önce)"""
+        return [self.primary, self.csv] if self.primary is not None else [self.csv]
+    
     def ensure_directory(self):
         """Klasör yoksa oluştur"""
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
     
     def save_data(self, sensor_data, analysis_result):
         """
-        Veriyi kaydeder (Firebase ve/veya CSV).
+        Veriyi kaydeder (birincil depo tamponlanır ve toplu yazılır, CSV hemen).
         
         Args:
             sensor_data: Sensör verisi
@@ -279,54 +694,136 @@ class DataStorage:
         else:
             record['timestamp'] = datetime.now().isoformat()
         
-        # Firebase'e kaydet (birincil)
-        if self.use_firebase and self.firestore_db:
+        for backend in self.backends:
             try:
-                from firebase_config import save_to_firestore, FIRESTORE_COLLECTION
-                # Firestore için timestamp'i datetime'a çevir (opsiyonel)
-                firestore_record = record.copy()
-                save_to_firestore(firestore_record, FIRESTORE_COLLECTION)
+                backend.add(record)
             except Exception as e:
-                print(f"⚠️  Firebase kayıt hatası: {e}")
+                print(f"⚠️  {backend.name} kayıt hatası: {e}")
+    
+    def save_batch(self, df):
+        """
+        Bir tick'lik kayıtları her depoya tek seferde kaydeder.
         
-        # CSV'ye de kaydet (yedek)
-        try:
-            df = pd.DataFrame([record])
-            if os.path.exists(self.data_file):
-                df.to_csv(self.data_file, mode='a', header=False, index=False)
-            else:
-                df.to_csv(self.data_file, mode='w', header=True, index=False)
-        except Exception as e:
-            print(f"⚠️  CSV kayıt hatası: {e}")
+        Args:
+            df: REALTIME_COLUMNS sırasıyla kayıt DataFrame'i
+        """
+        for backend in self.backends:
+            try:
+                backend.write_batch(df)
+            except Exception as e:
+                print(f"⚠️  {backend.name} kayıt hatası: {e}")
+    
+    def close(self):
+        """Tamponlanmış kayıtları yazar"""
+        for backend in self.backends:
+            backend.close()
+
+
+class VirtualClock:
+    """
+    Sanal simülasyon saati.
+    
+    Her tick'te update_interval * real_time_scale saniye ilerler
+    (real_time_scale=3600 ise gerçek 1 saniye = simülasyonda 1 saat).
+    Replay modlarında okumalar datetime.now() yerine bu saatle zaman
+    damgalanır; böylece bir günlük veri gerçek bir gün beklemeden
+    üretilebilir. Canlı çalışma gerçek saati kullanır (scale=1).
+    """
+    
+    def __init__(self, start=None, scale=None, interval=None):
+        if scale is None:
+            scale = SIMULATION_CONFIG['real_time_scale']
+        if interval is None:
+            interval = SIMULATION_CONFIG['update_interval']
+        
+        self.start = start if start is not None else datetime.now()
+        self.step = timedelta(seconds=interval * scale)
+        self.ticks = 0
+    
+    def now(self):
+        """Geçerli sanal zaman"""
+        return self.start + self.step * self.ticks
+    
+    def advance(self):
+        """Saati bir tick ilerletir ve yeni sanal zamanı döner"""
+        self.ticks += 1
+        return self.now()
+
+
+def simulate_tick(fleet, detection_system, storage, timestamp, verbose=True):
+    """
+    Tek bir simülasyon adımı: üret -> analiz et -> izolasyon/bildirim -> kaydet.
+    
+    Args:
+        fleet: FleetSimulator objesi
+        detection_system: AnomalyDetectionSystem objesi
+        storage: DataStorage objesi (None ise kayıt yapılmaz)
+        timestamp: Tick zamanı (sanal saat)
+        verbose: Bildirim ve özetleri ekrana yaz
+    
+    Returns:
+        dict: Tick özeti (risk sayıları ve aşama süreleri)
+    """
+    t0 = time.perf_counter()
+    
+    # Tüm filo için veri üret ve tek seferde analiz et
+    values = fleet.generate_tick(timestamp)
+    t1 = time.perf_counter()
+    
+    analysis = detection_system.analyze_batch(values)
+    fleet.risk_scores[:] = analysis['risk_score']
+    t2 = time.perf_counter()
+    
+    # Otomatik izolasyon kontrolü
+    detection_system.check_auto_isolation_batch(fleet, analysis, timestamp, verbose)
+    
+    # Yüksek risk bildirimi (olay bazlı: sürekli yüksek riskli trafo tek bildirim üretir)
+    detection_system.process_alerts(fleet.transformer_ids, analysis['risk_score'], timestamp, verbose)
+    
+    # Veriyi kaydet
+    if storage is not None:
+        storage.save_batch(fleet.to_dataframe(values, analysis, timestamp))
+    t3 = time.perf_counter()
+    
+    risk_scores = fleet.risk_scores
+    return {
+        'high_risk': int(np.count_nonzero(risk_scores >= 70)),
+        'medium_risk': int(np.count_nonzero((risk_scores >= 40) & (risk_scores < 70))),
+        'isolated': int(np.count_nonzero(~fleet.isolation_status)),
+        'generate_seconds': t1 - t0,
+        'score_seconds': t2 - t1,
+        'store_seconds': t3 - t2
+    }
 
 
-def run_simulation(duration_minutes=10, demo_mode=True):
+def run_simulation(duration_minutes=10, demo_mode=True, storage_type='firebase'):
     """
     Simülasyonu çalıştırır.
     
     Args:
         duration_minutes: Simülasyon süresi (dakika)
         demo_mode: Demo modu (hızlı güncelleme)
+        storage_type: 'firebase' (firebase-key.json yoksa CSV) veya depolama.BACKENDS
     """
     print("=" * 60)
     print("🚀 Topraklama İzleme Simülasyonu Başlatılıyor")
     print("=" * 60)
     
     # Sistemleri başlat
-    transformers = [
-        TransformerSimulator(i+1) 
-        for i in range(NUM_TRANSFORMERS)
-    ]
+    fleet = FleetSimulator(NUM_TRANSFORMERS)
     
     detection_system = AnomalyDetectionSystem()
     # Firebase kullan (firebase-key.json varsa), yoksa CSV
-    storage = DataStorage(storage_type='firebase')
+    storage = DataStorage(storage_type=storage_type)
+    # Uzun çalışmada realtime_data.csv bölümlere döndürülür ve eski veri özetlenir
+    retention = RealtimeRetention(storage.data_file, lock=storage.lock)
+    retention.start()
     
     # Test için bazı trafolara arıza modu ekle
     if demo_mode:
         print("\n🔧 Demo modu: Bazı trafolara arıza senaryosu uygulanıyor...")
-        transformers[4].apply_failure_mode('gradual')  # Trafo 5
-        transformers[9].apply_failure_mode('sudden')   # Trafo 10
+        fleet.apply_failure_mode([5], 'gradual')   # Trafo 5
+        fleet.apply_failure_mode([10], 'sudden')   # Trafo 10
         print("   ✅ Trafo 5: Kademeli korozyon")
         print("   ✅ Trafo 10: Ani kaçak akım")
     
@@ -342,47 +839,21 @@ def run_simulation(duration_minutes=10, demo_mode=True):
     try:
         while True:
             iteration += 1
+            # Canlı çalışma gerçek saatle damgalanır (şimdiye göre pencereler,
+            # veri_saklama döndürme/özetleme süreleri); sanal saat sadece replay'de
             current_time = datetime.now()
             
-            print(f"\n🔄 İterasyon {iteration} - {current_time.strftime('%H:%M:%S')}")
+            print(f"\n🔄 İterasyon {iteration} - {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
             print("-" * 60)
             
-            # Her trafo için veri üret ve analiz et
-            for transformer in transformers:
-                # Sensör verisi üret
-                sensor_data = transformer.generate_sensor_data()
-                
-                # Anomali analizi
-                analysis = detection_system.analyze_sensor_data(sensor_data)
-                transformer.risk_score = analysis['risk_score']
-                
-                # Otomatik izolasyon kontrolü
-                detection_system.check_auto_isolation(transformer, analysis)
-                
-                # Yüksek risk bildirimi
-                if analysis['risk_score'] >= 70:
-                    message = f"⚠️ Trafo {transformer.transformer_id} ({transformer.location['name']}): Yüksek risk tespit edildi! (Risk: {analysis['risk_score']:.1f})"
-                    detection_system.add_alert(
-                        transformer.transformer_id,
-                        message,
-                        'high' if analysis['risk_score'] >= 80 else 'medium'
-                    )
-                    print(f"   {message}")
-                
-                # Veriyi kaydet
-                storage.save_data(sensor_data, analysis)
-            
-            # Özet istatistikler
-            risk_scores = [t.risk_score for t in transformers]
-            high_risk_count = sum(1 for r in risk_scores if r >= 70)
-            medium_risk_count = sum(1 for r in risk_scores if 40 <= r < 70)
-            isolated_count = sum(1 for t in transformers if not t.isolation_status)
+            summary = simulate_tick(fleet, detection_system, storage, current_time)
+            isolated_count = summary['isolated']
             
             print(f"\n📈 Özet:")
-            print(f"   • Yüksek Risk: {high_risk_count} trafo")
-            print(f"   • Orta Risk: {medium_risk_count} trafo")
+            print(f"   • Yüksek Risk: {summary['high_risk']} trafo")
+            print(f"   • Orta Risk: {summary['medium_risk']} trafo")
             print(f"   • İzole Edilmiş: {isolated_count} trafo")
-            print(f"   • Toplam Bildirim: {len(detection_system.alerts)}")
+            print(f"   • Toplam Bildirim: {detection_system.alerts.total}")
             
             # Süre kontrolü
             elapsed_minutes = (time.time() - start_time) / 60
@@ -395,18 +866,449 @@ def run_simulation(duration_minutes=10, demo_mode=True):
     
     except KeyboardInterrupt:
         print("\n\n⏹️  Simülasyon kullanıcı tarafından durduruldu")
+    finally:
+        retention.stop()
+        storage.close()
     
     # Final rapor
     print("\n" + "=" * 60)
     print("📊 Simülasyon Raporu")
     print("=" * 60)
     print(f"   • Toplam iterasyon: {iteration}")
-    print(f"   • Toplam bildirim: {len(detection_system.alerts)}")
+    print(f"   • Toplam bildirim: {detection_system.alerts.total}")
     print(f"   • İzole edilmiş trafo: {isolated_count}")
     print(f"   • Veri dosyası: {storage.data_file}")
     print("=" * 60)
 
 
+def run_replay(num_ticks=100, seed=42, demo_mode=True, start=None, num_transformers=None, store=True,
+               storage_type='csv'):
+    """
+    Deterministik replay modu: tohumlanmış filo ve sanal saatle tick'leri
+    beklemeden, pipeline'ın işleyebildiği hızda çalıştırır
+    (üret -> analiz et -> kaydet uçtan uca benchmark için).
+    
+    Args:
+        num_ticks: Çalıştırılacak tick sayısı
+        seed: Rastgele sayı üreteci tohumu (aynı tohum = aynı veri)
+        demo_mode: Demo arıza senaryolarını uygula
+        start: Sanal saat başlangıcı (varsayılan: DATA_GENERATION başlangıcı)
+        num_transformers: Filo büyüklüğü (varsayılan: NUM_TRANSFORMERS)
+        store: Kayıtları DataStorage'a yaz
+        storage_type: DataStorage türü (depolama.BACKENDS)
+    
+    Returns:
+        dict: Performans raporu (ticks/saniye, okuma/saniye, aşama süreleri)
+    """
+    if num_transformers is None:
+        num_transformers = NUM_TRANSFORMERS
+    if start is None:
+        start = datetime.fromisoformat(DATA_GENERATION['start_date'])
+    
+    print("=" * 60)
+    print("⏩ Replay Modu (deterministik, beklemesiz)")
+    print("=" * 60)
+    
+    fleet = FleetSimulator(num_transformers, seed=seed)
+    clock = VirtualClock(start=start)
+    detection_system = AnomalyDetectionSystem()
+    storage = DataStorage(storage_type=storage_type) if store else None
+    
+    if demo_mode:
+        fleet.apply_failure_mode([5], 'gradual')
+        fleet.apply_failure_mode([10], 'sudden')
+    
+    print(f"   • Trafo: {num_transformers}, tick: {num_ticks}, tohum: {seed}")
+    print(f"   • Sanal saat: {clock.now().isoformat()} başlangıç, tick başına {clock.step}")
+    
+    stage_totals = {'generate_seconds': 0.0, 'score_seconds': 0.0, 'store_seconds': 0.0}
+    summary = None
+    started = time.perf_counter()
+    
+    try:
+        for _ in range(num_ticks):
+            summary = simulate_tick(fleet, detection_system, storage, clock.now(), verbose=False)
+            for key in stage_totals:
+                stage_totals[key] += summary[key]
+            clock.advance()
+    except KeyboardInterrupt:
+        print("\n⏹️  Replay kullanıcı tarafından durduruldu")
+    
+    elapsed = time.perf_counter() - started
+    completed = clock.ticks
+    report = {
+        'ticks': completed,
+        'transformers': num_transformers,
+        'elapsed_seconds': round(elapsed, 4),
+        'ticks_per_second': round(completed / elapsed, 2) if elapsed > 0 else 0,
+        'readings_per_second': round(completed * num_transformers / elapsed, 1) if elapsed > 0 else 0,
+        'virtual_start': start.isoformat(),
+        'virtual_end': clock.now().isoformat(),
+        'alerts': detection_system.alerts.total,
+        'high_risk': summary['high_risk'] if summary else 0,
+        **{key: round(value, 4) for key, value in stage_totals.items()}
+    }
+    
+    print("\n" + "=" * 60)
+    print("📊 Replay Raporu")
+    print("=" * 60)
+    print(f"   • Tamamlanan tick: {report['ticks']} ({report['virtual_start']} → {report['virtual_end']})")
+    print(f"   • Süre: {report['elapsed_seconds']:.2f} sn")
+    print(f"   • Hız: {report['ticks_per_second']:.2f} tick/sn, {report['readings_per_second']:,.0f} okuma/sn")
+    print(f"   • Üretim / Analiz / Kayıt: {report['generate_seconds']:.2f} / {report['score_seconds']:.2f} / {report['store_seconds']:.2f} sn")
+    print(f"   • Toplam bildirim: {report['alerts']}")
+    print("=" * 60)
+    
+    return report
+
+
+def _shard_worker(shard_id, transformer_ids, num_ticks, seed, demo_mode, start,
+                  realtime, store, result_queue, storage_lock, stop_event, storage_type='csv'):
+    """
+    Shard işçi süreci: kendi trafo diliminin verisini üretir, analiz eder,
+    kaydeder ve tick özetini bildirimlerle birlikte koordinatöre gönderir.
+    """
+    try:
+        fleet = FleetSimulator(transformer_ids=transformer_ids, seed=seed + shard_id)
+        if demo_mode:
+            fleet.apply_failure_mode([5], 'gradual')
+            fleet.apply_failure_mode([10], 'sudden')
+        
+        detection_system = AnomalyDetectionSystem()
+        storage = DataStorage(storage_type=storage_type, lock=storage_lock) if store else None
+        # Gerçek zamanlı modda ölçek 1: tick'ler gerçek aralıkla damgalanır ve
+        # tüm shard'lar aynı tick için aynı zamanı yazar
+        clock = VirtualClock(start=start, scale=1 if realtime else None)
+        interval = SIMULATION_CONFIG['update_interval']
+        wall_start = time.monotonic()
+        
+        for tick in range(num_ticks):
+            if stop_event.is_set():
+                break
+            
+            tick_started = time.perf_counter()
+            summary = simulate_tick(fleet, detection_system, storage, clock.now(), verbose=False)
+            summary['wall_seconds'] = time.perf_counter() - tick_started
+            summary['transformers'] = len(fleet)
+            
+            # Yeni bildirimleri koordinatöre devret
+            alerts = detection_system.alerts.drain()
+            result_queue.put(('tick', shard_id, tick, summary, alerts))
+            
+            clock.advance()
+            if realtime and tick + 1 < num_ticks:
+                delay = wall_start + (tick + 1) * interval - time.monotonic()
+                if delay > 0 and stop_event.wait(delay):
+                    break
+        
+        result_queue.put(('done', shard_id, None, None, None))
+    except Exception:
+        result_queue.put(('error', shard_id, None, traceback.format_exc(), None))
+
+
+def run_sharded_simulation(num_workers=None, num_ticks=None, duration_minutes=10,
+                           seed=42, demo_mode=True, num_transformers=None, store=True, storage_type='csv'):
+    """
+    Filoyu N işçi sürece bölerek simülasyonu çalıştırır. Her işçi kendi
+    trafo dilimini üretir, analiz eder ve kaydeder; koordinatör kuyruktan
+    gelen tick özetlerini ve bildirimleri birleştirir.
+    
+    Args:
+        num_workers: İşçi süreç sayısı (varsayılan: CPU sayısı)
+        num_ticks: Tick sayısı verilirse beklemeden (replay) çalışır
+        duration_minutes: Gerçek zamanlı modda simülasyon süresi (dakika)
+        seed: Tohum (her shard seed + shard_id kullanır)
+        demo_mode: Demo arıza senaryolarını uygula
+        num_transformers: Filo büyüklüğü (varsayılan: NUM_TRANSFORMERS)
+        store: Kayıtları DataStorage'a yaz
+        storage_type: DataStorage türü (depolama.BACKENDS)
+    
+    Returns:
+        dict: Koordinatör raporu
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_transformers is None:
+        num_transformers = NUM_TRANSFORMERS
+    
+    realtime = num_ticks is None
+    if realtime:
+        num_ticks = int(duration_minutes * 60 / SIMULATION_CONFIG['update_interval']) + 1
+    
+    shards = [
+        ids for ids in np.array_split(np.arange(1, num_transformers + 1), num_workers)
+        if len(ids)
+    ]
+    
+    print("=" * 60)
+    print("🧩 Shard'lı Simülasyon")
+    print("=" * 60)
+    print(f"   • Trafo: {num_transformers}, işçi: {len(shards)}, tick: {num_ticks}")
+    print(f"   • Mod: {'gerçek zamanlı' if realtime else 'beklemesiz (replay)'}")
+    
+    ctx = mp.get_context()
+    result_queue = ctx.Queue()
+    storage_lock = ctx.Lock()
+    stop_event = ctx.Event()
+    start = datetime.now() if realtime else datetime.fromisoformat(DATA_GENERATION['start_date'])
+    
+    retention = None
+    if realtime and store:
+        retention = RealtimeRetention(lock=storage_lock)
+        retention.start()
+    
+    workers = [
+        ctx.Process(
+            target=_shard_worker,
+            args=(shard_id, ids.tolist(), num_ticks, seed, demo_mode, start,
+                  realtime, store, result_queue, storage_lock, stop_event, storage_type),
+            daemon=True
+        )
+        for shard_id, ids in enumerate(shards)
+    ]
+    for worker in workers:
+        worker.start()
+    
+    # Koordinatör: her tick için tüm shard'ların özetini bekle ve birleştir
+    pending = {}
+    alerts = AlertRingBuffer(ALERT_CAPACITY)
+    finished = set()
+    failed = set()
+    completed_ticks = 0
+    tick_walls = []
+    high_risk = medium_risk = isolated = 0
+    started = time.perf_counter()
+    
+    try:
+        while len(finished) < len(workers):
+            try:
+                kind, shard_id, tick, payload, shard_alerts = result_queue.get(timeout=1)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+            
+            if kind == 'done':
+                finished.add(shard_id)
+                continue
+            if kind == 'error':
+                print(f"❌ Shard {shard_id} hatası:\n{payload}")
+                finished.add(shard_id)
+                failed.add(shard_id)
+                continue
+            
+            alerts.extend(shard_alerts)
+            
+            parts = pending.setdefault(tick, {})
+            parts[shard_id] = payload
+            if len(parts) < len(workers) - len(failed):
+                continue
+            
+            del pending[tick]
+            completed_ticks += 1
+            high_risk = sum(p['high_risk'] for p in parts.values())
+            medium_risk = sum(p['medium_risk'] for p in parts.values())
+            isolated = sum(p['isolated'] for p in parts.values())
+            tick_wall = max(p['wall_seconds'] for p in parts.values())
+            tick_walls.append(tick_wall)
+            
+            if realtime:
+                print(f"\n🔄 Tick {tick + 1}: Yüksek {high_risk}, Orta {medium_risk}, "
+                      f"İzole {isolated}, Bildirim {len(alerts)} "
+                      f"(en yavaş shard {tick_wall * 1000:.1f} ms)")
+    
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Simülasyon kullanıcı tarafından durduruldu")
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=5)
+        if retention is not None:
+            retention.stop()
+    
+    elapsed = time.perf_counter() - started
+    walls_ms = np.array(tick_walls) * 1000 if tick_walls else np.zeros(1)
+    report = {
+        'workers': len(workers),
+        'transformers': num_transformers,
+        'ticks': completed_ticks,
+        'elapsed_seconds': round(elapsed, 4),
+        'ticks_per_second': round(completed_ticks / elapsed, 2) if elapsed > 0 else 0,
+        'tick_wall_p50_ms': round(float(np.percentile(walls_ms, 50)), 3),
+        'tick_wall_max_ms': round(float(walls_ms.max()), 3),
+        'high_risk': high_risk,
+        'medium_risk': medium_risk,
+        'isolated': isolated,
+        'alerts': alerts.total
+    }
+    
+    print("\n" + "=" * 60)
+    print("📊 Shard Raporu")
+    print("=" * 60)
+    print(f"   • İşçi: {report['workers']}, tamamlanan tick: {report['ticks']}")
+    print(f"   • Hız: {report['ticks_per_second']:.2f} tick/sn")
+    print(f"   • Tick süresi (en yavaş shard): p50 {report['tick_wall_p50_ms']:.1f} ms, max {report['tick_wall_max_ms']:.1f} ms")
+    print(f"   • Yüksek Risk: {high_risk}, Orta Risk: {medium_risk}, İzole: {isolated}")
+    print(f"   • Bildirim: {report['alerts']}")
+    print("=" * 60)
+    
+    return report
+
+
+def _iter_timestamp_groups(csv_path, chunksize):
+    """
+    CSV'yi parça parça okuyup zaman damgası gruplarını sırayla verir.
+    Bir parçanın son zaman damgası bir sonraki parçada devam edebileceği
+    için bekletilir; dosya hiçbir zaman tamamen belleğe alınmaz.
+    """
+    pending = None
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, encoding='utf-8-sig'):
+        chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        
+        last_ts = chunk['timestamp'].iloc[-1]
+        complete = chunk['timestamp'] != last_ts
+        pending = chunk[~complete]
+        
+        for ts, group in chunk[complete].groupby('timestamp', sort=True):
+            yield ts, group
+    
+    if pending is not None and len(pending):
+        for ts, group in pending.groupby('timestamp', sort=True):
+            yield ts, group
+
+
+def run_csv_replay(csv_path=None, speed=0, chunksize=50000, store=True, limit=None, storage_type='csv'):
+    """
+    Tarihsel sensor_data.csv kayıtlarını zaman sırasıyla canlı pipeline'dan
+    (AnomalyDetectionSystem + DataStorage) geçirir.
+    
+    Args:
+        csv_path: Kaynak CSV (varsayılan: DATA_GENERATION['output_file'])
+        speed: Hız çarpanı (3600 = 1 saatlik veri 1 saniyede; 0 = beklemeden)
+        chunksize: CSV okuma parça büyüklüğü (satır)
+        store: Kayıtları DataStorage'a yaz
+        limit: En fazla işlenecek zaman damgası sayısı
+        storage_type: DataStorage türü (depolama.BACKENDS)
+    
+    Returns:
+        dict: Verim, tespit gecikmesi ve 'anomali' etiketlerine göre doğruluk raporu
+    """
+    if csv_path is None:
+        csv_path = DATA_GENERATION['output_file']
+    if not os.path.exists(csv_path):
+        print(f"❌ Veri dosyası bulunamadı: {csv_path}")
+        print("💡 Önce 'python veri_uret.py' komutunu çalıştırın!")
+        return None
+    
+    print("=" * 60)
+    print("📼 CSV Replay Modu")
+    print("=" * 60)
+    print(f"   • Kaynak: {csv_path}")
+    print(f"   • Hız: {'beklemesiz' if not speed else f'x{speed}'}")
+    
+    detection_system = AnomalyDetectionSystem()
+    storage = DataStorage(storage_type=storage_type) if store else None
+    
+    latencies = []
+    confusion = {'tp': 0, 'fp': 0, 'fn': 0, 'tn': 0}
+    rows = 0
+    groups = 0
+    out_of_order = 0
+    first_ts = None
+    last_ts = None
+    started = time.perf_counter()
+    
+    try:
+        for ts, group in _iter_timestamp_groups(csv_path, chunksize):
+            if limit is not None and groups >= limit:
+                break
+            
+            if first_ts is None:
+                first_ts = ts
+            if last_ts is not None and ts < last_ts:
+                out_of_order += 1
+            last_ts = ts
+            
+            # Okumanın "geliş" zamanı: hız çarpanına göre planlanan an
+            due = started + ((ts - first_ts).total_seconds() / speed if speed else 0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            arrival = max(due, started) if speed else time.perf_counter()
+            
+            values = group[FEATURE_COLUMNS].to_numpy(dtype=float)
+            analysis = detection_system.analyze_batch(values)
+            
+            transformer_ids = group['transformer_id'].to_numpy()
+            detection_system.process_alerts(transformer_ids, analysis['risk_score'], ts.to_pydatetime())
+            
+            if storage is not None:
+                columns = {
+                    'timestamp': ts.isoformat(),
+                    'transformer_id': transformer_ids
+                }
+                for i, col in enumerate(FEATURE_COLUMNS):
+                    columns[col] = values[:, i]
+                # veri_uret farklı trafo sayısıyla üretildiyse aralık dışı ID'ler olabilir
+                columns.update(location_columns_for(transformer_ids))
+                for key in ('is_anomaly', 'anomaly_score', 'risk_score', 'risk_level', 'risk_color'):
+                    columns[key] = analysis[key]
+                storage.save_batch(pd.DataFrame(columns, columns=REALTIME_COLUMNS))
+            
+            latencies.append(time.perf_counter() - arrival)
+            
+            # Tespit doğruluğu (veri_uret'in 'anomali' etiketlerine göre)
+            if 'anomali' in group:
+                labels = group['anomali'].to_numpy().astype(bool)
+                predicted = analysis['is_anomaly']
+                confusion['tp'] += int(np.count_nonzero(predicted & labels))
+                confusion['fp'] += int(np.count_nonzero(predicted & ~labels))
+                confusion['fn'] += int(np.count_nonzero(~predicted & labels))
+                confusion['tn'] += int(np.count_nonzero(~predicted & ~labels))
+            
+            rows += len(group)
+            groups += 1
+            if groups % 100 == 0:
+                print(f"   {groups:,} zaman damgası, {rows:,} kayıt işlendi ({ts})", end='\r')
+    
+    except KeyboardInterrupt:
+        print("\n⏹️  Replay kullanıcı tarafından durduruldu")
+    
+    elapsed = time.perf_counter() - started
+    latency_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    precision = confusion['tp'] / max(confusion['tp'] + confusion['fp'], 1)
+    recall = confusion['tp'] / max(confusion['tp'] + confusion['fn'], 1)
+    
+    report = {
+        'rows': rows,
+        'timestamps': groups,
+        'elapsed_seconds': round(elapsed, 4),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else 0,
+        'latency_p50_ms': round(float(np.percentile(latency_ms, 50)), 3),
+        'latency_p99_ms': round(float(np.percentile(latency_ms, 99)), 3),
+        'precision': round(precision, 4),
+        'recall': round(recall, 4),
+        'confusion': confusion,
+        'alerts': detection_system.alerts.total,
+        'out_of_order_groups': out_of_order
+    }
+    
+    print("\n" + "=" * 60)
+    print("📊 CSV Replay Raporu")
+    print("=" * 60)
+    print(f"   • İşlenen: {rows:,} kayıt, {groups:,} zaman damgası ({first_ts} → {last_ts})")
+    print(f"   • Süre: {elapsed:.2f} sn ({report['rows_per_second']:,.0f} kayıt/sn)")
+    print(f"   • Tespit gecikmesi: p50 {report['latency_p50_ms']:.2f} ms, p99 {report['latency_p99_ms']:.2f} ms")
+    print(f"   • Kesinlik / Duyarlılık: {report['precision']:.4f} / {report['recall']:.4f}")
+    if out_of_order:
+        print(f"   ⚠️  {out_of_order} zaman damgası sıra dışı geldi (dosya zamana göre sıralı değil)")
+    print("=" * 60)
+    
+    return report
+
+
 if __name__ == "__main__":
     import argparse
     
@@ -415,14 +1317,63 @@ if __name__ == "__main__":
                        help='Simülasyon süresi (dakika)')
     parser.add_argument('--no-demo', action='store_true',
                        help='Demo modunu kapat (arıza senaryosu yok)')
+    parser.add_argument('--replay', type=int, metavar='TICKS',
+                       help='Deterministik replay modu: verilen sayıda tick beklemeden çalıştır')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Replay modu için rastgele sayı tohumu')
+    parser.add_argument('--transformers', type=int,
+                       help='Replay modu için filo büyüklüğü')
+    parser.add_argument('--no-store', action='store_true',
+                       help='Replay modunda kayıt yapma (sadece üret ve analiz et)')
+    parser.add_argument('--workers', type=int,
+                       help='Shard modu: filoyu verilen sayıda işçi sürece böl')
+    parser.add_argument('--csv-replay', nargs='?', metavar='CSV',
+                       const=DATA_GENERATION['output_file'],
+                       help='Tarihsel CSV kayıtlarını pipeline üzerinden oynat')
+    parser.add_argument('--speed', type=float, default=0,
+                       help='CSV replay hız çarpanı (0 = beklemeden)')
+    parser.add_argument('--chunksize', type=int, default=50000,
+                       help='CSV replay okuma parça büyüklüğü (satır)')
+    parser.add_argument('--storage', choices=['firebase'] + BACKENDS,
+                       help='Depolama türü (varsayılan: simülasyonda firebase, diğer modlarda csv)')
     
     args = parser.parse_args()
     
     try:
-        run_simulation(
-            duration_minutes=args.duration,
-            demo_mode=not args.no_demo
-        )
+        if args.csv_replay:
+            run_csv_replay(
+                csv_path=args.csv_replay,
+                speed=args.speed,
+                chunksize=args.chunksize,
+                store=not args.no_store,
+                storage_type=args.storage or 'csv'
+            )
+        elif args.workers:
+            run_sharded_simulation(
+                num_workers=args.workers,
+                num_ticks=args.replay,
+                duration_minutes=args.duration,
+                seed=args.seed,
+                demo_mode=not args.no_demo,
+                num_transformers=args.transformers,
+                store=not args.no_store,
+                storage_type=args.storage or 'csv'
+            )
+        elif args.replay:
+            run_replay(
+                num_ticks=args.replay,
+                seed=args.seed,
+                demo_mode=not args.no_demo,
+                num_transformers=args.transformers,
+                store=not args.no_store,
+                storage_type=args.storage or 'csv'
+            )
+        else:
+            run_simulation(
+                duration_minutes=args.duration,
+                demo_mode=not args.no_demo,
+                storage_type=args.storage or 'firebase'
+            )
     except Exception as e:
         print(f"\n❌ Hata oluştu: {str(e)}")
         import traceback
@@ -0,0 +1,266 @@
+"""
+Üretim Sunucusu
+Flask uygulamalarını geliştirme sunucusu (app.run(debug=True)) yerine çok
+işçili bir WSGI sunucusunda çalıştırır.
+    
+    python sunucu.py --app api --workers 4
+    python sunucu.py --app app --workers 4 --port 5000
+    python sunucu.py --app chat --workers 2 --port 5001
+
+- Uygulama modülü ana süreçte bir kez yüklenir (preload); model ve
+  tarihsel veri fork sonrası işçiler arasında copy-on-write paylaşılır.
+- app.py için filo tek bir puanlama sürecinde üretilir ve paylaşımlı
+  belleğe yazılır; tüm işçiler aynı görüntüyü ve bildirimleri görür.
+- İşçiler belirli sayıda istekten sonra (max_requests + jitter) sırayla
+  yeniden başlatılır; kapanışta açık istekler graceful_timeout kadar beklenir.
+
+Sunucu seçimi: gunicorn (Linux/macOS) → waitress (Windows, tek süreç,
+çok iş parçacığı) → Werkzeug (debug/reloader kapalı).
+"""
+
+import argparse
+import gc
+import importlib
+import multiprocessing as mp
+import os
+import signal
+import time
+
+# Uygulama adı -> (modül, varsayılan port)
+APPS = {
+    'api': ('api_server', 5000),
+    'app': ('app', 5000),
+    'chat': ('chat_llm', 5001),
+    'chat-basic': ('chat_backend', 5001)
+}
+
+DEFAULT_THREADS = 8             # İşçi başına iş parçacığı (SSE bağlantıları dahil)
+DEFAULT_MAX_REQUESTS = 1000     # Bu kadar istekten sonra işçi yenilenir
+DEFAULT_MAX_REQUESTS_JITTER = 100
+DEFAULT_TIMEOUT = 60
+DEFAULT_GRACEFUL_TIMEOUT = 30
+
+
+def default_workers():
+    """Önerilen işçi sayısı: 2 x çekirdek + 1 (en fazla 8)"""
+    return min(2 * (os.cpu_count() or 1) + 1, 8)
+
+
+def detect_server():
+    """Kurulu en uygun sunucu"""
+    try:
+        import gunicorn  # noqa: F401
+        if os.name != 'nt':
+            return 'gunicorn'
+    except ImportError:
+        pass
+    try:
+        import waitress  # noqa: F401
+        return 'waitress'
+    except ImportError:
+        return 'werkzeug'
+
+
+class SharedScoring:
+    """
+    app.py için paylaşımlı bellek + puanlama süreci (ana süreçte yönetilir).
+    
+    Puanlama süreci multiprocessing.Process yerine os.fork ile açılır:
+    işçiler de ana süreçten fork edildiği için Process nesnesini miras
+    alır ve çıkışta (atexit) sahibi olmadıkları süreci kapatmaya çalışırdı.
+    """
+    
+    def __init__(self, interval=None):
+        from paylasimli_durum import SeqlockBuffer, SharedFleetView
+        
+        # Tampon ve kuyruk fork ile işçilere ve puanlama sürecine miras kalır
+        ctx = mp.get_context('fork')
+        self.interval = interval
+        self.buffer = SeqlockBuffer()
+        self.command_queue = ctx.Queue()
+        self.stop_event = ctx.Event()
+        self.view = SharedFleetView(self.buffer, self.command_queue)
+        self.pid = None
+    
+    def start(self, timeout=60):
+        from paylasimli_durum import run_scoring_process
+        
+        self.pid = os.fork()
+        if self.pid == 0:
+            code = 0
+            try:
+                run_scoring_process(self.buffer, self.command_queue, self.stop_event, self.interval)
+            except BaseException as e:
+                print(f"❌ Puanlama süreci hatası: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        
+        if not self.view.wait_ready(timeout):
+            self.stop()
+            raise RuntimeError("Puanlama süreci ilk görüntüyü yayınlamadı")
+        return self.view
+    
+    def stop(self):
+        """Puanlama sürecini durdurur ve paylaşımlı belleği siler (birden çok çağrı güvenli)"""
+        if self.pid is None:
+            return
+        pid, self.pid = self.pid, None
+        self.stop_event.set()
+        try:
+            for _ in range(50):
+                done, _status = os.waitpid(pid, os.WNOHANG)
+                if done:
+                    break
+                time.sleep(0.1)
+            else:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass    # gunicorn ana süreci zaten toplamış
+        self.buffer.close()
+        self.buffer.unlink()
+
+
+def load_application(name, multiprocess, scoring_interval=None):
+    """
+    Uygulama modülünü yükler ve süreç genelindeki durumu hazırlar.
+    
+    Args:
+        name: APPS anahtarı
+        multiprocess: Çok süreçli sunucu (paylaşımlı durum gerekir)
+        scoring_interval: app.py puanlama aralığı (saniye)
+    
+    Returns:
+        tuple: (modül, SharedScoring veya None)
+    """
+    module = importlib.import_module(APPS[name][0])
+    shared = None
+    
+    # Isınma adımları (model, tarihsel veri) fork öncesi bir kez çalışır;
+    # işçiler yüklenmiş nesneleri copy-on-write paylaşır ve hazır başlar
+    warmup = getattr(module, 'warmup', None)
+    if multiprocess and warmup is not None:
+        warmup.run()
+    
+    if name == 'app':
+        if multiprocess:
+            shared = SharedScoring(scoring_interval)
+            module.initialize_system(shared_state=shared.start())
+        else:
+            module.initialize_system()
+    
+    return module, shared
+
+
+def start_worker_tasks(module):
+    """İşçi süreç başladığında çalışacak arka plan işleri (thread'ler fork'ta kopyalanmaz)"""
+    start = getattr(module, 'start_background_tasks', None)
+    if start is not None:
+        start()
+
+
+def run_gunicorn(module, shared, args):
+    """gunicorn ile çok işçili çalıştırma (preload + işçi yenileme)"""
+    from gunicorn.app.base import BaseApplication
+    
+    def post_fork(server, worker):
+        start_worker_tasks(module)
+    
+    def on_exit(server):
+        if shared is not None:
+            shared.stop()
+    
+    options = {
+        'bind': f'{args.host}:{args.port}',
+        'workers': args.workers,
+        'worker_class': 'gthread',
+        'threads': args.threads,
+        'preload_app': True,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests_jitter,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'post_fork': post_fork,
+        'on_exit': on_exit
+    }
+    
+    class StandaloneApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return module.app
+    
+    StandaloneApplication().run()
+
+
+def run_waitress(module, args):
+    """waitress ile tek süreç, çok iş parçacığı (Windows)"""
+    from waitress import serve
+    
+    start_worker_tasks(module)
+    serve(module.app, host=args.host, port=args.port, threads=args.threads * args.workers)
+
+
+def run_werkzeug(module, args):
+    """Yedek: Werkzeug çok iş parçacıklı sunucu (debug ve reloader kapalı)"""
+    start_worker_tasks(module)
+    module.app.run(host=args.host, port=args.port, threaded=True, debug=False, use_reloader=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Üretim sunucusu (çok işçili)')
+    parser.add_argument('--app', choices=sorted(APPS), default='api', help='Çalıştırılacak uygulama')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=None, help='Varsayılan: uygulamaya göre 5000/5001')
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'waitress', 'werkzeug'], default='auto')
+    parser.add_argument('--workers', type=int, default=default_workers(), help='İşçi süreç sayısı')
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS, help='İşçi başına iş parçacığı')
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS,
+                        help='İşçi yenileme için istek sayısı (0 = kapalı)')
+    parser.add_argument('--max-requests-jitter', type=int, default=DEFAULT_MAX_REQUESTS_JITTER)
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT)
+    parser.add_argument('--graceful-timeout', type=int, default=DEFAULT_GRACEFUL_TIMEOUT)
+    parser.add_argument('--scoring-interval', type=float, default=None,
+                        help='app.py puanlama aralığı (saniye, varsayılan config)')
+    args = parser.parse_args()
+    
+    if args.port is None:
+        args.port = APPS[args.app][1]
+    server = detect_server() if args.server == 'auto' else args.server
+    # gunicorn tek işçide de fork eder; ana süreçteki thread'ler işçiye geçmez
+    multiprocess = server == 'gunicorn'
+    
+    print("=" * 60)
+    print(f"🚀 Üretim sunucusu: {args.app} ({APPS[args.app][0]}.py)")
+    print("=" * 60)
+    print(f"   • Sunucu: {server}")
+    if server == 'gunicorn':
+        print(f"   • İşçi: {args.workers} x {args.threads} iş parçacığı")
+        print(f"   • İşçi yenileme: {args.max_requests} istek (+{args.max_requests_jitter})")
+    print(f"   • Adres: http://{args.host}:{args.port}")
+    print("=" * 60)
+    
+    module, shared = load_application(args.app, multiprocess, args.scoring_interval)
+    
+    # Yüklenen nesneleri GC takibinden çıkar: fork sonrası GC taraması
+    # sayfaları kirletip copy-on-write paylaşımını bozmasın
+    gc.collect()
+    gc.freeze()
+    
+    try:
+        if server == 'gunicorn':
+            run_gunicorn(module, shared, args)
+        elif server == 'waitress':
+            run_waitress(module, args)
+        else:
+            run_werkzeug(module, args)
+    finally:
+        if shared is not None:
+            shared.stop()
+
+
+if __name__ == "__main__":
+    main()
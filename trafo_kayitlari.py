@@ -0,0 +1,220 @@
+"""
+Trafo Kayıtları
+Trafo konumlarını (enlem, boylam, bölge) tohumlu olarak bir kez üretir ve
+data/ altına kaydeder. Tüm süreçler (api_server, simulasyon, chat_llm)
+aynı dosyayı okuduğu için aynı trafo ID'si her yerde aynı konumdadır.
+
+Kayıtlar ilk erişimde yüklenir (config import edilirken değil). Kolonlar
+NumPy dizileri olarak tutulur; ID ile erişim O(1)'dir (indeks = ID - 1).
+
+Her kolon kendi tohumlu üreteciyle üretilir; filo büyütüldüğünde mevcut
+trafoların konumları değişmez (ilk N kayıt aynı kalır).
+
+    python trafo_kayitlari.py --size 100000     # Kayıt dosyasını önceden üret
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+# Kolon -> üreteç akışı (tohum ile birlikte kullanılır, sıra değiştirilmemeli)
+_STREAMS = {'latitude': 1, 'longitude': 2, 'region': 3}
+
+
+def generate_locations(size, bounds, regions, seed):
+    """
+    Tohumlu trafo konum kolonları üretir.
+    
+    Args:
+        size: Trafo sayısı
+        bounds: lat_min/lat_max/lon_min/lon_max sözlüğü
+        regions: Bölge adları
+        seed: Rastgele tohum
+    
+    Returns:
+        dict: latitude, longitude (float64) ve region_code (int16) dizileri
+    """
+    def rng(column):
+        return np.random.default_rng([seed, _STREAMS[column]])
+    
+    return {
+        'latitude': np.round(rng('latitude').uniform(bounds['lat_min'], bounds['lat_max'], size), 6),
+        'longitude': np.round(rng('longitude').uniform(bounds['lon_min'], bounds['lon_max'], size), 6),
+        'region_code': rng('region').integers(0, len(regions), size).astype(np.int16)
+    }
+
+
+class TransformerRegistry:
+    """
+    Kalıcı, tembel yüklenen trafo kayıtları.
+    
+    Liste gibi kullanılabilir (TRANSFORMER_LOCATIONS[tid - 1], len,
+    iterasyon); her eleman {'id', 'latitude', 'longitude', 'name', 'region'}
+    sözlüğüdür. Sözlükler ilk istendiğinde oluşturulup saklanır.
+    """
+    
+    def __init__(self, size, path, bounds, regions, seed=42):
+        self.size = size
+        self.path = path
+        self.bounds = dict(bounds)
+        self.regions = list(regions)
+        self.seed = seed
+        
+        self._columns = None
+        self._records = None
+        self._column_cache = None
+        self._lock = threading.Lock()
+    
+    # --- Yükleme ---
+    
+    def _ensure_loaded(self):
+        if self._columns is None:
+            with self._lock:
+                if self._columns is None:
+                    self._load_locked()
+        return self._columns
+    
+    def _load_locked(self):
+        columns = self._read_file()
+        if columns is None:
+            started = time.perf_counter()
+            columns = generate_locations(self.size, self.bounds, self.regions, self.seed)
+            self._write_file(columns)
+            if self.size >= 10000:
+                print(f"[OK] {self.size:,} trafo kaydi uretildi ({time.perf_counter() - started:.2f} sn): {self.path}")
+        
+        # Daha büyük bir filo için üretilmiş dosyanın ilk N kaydı aynıdır
+        columns = {key: values[:self.size] for key, values in columns.items()}
+        self._records = [None] * self.size
+        self._columns = columns
+    
+    def _read_file(self):
+        """Kayıt dosyası bu tohum/bölgeler için ve yeterli boyutta ise kolonlarını döner"""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if (int(data['seed']) != self.seed
+                        or data['regions'].tolist() != self.regions
+                        or data['bounds'].tolist() != self._bounds_list()
+                        or len(data['latitude']) < self.size):
+                    return None
+                return {
+                    'latitude': data['latitude'],
+                    'longitude': data['longitude'],
+                    'region_code': data['region_code']
+                }
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Trafo kayıt dosyası okunamadı, yeniden üretilecek: {e}")
+            return None
+    
+    def _write_file(self, columns):
+        """Kolonları atomik olarak yazar (eşzamanlı süreçler yarım dosya görmez)"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        temp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.savez(
+                temp_path,
+                seed=np.int64(self.seed),
+                regions=np.array(self.regions),
+                bounds=np.array(self._bounds_list()),
+                **columns
+            )
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Trafo kayıt dosyası yazılamadı (bellekte kullanılacak): {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def _bounds_list(self):
+        return [self.bounds[key] for key in ('lat_min', 'lat_max', 'lon_min', 'lon_max')]
+    
+    # --- Erişim ---
+    
+    def columns(self):
+        """
+        Kolon dizileri (indeks = ID - 1).
+        
+        Returns:
+            dict: id, latitude, longitude, name, region dizileri
+        """
+        if self._column_cache is None:
+            columns = self._ensure_loaded()
+            ids = np.arange(1, self.size + 1)
+            self._column_cache = {
+                'id': ids,
+                'latitude': columns['latitude'],
+                'longitude': columns['longitude'],
+                'name': np.array([f'Trafo {transformer_id}' for transformer_id in ids.tolist()], dtype=object),
+                'region': np.array(self.regions, dtype=object)[columns['region_code']]
+            }
+        return self._column_cache
+    
+    def get(self, transformer_id, default=None):
+        """ID ile kayıt (bulunamazsa default)"""
+        if 1 <= transformer_id <= self.size:
+            return self[transformer_id - 1]
+        return default
+    
+    def _record(self, index):
+        record = self._records[index]
+        if record is None:
+            columns = self._columns
+            record = {
+                'id': index + 1,
+                'latitude': float(columns['latitude'][index]),
+                'longitude': float(columns['longitude'][index]),
+                'name': f'Trafo {index + 1}',
+                'region': self.regions[columns['region_code'][index]]
+            }
+            self._records[index] = record
+        return record
+    
+    def __len__(self):
+        return self.size
+    
+    def __getitem__(self, index):
+        self._ensure_loaded()
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("Trafo indeksi aralık dışında")
+        return self._record(index)
+    
+    def __iter__(self):
+        self._ensure_loaded()
+        return (self._record(i) for i in range(self.size))
+    
+    def __repr__(self):
+        state = 'yüklü' if self._columns is not None else 'yüklenmedi'
+        return f"TransformerRegistry(size={self.size}, seed={self.seed}, {state})"
+
+
+def main():
+    from config import TRANSFORMER_LOCATIONS, TRANSFORMER_REGISTRY
+    
+    parser = argparse.ArgumentParser(description='Trafo kayıt dosyasını üretir')
+    parser.add_argument('--size', type=int, default=len(TRANSFORMER_LOCATIONS), help='Trafo sayısı')
+    parser.add_argument('--seed', type=int, default=TRANSFORMER_REGISTRY['seed'])
+    parser.add_argument('--path', default=TRANSFORMER_REGISTRY['path'])
+    args = parser.parse_args()
+    
+    registry = TransformerRegistry(
+        args.size, args.path, TRANSFORMER_LOCATIONS.bounds, TRANSFORMER_LOCATIONS.regions, args.seed
+    )
+    started = time.perf_counter()
+    registry.columns()
+    print(f"✅ {len(registry):,} trafo kaydı hazır ({time.perf_counter() - started:.2f} sn): {args.path}")
+
+
+if __name__ == "__main__":
+    main()
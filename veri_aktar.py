@@ -0,0 +1,158 @@
+"""
+Veri Aktarma
+Mevcut CSV dosyalarını (veri_uret çıktısı sensor_data.csv ve simülasyon
+çıktısı realtime_data.csv) memmap kolon deposuna (kolon_deposu.py)
+dönüştürür. Dönüştürme parça parça yapılır; dosyalar hiçbir zaman tamamen
+belleğe alınmaz, satır sayıları doğrulanır ve verim raporlanır.
+
+    python veri_aktar.py                                    # iki dosya da (varsa)
+    python veri_aktar.py --source data/realtime_data.csv --output data/realtime_data.cols
+    python veri_aktar.py --chunksize 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from config import DATA_GENERATION
+from kolon_deposu import (
+    COLUMN_DTYPES, DEFAULT_CHUNK_ROWS, REALTIME_DTYPES, SensorColumns, build_from_csv
+)
+from veri_saklama import REALTIME_FILE
+
+SCHEMAS = {'sensor': COLUMN_DTYPES, 'realtime': REALTIME_DTYPES}
+
+
+def default_output(source):
+    """Kaynağın varsayılan kolon deposu dizini"""
+    if os.path.abspath(source) == os.path.abspath(DATA_GENERATION['output_file']):
+        return DATA_GENERATION['columnar_dir']
+    return os.path.splitext(source)[0] + '.cols'
+
+
+def read_header(source):
+    """CSV başlığındaki kolon adları"""
+    with open(source, encoding='utf-8-sig') as f:
+        return f.readline().strip().split(',')
+
+
+def detect_kind(header):
+    """Başlıktan veri türü: canlı kayıtlarda analiz kolonları vardır"""
+    return 'realtime' if 'risk_level' in header else 'sensor'
+
+
+def directory_size(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def convert(source, output, kind=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """
+    Tek bir CSV'yi dönüştürür ve sonucu doğrular.
+    
+    Args:
+        source: Kaynak CSV
+        output: Hedef kolon deposu dizini
+        kind: 'sensor' / 'realtime' (None = başlıktan)
+        chunksize: Parça büyüklüğü (satır)
+    
+    Returns:
+        dict: Satır sayısı, süreler ve verim raporu
+    """
+    header = read_header(source)
+    kind = kind or detect_kind(header)
+    schema = SCHEMAS[kind]
+    
+    missing = [column for column in schema if column not in header]
+    if missing:
+        raise ValueError(f"Eksik kolonlar: {', '.join(missing)}")
+    skipped = [column for column in header if column not in schema]
+    if skipped:
+        print(f"⚠️  Şemada olmayan kolonlar atlanıyor: {', '.join(skipped)}")
+    
+    print(f"📂 {source} -> {output} ({kind}, {os.path.getsize(source) / 1e6:,.1f} MB)")
+    
+    last_shown = [0.0]
+    
+    def progress(rows, ratio):
+        if ratio - last_shown[0] >= 0.1 or ratio >= 1.0:
+            last_shown[0] = ratio
+            print(f"   %{ratio * 100:5.1f}  {rows:,} satır")
+    
+    started = time.perf_counter()
+    meta = build_from_csv(source, output, schema=schema, chunksize=chunksize, progress=progress)
+    elapsed = time.perf_counter() - started
+    
+    # Yazılan depo baştan açılıp doğrulanır
+    columns = SensorColumns(output)
+    if len(columns) != meta['rows'] or int(columns.offsets[-1]) != meta['rows']:
+        raise ValueError(f"Depo doğrulanamadı: {len(columns):,} satır, {meta['rows']:,} bekleniyordu")
+    
+    source_mb = meta['source']['size'] / 1e6
+    output_mb = directory_size(output) / 1e6
+    return {
+        'source': source,
+        'output': output,
+        'kind': kind,
+        'rows': meta['rows'],
+        'transformers': meta['transformers'],
+        'categories': {column: len(labels) for column, labels in meta['categories'].items()},
+        'seconds': round(elapsed, 3),
+        'passes': meta['build']['seconds'],
+        'resorted_transformers': meta['build']['resorted'],
+        'rows_per_second': meta['rows'] / elapsed if elapsed else 0.0,
+        'mb_per_second': source_mb / elapsed if elapsed else 0.0,
+        'source_mb': source_mb,
+        'output_mb': output_mb
+    }
+
+
+def print_report(report):
+    print(f"✅ {report['rows']:,} satır, {report['transformers']:,} trafo ({report['seconds']:.2f} sn)")
+    print(f"   • Verim: {report['rows_per_second']:,.0f} satır/sn, {report['mb_per_second']:,.1f} MB/sn")
+    passes = ', '.join(f"{name} {seconds:.2f} sn" for name, seconds in report['passes'].items())
+    print(f"   • Geçişler: {passes}")
+    print(f"   • Boyut: {report['source_mb']:,.1f} MB CSV -> {report['output_mb']:,.1f} MB kolon")
+    if report['categories']:
+        labels = ', '.join(f"{column} ({count})" for column, count in report['categories'].items())
+        print(f"   • Kategorik kolonlar: {labels}")
+    if report['resorted_transformers']:
+        print(f"   • Zaman sırası düzeltilen trafo: {report['resorted_transformers']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV verisini memmap kolon deposuna aktarır')
+    parser.add_argument('--source', action='append',
+                        help='Kaynak CSV (tekrarlanabilir, varsayılan: sensor_data.csv ve realtime_data.csv)')
+    parser.add_argument('--output', action='append', help='Hedef dizin (--source sırasıyla)')
+    parser.add_argument('--kind', choices=SCHEMAS, help='Veri türü (varsayılan: başlıktan)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_ROWS, help='Parça büyüklüğü (satır)')
+    args = parser.parse_args()
+    
+    sources = args.source or [
+        path for path in (DATA_GENERATION['output_file'], REALTIME_FILE) if os.path.exists(path)
+    ]
+    outputs = args.output or []
+    if len(outputs) > len(sources):
+        parser.error('--output sayısı --source sayısından fazla')
+    if not sources:
+        print("❌ Aktarılacak CSV bulunamadı")
+        print("💡 Önce 'python veri_uret.py' komutunu çalıştırın!")
+        sys.exit(1)
+    
+    failed = False
+    for position, source in enumerate(sources):
+        output = outputs[position] if position < len(outputs) else default_output(source)
+        try:
+            print_report(convert(source, output, args.kind, args.chunksize))
+        except (OSError, ValueError) as e:
+            print(f"❌ {source} aktarılamadı: {e}")
+            failed = True
+        print()
+    
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
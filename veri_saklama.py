@@ -0,0 +1,492 @@
+"""
+Canlı Veri Saklama
+data/realtime_data.csv'nin sınırsız büyümesini önler. Yazıcılar (DataStorage)
+sadece aktif dosyaya ekleme yapmaya devam eder; arka plan görevi:
+
+1. Aktif dosyanın verisi bir zaman dilimini (segment_hours, veri zamanı)
+   aşınca ya da dosya max_segment_mb'ı geçince dosyayı ham bölüme döndürür
+   (os.replace - yazıcılar sadece yeniden adlandırma süresince beklenir).
+2. raw_days'ten eski ham bölümleri trafo başına rollup_minutes'lık
+   özetlere (ortalama/maks risk, anomali ve okuma sayısı) sıkıştırır.
+3. rollup_days'ten eski özetleri siler.
+
+Dizin yapısı (REALTIME_RETENTION['directory']):
+    data/realtime_data.csv                      Aktif dosya
+    data/realtime/raw/realtime_<başlangıç>.csv  Döndürülmüş ham bölümler
+    data/realtime/rollup/rollup_<başlangıç>.csv Özetler
+    data/realtime/manifest.json                 Aktif dosyanın epoch/taban konumu
+
+Dosyayı takip eden okuyucular (canli_akis, chat_llm) CsvTail kullanır:
+döndürülen dosyanın kalanını bölümden okur ve yeni aktif dosyaya durumu
+sıfırlamadan geçer. Silinen dosya (veri_temizle) ise yeni başlangıçtır.
+
+    python veri_saklama.py              # Tek sefer döndür/sıkıştır/sil
+    python veri_saklama.py --status     # Bölüm ve özet listesi
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import zlib
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+
+from config import REALTIME_RETENTION
+
+REALTIME_FILE = 'data/realtime_data.csv'
+
+SENSOR_FIELDS = [
+    'toprak_direnci',
+    'kacak_akim',
+    'toprak_potansiyel',
+    'toprak_nemi',
+    'toprak_sicakligi',
+    'korozyon_seviyesi'
+]
+
+SEGMENT_TIME_FORMAT = '%Y%m%dT%H%M%S'
+
+# Son satırı bulmak için dosya sonundan okunan bayt
+TAIL_PROBE_BYTES = 64 * 1024
+
+
+def _raw_dir(directory):
+    return os.path.join(directory, 'raw')
+
+
+def _rollup_dir(directory):
+    return os.path.join(directory, 'rollup')
+
+
+def _manifest_path(directory):
+    return os.path.join(directory, 'manifest.json')
+
+
+def segment_paths(kind='raw', directory=REALTIME_RETENTION['directory']):
+    """
+    Bölüm dosyaları (eskiden yeniye; ad = başlangıç zamanı).
+    
+    Args:
+        kind: 'raw' veya 'rollup'
+    """
+    folder = _raw_dir(directory) if kind == 'raw' else _rollup_dir(directory)
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder)) if name.endswith('.csv')]
+
+
+def find_rotated_segment(inode, directory=REALTIME_RETENTION['directory']):
+    """Döndürülmüş aktif dosyayı inode ile bulur (os.replace inode'u korur)"""
+    for path in reversed(segment_paths('raw', directory)):
+        try:
+            if os.stat(path).st_ino == inode:
+                return path
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def read_manifest(directory=REALTIME_RETENTION['directory']):
+    try:
+        with open(_manifest_path(directory), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(directory, manifest):
+    path = _manifest_path(directory)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, path)
+
+
+def _first_lines(path, count):
+    """Dosyanın ilk count satırı (ham bayt; eksikse None)"""
+    with open(path, 'rb') as f:
+        lines = [f.readline() for _ in range(count)]
+    if not all(line.endswith(b'\n') for line in lines):
+        return None
+    return lines
+
+
+def _last_line(path):
+    """Dosyanın son tam satırı (ham bayt; yoksa None)"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(size - TAIL_PROBE_BYTES, 0))
+        block = f.read()
+    end = block.rfind(b'\n')
+    if end <= 0:
+        return None
+    start = block.rfind(b'\n', 0, end) + 1
+    return block[start:end + 1]
+
+
+def _row_timestamp(line):
+    """CSV satırının ilk kolonundaki zaman damgası"""
+    return datetime.fromisoformat(line.split(b',', 1)[0].decode('utf-8-sig').strip())
+
+
+def file_epoch(first_lines):
+    """Başlık + ilk veri satırının özeti (canli_akis ETag epoch'u ile aynı)"""
+    return format(zlib.crc32(b''.join(first_lines)), 'x')
+
+
+class CsvTail:
+    """
+    Ekleme yapılan CSV dosyasını kaldığı yerden okur.
+    
+    read() olay üretir:
+        ('start', {'epoch', 'restart'}) - yeni bir dosya başladı (ilk okuma
+            veya silinip yeniden oluşturma); restart=True ise okuyucu
+            bellekteki durumu sıfırlamalıdır
+        ('rows', (csv_bytes, position)) - başlıklı CSV bloğu ve okunan
+            toplam bayt konumu (döndürmeler arasında artmaya devam eder)
+    """
+    
+    def __init__(self, path, read_block_size=8 * 1024 * 1024, directory=REALTIME_RETENTION['directory']):
+        self.path = path
+        self.read_block_size = read_block_size
+        self.directory = directory
+        self.offset = 0         # Geçerli dosyadaki konum
+        self.base = 0           # Önceki (döndürülmüş) dosyalardan okunan bayt
+        self.header = None
+        self.inode = None
+        self._need_header = True
+        self._had_data = False
+    
+    @property
+    def position(self):
+        return self.base + self.offset
+    
+    def _forget(self):
+        """Dosya silinmiş veya kesilmiş: sonraki dosya yeni başlangıçtır"""
+        self.offset = 0
+        self.base = 0
+        self.header = None
+        self.inode = None
+        self._need_header = True
+    
+    def read(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+        
+        if self.inode is not None and (stat is None or stat.st_ino != self.inode):
+            rotated = find_rotated_segment(self.inode, self.directory)
+            if rotated is None:
+                self._forget()
+            else:
+                # Döndürülmüş dosyanın kalanını bölümden oku, yeni dosyaya geç
+                yield from self._read_file(rotated, self.inode)
+                self.base += self.offset
+                self.offset = 0
+                self.inode = None
+                self._need_header = True
+        
+        if stat is None:
+            return
+        if stat.st_size < self.offset:
+            self._forget()
+        if self.inode is None:
+            self.inode = stat.st_ino
+        yield from self._read_file(self.path, self.inode)
+    
+    def _read_file(self, path, inode):
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != inode:
+                return      # stat ile açma arasında döndürülmüş; sonraki okumada bölümden okunur
+            size = stat.st_size
+            while self.offset < size:
+                f.seek(self.offset)
+                block = f.read(self.read_block_size)
+                
+                # Yarım yazılmış son satırı bir sonraki okumaya bırak
+                end = block.rfind(b'\n')
+                if end < 0:
+                    return
+                block = block[:end + 1]
+                
+                if self._need_header:
+                    header_end = block.find(b'\n') + 1
+                    if self.header is None:
+                        if header_end == len(block):
+                            return      # Sadece başlık yazılmış - epoch için ilk veri satırını bekle
+                        first_row_end = block.find(b'\n', header_end) + 1
+                        self.header = block[:header_end].decode('utf-8-sig').encode('utf-8')
+                        yield 'start', self._origin(block[:first_row_end])
+                    self._need_header = False
+                    self.offset += header_end
+                    block = block[header_end:]
+                
+                self.offset += len(block)
+                if block:
+                    self._had_data = True
+                    yield 'rows', (self.header + block, self.position)
+    
+    def _origin(self, first_lines):
+        """Yeni dosyanın epoch'u; döndürme sonrası oluşturulmuşsa manifest'ten devam"""
+        restart = self._had_data
+        self._had_data = False
+        manifest = read_manifest(self.directory)
+        if manifest is not None and manifest.get('inode') == self.inode:
+            self.base = manifest['base']
+            return {'epoch': manifest['epoch'], 'restart': restart}
+        return {'epoch': file_epoch([first_lines]), 'restart': restart}
+
+
+def read_transformer_rows(transformer_id, limit, data_file=REALTIME_FILE,
+                          directory=REALTIME_RETENTION['directory']):
+    """
+    Trafonun son ham kayıtları (aktif dosya + gerekirse önceki ham bölümler).
+    
+    Returns:
+        DataFrame: En fazla limit satır, zaman sıralı
+    """
+    import pandas as pd
+    
+    frames, remaining = [], limit
+    for path in [data_file] + list(reversed(segment_paths('raw', directory))):
+        try:
+            df = pd.read_csv(path)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            continue
+        if 'transformer_id' not in df.columns:
+            continue
+        df = df[df['transformer_id'] == transformer_id].tail(remaining)
+        frames.append(df)
+        remaining -= len(df)
+        if remaining <= 0:
+            break
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames[::-1], ignore_index=True)
+
+
+class RealtimeRetention:
+    """
+    Döndürme, sıkıştırma ve silme görevi.
+    
+    Sadece döndürme yazıcı kilidini (DataStorage.lock) kısa süreli alır;
+    sıkıştırma ve silme kapanmış bölüm dosyalarında kilitsiz çalışır.
+    """
+    
+    def __init__(self, data_file=REALTIME_FILE, policy=None, lock=None):
+        self.data_file = data_file
+        self.policy = dict(REALTIME_RETENTION if policy is None else policy)
+        self.directory = self.policy['directory']
+        self.lock = lock
+        self._thread = None
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+    
+    # --- Arka plan ---
+    
+    def start(self):
+        """Periyodik saklama görevini başlatır (birden çok çağrı güvenli)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='realtime-retention', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.policy['check_interval']):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ Veri saklama görevi hatası: {e}")
+    
+    def run_once(self):
+        """
+        Döndürme, sıkıştırma ve silme adımlarını bir kez çalıştırır.
+        
+        Returns:
+            dict: rotated (bölüm yolu veya None), compacted, expired
+        """
+        with self._run_lock:
+            rotated = self.rotate()
+            latest = self._latest_timestamp()
+            if latest is None:
+                return {'rotated': rotated, 'compacted': 0, 'expired': 0}
+            return {
+                'rotated': rotated,
+                'compacted': self.compact(latest),
+                'expired': self.expire(latest)
+            }
+    
+    # --- Adımlar ---
+    
+    def rotate(self, force=False):
+        """
+        Aktif dosyayı zaman dilimi ya da boyut sınırı aşıldıysa ham bölüme döndürür.
+        
+        Returns:
+            str veya None: Oluşturulan bölüm yolu
+        """
+        if not os.path.exists(self.data_file):
+            return None
+        first_lines = _first_lines(self.data_file, 2)
+        last_line = _last_line(self.data_file)
+        if first_lines is None or last_line is None:
+            return None
+        
+        first_ts, last_ts = _row_timestamp(first_lines[1]), _row_timestamp(last_line)
+        segment = timedelta(hours=self.policy['segment_hours'])
+        too_large = os.path.getsize(self.data_file) >= self.policy['max_segment_mb'] * 1024 * 1024
+        if not (force or too_large or self._partition(first_ts, segment) != self._partition(last_ts, segment)):
+            return None
+        
+        os.makedirs(_raw_dir(self.directory), exist_ok=True)
+        path = os.path.join(_raw_dir(self.directory), f"realtime_{first_ts.strftime(SEGMENT_TIME_FORMAT)}.csv")
+        if os.path.exists(path):
+            path = path[:-len('.csv')] + f"_{int(time.time() * 1000)}.csv"
+        
+        with self.lock if self.lock is not None else nullcontext():
+            old_inode = os.stat(self.data_file).st_ino
+            manifest = read_manifest(self.directory)
+            if manifest is not None and manifest.get('inode') == old_inode:
+                epoch, base = manifest['epoch'], manifest['base']
+            else:
+                epoch, base = file_epoch(first_lines), 0
+            
+            os.replace(self.data_file, path)
+            # Yeni aktif dosya başlıkla hemen oluşturulur (yazıcı önce oluşturduysa dokunulmaz)
+            try:
+                with open(self.data_file, 'xb') as f:
+                    f.write(first_lines[0])
+            except FileExistsError:
+                pass
+            _write_manifest(self.directory, {
+                'epoch': epoch,
+                'base': base + os.path.getsize(path),
+                'inode': os.stat(self.data_file).st_ino,
+                'segment': os.path.basename(path),
+                'rotated_at': datetime.now().isoformat()
+            })
+        return path
+    
+    def compact(self, latest):
+        """
+        raw_days'ten eski ham bölümleri özetlere dönüştürür.
+        
+        Returns:
+            int: Sıkıştırılan bölüm sayısı
+        """
+        cutoff = latest - timedelta(days=self.policy['raw_days'])
+        compacted = 0
+        for path in segment_paths('raw', self.directory):
+            last_line = _last_line(path)
+            if last_line is None or _row_timestamp(last_line) >= cutoff:
+                break       # Bölümler zaman sıralı; sonrakiler de yeni
+            self._write_rollup(path)
+            os.remove(path)
+            compacted += 1
+        return compacted
+    
+    def _write_rollup(self, path):
+        """Ham bölümü trafo + zaman kovası bazında özetler (atomik yazma)"""
+        import pandas as pd
+        
+        df = pd.read_csv(path)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df['is_anomaly'] = df['is_anomaly'].astype(str) == 'True'
+        df['timestamp'] = df['timestamp'].dt.floor(pd.Timedelta(minutes=self.policy['rollup_minutes']))
+        
+        grouped = df.groupby(['timestamp', 'transformer_id'], sort=True)
+        rollup = grouped[SENSOR_FIELDS + ['risk_score']].mean().round(4)
+        rollup['risk_score_max'] = grouped['risk_score'].max()
+        rollup['anomaly_count'] = grouped['is_anomaly'].sum()
+        rollup['readings'] = grouped.size()
+        
+        os.makedirs(_rollup_dir(self.directory), exist_ok=True)
+        name = os.path.basename(path).replace('realtime_', 'rollup_', 1)
+        target = os.path.join(_rollup_dir(self.directory), name)
+        temp_path = f"{target}.{os.getpid()}.tmp"
+        rollup.reset_index().to_csv(temp_path, index=False)
+        os.replace(temp_path, target)
+    
+    def expire(self, latest):
+        """
+        rollup_days'ten eski özetleri siler.
+        
+        Returns:
+            int: Silinen özet sayısı
+        """
+        cutoff = latest - timedelta(days=self.policy['rollup_days'])
+        expired = 0
+        for path in segment_paths('rollup', self.directory):
+            last_line = _last_line(path)
+            if last_line is not None and _row_timestamp(last_line) >= cutoff:
+                break
+            os.remove(path)
+            expired += 1
+        return expired
+    
+    def _latest_timestamp(self):
+        """En yeni veri zamanı (aktif dosya, yoksa en yeni ham bölüm)"""
+        for path in [self.data_file] + list(reversed(segment_paths('raw', self.directory))):
+            if not os.path.exists(path):
+                continue
+            last_line = _last_line(path)
+            if last_line is not None and not last_line.startswith(b'timestamp'):
+                return _row_timestamp(last_line)
+        return None
+    
+    @staticmethod
+    def _partition(timestamp, segment):
+        """Zaman damgasının ait olduğu dilim (gün başından itibaren segment adımları)"""
+        day = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return day, (timestamp - day) // segment
+    
+    # --- Durum ---
+    
+    def status(self):
+        """Bölüm/özet sayıları ve boyutları"""
+        def describe(paths):
+            return {
+                'count': len(paths),
+                'bytes': sum(os.path.getsize(path) for path in paths if os.path.exists(path)),
+                'oldest': os.path.basename(paths[0]) if paths else None,
+                'newest': os.path.basename(paths[-1]) if paths else None
+            }
+        
+        return {
+            'active_bytes': os.path.getsize(self.data_file) if os.path.exists(self.data_file) else 0,
+            'raw': describe(segment_paths('raw', self.directory)),
+            'rollup': describe(segment_paths('rollup', self.directory)),
+            'policy': self.policy
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Canlı veri döndürme, sıkıştırma ve silme')
+    parser.add_argument('--status', action='store_true', help='Sadece durumu yazdır')
+    parser.add_argument('--rotate', action='store_true', help='Zaman dilimi dolmasa da aktif dosyayı döndür')
+    args = parser.parse_args()
+    
+    retention = RealtimeRetention()
+    if not args.status:
+        forced = retention.rotate(force=True) if args.rotate else None
+        report = retention.run_once()
+        rotated = report['rotated'] or forced
+        print(f"✅ Döndürülen: {rotated or '-'}, sıkıştırılan: {report['compacted']}, silinen: {report['expired']}")
+    print(json.dumps(retention.status(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,12 @@ def temizle():
     
     dosyalar = [
         'data/realtime_data.csv',
+        'data/realtime.db',
+        'data/realtime.db-wal',
+        'data/realtime.db-shm',
+        'data/incident_acks.db',
+        'data/incident_acks.db-wal',
+        'data/incident_acks.db-shm',
         'data/sensor_data.csv'
     ]
     
@@ -25,6 +31,16 @@ def temizle():
         else:
             print(f"ℹ️  Dosya yok: {dosya}")
     
+    # Döndürülmüş bölümler ve özetler (veri_saklama.py), kolon deposu (kolon_deposu.py)
+    for klasor in ['data/realtime', 'data/sensor_data.cols', 'data/realtime_data.cols']:
+        if not os.path.exists(klasor):
+            continue
+        try:
+            shutil.rmtree(klasor)
+            print(f"✅ Silindi: {klasor}/")
+        except Exception as e:
+            print(f"⚠️  Silinemedi {klasor}: {e}")
+    
     print("\n✅ Temizleme tamamlandı!")
 
 if __name__ == "__main__":
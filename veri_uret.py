@@ -143,21 +143,33 @@ def apply_failure_scenario(df, transformer_id, scenario_name, scenario_config):
         df.loc[mask, 'anomali'] = 1
 
 
-def generate_all_data():
+def generate_all_data(num_transformers=None, start_date=None, end_date=None, output_file=None):
     """
     Tüm trafolar için 1 yıllık veri üretir ve arıza senaryolarını uygular.
+    
+    Args:
+        num_transformers: Trafo sayısı (varsayılan: NUM_TRANSFORMERS)
+        start_date: Başlangıç tarihi (varsayılan: DATA_GENERATION)
+        end_date: Bitiş tarihi (varsayılan: DATA_GENERATION)
+        output_file: Çıktı CSV dosyası (varsayılan: DATA_GENERATION)
     """
-    print("Veri uretimi basliyor...")
-    print(f"{NUM_TRANSFORMERS} trafo icin 1 yillik veri uretilecek")
+    if num_transformers is None:
+        num_transformers = NUM_TRANSFORMERS
+    if start_date is None:
+        start_date = DATA_GENERATION['start_date']
+    if end_date is None:
+        end_date = DATA_GENERATION['end_date']
+    if output_file is None:
+        output_file = DATA_GENERATION['output_file']
     
-    start_date = DATA_GENERATION['start_date']
-    end_date = DATA_GENERATION['end_date']
+    print("Veri uretimi basliyor...")
+    print(f"{num_transformers} trafo icin {start_date} - {end_date} araliginda veri uretilecek")
     
     all_data = []
     
     # Her trafo için veri üret
-    for transformer_id in range(1, NUM_TRANSFORMERS + 1):
-        print(f"  Trafo {transformer_id}/{NUM_TRANSFORMERS} isleniyor...", end='\r')
+    for transformer_id in range(1, num_transformers + 1):
+        print(f"  Trafo {transformer_id}/{num_transformers} isleniyor...", end='\r')
         
         df = generate_normal_data(transformer_id, start_date, end_date)
         all_data.append(df)
@@ -190,12 +202,12 @@ def generate_all_data():
     combined_df = combined_df.sort_values(['timestamp', 'transformer_id']).reset_index(drop=True)
     
     # CSV'ye kaydet
-    output_dir = os.path.dirname(DATA_GENERATION['output_file'])
+    output_dir = os.path.dirname(output_file)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    combined_df.to_csv(DATA_GENERATION['output_file'], index=False, encoding='utf-8-sig')
-    print(f"\nVeri kaydedildi: {DATA_GENERATION['output_file']}")
+    combined_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+    print(f"\nVeri kaydedildi: {output_file}")
     
     # İstatistikler
     print("\nVeri Istatistikleri:")
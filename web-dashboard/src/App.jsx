@@ -11,25 +11,44 @@ function App() {
   const [statistics, setStatistics] = useState(null)
   const [alerts, setAlerts] = useState([])
 
-  // Gerçek zamanlı veri çekme
+  // Gerçek zamanlı veri ve bildirimler: sunucu push (Server-Sent Events)
+  // İlk mesaj tüm trafoların durumu, sonrakiler sadece değişen trafolar
   useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const response = await fetch('/api/realtime-data')
-        const data = await response.json()
-        setRealtimeData(data.data || [])
-      } catch (error) {
-        console.error('Veri çekme hatası:', error)
+    const source = new EventSource('/api/stream')
+
+    source.addEventListener('snapshot', (event) => {
+      const payload = JSON.parse(event.data)
+      setRealtimeData(payload.data || [])
+      setAlerts(payload.alerts || [])
+    })
+
+    source.addEventListener('delta', (event) => {
+      const payload = JSON.parse(event.data)
+
+      if (payload.changed && payload.changed.length > 0) {
+        setRealtimeData((previous) => {
+          const changed = new Map(payload.changed.map((item) => [item.transformer_id, item]))
+          const merged = previous.map((item) => changed.get(item.transformer_id) || item)
+          const known = new Set(previous.map((item) => item.transformer_id))
+          payload.changed.forEach((item) => {
+            if (!known.has(item.transformer_id)) merged.push(item)
+          })
+          return merged
+        })
       }
-    }
 
-    // İlk yükleme
-    fetchData()
+      if (payload.alerts && payload.alerts.length > 0) {
+        // En yeni önce, son 50 bildirim
+        setAlerts((previous) => [...payload.alerts.slice().reverse(), ...previous].slice(0, 50))
+      }
+    })
 
-    // Her 5 saniyede bir güncelle
-    const interval = setInterval(fetchData, 5000)
+    source.onerror = (error) => {
+      // EventSource bağlantıyı otomatik olarak yeniden kurar (snapshot ile)
+      console.error('Canlı akış hatası:', error)
+    }
 
-    return () => clearInterval(interval)
+    return () => source.close()
   }, [])
 
   // İstatistikleri çekme
@@ -50,24 +69,6 @@ function App() {
     return () => clearInterval(interval)
   }, [])
 
-  // Bildirimleri çekme
-  useEffect(() => {
-    const fetchAlerts = async () => {
-      try {
-        const response = await fetch('/api/alerts')
-        const data = await response.json()
-        setAlerts(data.alerts || [])
-      } catch (error) {
-        console.error('Bildirim çekme hatası:', error)
-      }
-    }
-
-    fetchAlerts()
-    const interval = setInterval(fetchAlerts, 5000)
-
-    return () => clearInterval(interval)
-  }, [])
-
   return (
     <div className="app">
       <Header statistics={statistics} />
@@ -0,0 +1,212 @@
+"""
+API Yanıt Katmanı
+Flask uygulamaları için hızlı JSON serileştirme (orjson, NumPy/pandas
+tiplerini doğrudan tanır), boyut eşiğinin üzerindeki yanıtlar için
+gzip/brotli sıkıştırma ve zaman serileri için kolon bazlı yanıt biçimi.
+"""
+
+import gzip
+import json
+import sys
+from collections.abc import Mapping
+from datetime import date, datetime
+
+import numpy as np
+from flask import request
+from flask.json.provider import JSONProvider
+
+# orjson opsiyonel: yoksa standart json + NumPy dönüştürücü kullanılır
+try:
+    import orjson
+    USE_ORJSON = True
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    USE_ORJSON = False
+
+# brotli opsiyonel: yoksa sadece gzip sunulur
+try:
+    import brotli
+    USE_BROTLI = True
+except ImportError:
+    USE_BROTLI = False
+
+# Bu boyutun altındaki yanıtlar sıkıştırılmaz (bayt)
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Sıkıştırılabilir içerik türleri (SSE akışı bilinçli olarak hariç)
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/csv',
+    'text/html',
+    'text/plain',
+    'application/javascript',
+    'text/css'
+}
+
+
+def _default(obj):
+    """orjson/json'un doğrudan tanımadığı tipler için dönüştürücü"""
+    # pandas sadece zaten yüklüyse kontrol edilir (bu modül pandas'ı import etmez)
+    pd = sys.modules.get('pandas')
+    # pd.NaT de datetime alt sınıfıdır; isoformat() 'NaT' döndürmeden önce yakalanır
+    if pd is not None and obj is pd.NaT:
+        return None
+    # pd.Timestamp da datetime alt sınıfıdır
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.datetime64):
+        return None if np.isnat(obj) else str(np.datetime_as_string(obj, unit='s'))
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Mapping):
+        # Salt okunur görüntüler (MappingProxyType) vb.
+        return dict(obj)
+    if pd is not None and isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(obj).__name__}")
+
+
+def dumps_bytes(obj):
+    """Nesneyi UTF-8 JSON baytlarına çevirir"""
+    if USE_ORJSON:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, ensure_ascii=False).encode('utf-8')
+
+
+def dumps(obj):
+    """Nesneyi JSON metnine çevirir (SSE mesajları vb. için)"""
+    return dumps_bytes(obj).decode('utf-8')
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    Flask JSON sağlayıcısı (jsonify ve app.json bunu kullanır).
+    
+    NumPy skalerleri/dizileri ve pandas zaman damgaları dönüştürme
+    gerektirmeden serileştirilir; endpoint'lerde float()/bool() gerekmez.
+    """
+    
+    mimetype = 'application/json'
+    
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+    
+    def loads(self, s, **kwargs):
+        if USE_ORJSON:
+            return orjson.loads(s)
+        return json.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def _choose_encoding(accept_encodings):
+    """İstemcinin kabul ettiği en iyi sıkıştırma yöntemi"""
+    if USE_BROTLI and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, min_size=COMPRESS_MIN_SIZE):
+    """
+    Yanıtı Accept-Encoding başlığına göre sıkıştırır (after_request).
+    
+    Args:
+        response: Flask yanıtı
+        min_size: Sıkıştırma için minimum gövde boyutu (bayt)
+    
+    Returns:
+        Response: Gerekirse sıkıştırılmış yanıt
+    """
+    response.vary.add('Accept-Encoding')
+    
+    if (response.status_code < 200 or response.status_code >= 300
+            or response.status_code == 204
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    
+    encoding = _choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+    
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL)
+    
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    
+    # Sıkıştırılmış gövde sıkıştırılmamışla bayt bayt aynı değil: zayıf ETag
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_response_layer(app, min_size=COMPRESS_MIN_SIZE):
+    """
+    Hızlı JSON sağlayıcısını ve sıkıştırmayı Flask uygulamasına bağlar.
+    
+    Args:
+        app: Flask uygulaması
+        min_size: Sıkıştırma için minimum gövde boyutu (bayt)
+    """
+    app.json = FastJSONProvider(app)
+    
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, min_size=min_size)
+    
+    return app
+
+
+def wants_columnar():
+    """?format=columnar ile kolon bazlı yanıt istendi mi"""
+    return request.args.get('format', 'records') == 'columnar'
+
+
+def _column_values(series):
+    """Tek kolonu JSON'a hazır diziye çevirir (sayısal kolonlar kopyalanmadan)"""
+    import pandas as pd
+    
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = np.datetime_as_string(series.to_numpy(dtype='datetime64[s]'), unit='s')
+        return values.tolist()
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy()
+        if values.dtype.kind == 'f' and np.isnan(values).any():
+            # NaN -> null (orjson dizilerde NaN'ı null yapar, json yapmaz)
+            return series.astype(object).where(series.notna(), None).tolist()
+        return np.ascontiguousarray(values)
+    return series.tolist()
+
+
+def frame_payload(df, columnar=False):
+    """
+    DataFrame'i yanıt gövdesine çevirir.
+    
+    Args:
+        df: Yanıtlanacak DataFrame
+        columnar: True ise {'kolon': [değerler]} biçimi, değilse kayıt listesi
+    
+    Returns:
+        dict veya list: JSON'a hazır veri
+    """
+    if columnar:
+        return {column: _column_values(df[column]) for column in df.columns}
+    return df.to_dict('records')
@@ -0,0 +1,267 @@
+"""
+Yerel Veritabanı
+Canlı kayıtlar için gömülü SQLite deposu (internet/Firebase gerektirmez).
+
+realtime_data.csv'deki kolonlar tek bir 'readings' tablosunda tutulur:
+  - (transformer_id, timestamp) indeksi: trafo başına son kayıt ve geçmiş penceresi
+  - risk_score indeksi: bildirim sorguları
+WAL modunda okuyucular (api_server işçileri) yazıcıyı (simülasyon) beklemez.
+Kayıtlar toplu eklenir: save_batch bir tick'i tek işlemde yazar, tek tek
+eklenen kayıtlar batch_size / flush_interval dolana kadar bekletilir.
+
+    python yerel_veritabani.py --status
+    python yerel_veritabani.py --import data/realtime_data.csv
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import ALERT_CONFIG, LOCAL_DATABASE
+from depolama import StorageBackend, TIMESTAMP_FORMAT, format_timestamp
+from kolon_deposu import REALTIME_DTYPES
+
+COLUMNS = list(REALTIME_DTYPES)
+
+SQL_TYPES = {
+    'datetime64[ns]': 'TEXT',
+    'int32': 'INTEGER',
+    'bool': 'INTEGER',
+    'category': 'TEXT'
+}
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS readings (id INTEGER PRIMARY KEY, " + ", ".join(
+        f"{column} {SQL_TYPES.get(dtype, 'REAL')}"
+        + (" NOT NULL" if column in ('timestamp', 'transformer_id') else "")
+        for column, dtype in REALTIME_DTYPES.items()
+    ) + ")",
+    "CREATE INDEX IF NOT EXISTS idx_readings_transformer_time ON readings (transformer_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_readings_risk ON readings (risk_score)"
+]
+
+INSERT_SQL = f"INSERT INTO readings ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def _row_values(record):
+    """Kayıt sözlüğünden INSERT parametreleri (NumPy tipleri Python tiplerine)"""
+    values = []
+    for column in COLUMNS:
+        value = record.get(column)
+        if column == 'timestamp':
+            value = format_timestamp(value)
+        elif hasattr(value, 'item'):
+            value = value.item()
+        values.append(value)
+    return tuple(values)
+
+
+class SqliteStore(StorageBackend):
+    """
+    SQLite WAL deposu (depolama.StorageBackend). Bağlantılar iş parçacığı
+    başınadır; yazmalar süreç içinde kilitle, süreçler arasında SQLite
+    kilidiyle (busy_timeout) sıralanır.
+    """
+    
+    name = 'SQLite'
+    
+    def __init__(self, path=LOCAL_DATABASE['path'], batch_size=LOCAL_DATABASE['batch_size'],
+                 flush_interval=LOCAL_DATABASE['flush_interval']):
+        super().__init__(batch_size, flush_interval)
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        with connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+    
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=LOCAL_DATABASE['busy_timeout'])
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+    
+    # --- Yazma ---
+    
+    def write_batch(self, df):
+        """
+        Kayıtları tek işlemde ekler.
+        
+        Args:
+            df: realtime_data.csv kolonlarıyla DataFrame (eksik kolonlar NULL)
+        
+        Returns:
+            int: Eklenen satır sayısı
+        """
+        import pandas as pd
+        
+        if not len(df):
+            return 0
+        df = df.reindex(columns=COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601').dt.strftime(TIMESTAMP_FORMAT)
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        return self._insert(rows)
+    
+    def write_records(self, records):
+        """Kayıt sözlüklerini tek işlemde ekler (add() tamponu)"""
+        return self._insert([_row_values(record) for record in records])
+    
+    def _insert(self, rows):
+        connection = self._connection()
+        with self._write_lock, connection:
+            cursor = connection.executemany(INSERT_SQL, rows)
+        return cursor.rowcount
+    
+    def close(self):
+        """Tamponu yazar ve bu iş parçacığının bağlantısını kapatır"""
+        super().close()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.execute('PRAGMA optimize')
+            connection.close()
+            self._local.connection = None
+    
+    # --- Sorgular ---
+    
+    def _query(self, sql, params=()):
+        rows = [dict(row) for row in self._connection().execute(sql, params)]
+        for row in rows:
+            if row.get('is_anomaly') is not None:
+                row['is_anomaly'] = bool(row['is_anomaly'])
+        return rows
+    
+    def latest(self, transformer_id=None):
+        """
+        Trafo başına en yeni kayıt ((transformer_id, timestamp) indeksinden).
+        
+        Returns:
+            dict: transformer_id -> kayıt
+        """
+        where, params = ('WHERE transformer_id = ?', (transformer_id,)) if transformer_id is not None else ('', ())
+        rows = self._query(
+            "SELECT r.* FROM readings r JOIN ("
+            f"  SELECT transformer_id, MAX(timestamp) AS timestamp FROM readings {where} GROUP BY transformer_id"
+            ") m ON r.transformer_id = m.transformer_id AND r.timestamp = m.timestamp ORDER BY r.id",
+            params
+        )
+        # Aynı zaman damgasında birden çok kayıt varsa en son eklenen
+        return {row['transformer_id']: row for row in rows}
+    
+    def history(self, transformer_id, start=None, end=None, limit=None):
+        """
+        Trafonun zaman penceresindeki kayıtları (zaman sıralı).
+        
+        Args:
+            start, end: Dahil alt / üst sınır (datetime veya ISO metni, None = sınırsız)
+            limit: En fazla satır (pencerenin en yeni satırları)
+        """
+        sql = "SELECT * FROM readings WHERE transformer_id = ?"
+        params = [transformer_id]
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(format_timestamp(start))
+        if end is not None:
+            sql += " AND timestamp <= ?"
+            params.append(format_timestamp(end))
+        sql += " ORDER BY timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return self._query(sql, params)[::-1]
+    
+    def alerts(self, min_risk=ALERT_CONFIG['open_threshold'], transformer_id=None, before=None, limit=50):
+        """
+        Risk eşiğini aşan kayıtlar, en yeni önce (risk_score indeksinden).
+        
+        Args:
+            min_risk: Risk alt sınırı
+            transformer_id: Sadece bu trafo
+            before: Bu id'den eski kayıtlar (sayfalama)
+            limit: Sayfa boyutu
+        
+        Returns:
+            tuple: (kayıtlar, next_before)
+        """
+        sql = "SELECT * FROM readings WHERE risk_score >= ?"
+        params = [min_risk]
+        if transformer_id is not None:
+            sql += " AND transformer_id = ?"
+            params.append(transformer_id)
+        if before is not None:
+            sql += " AND id < ?"
+            params.append(int(before))
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
+        records = self._query(sql, params)
+        return records, records[-1]['id'] if len(records) == limit else None
+    
+    def rows_after(self, row_id, limit=None):
+        """id'si row_id'den büyük kayıtlar (eklenme sırasıyla) - artımlı okuma"""
+        sql = "SELECT * FROM readings WHERE id > ? ORDER BY id"
+        params = [row_id]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return self._query(sql, params)
+    
+    def last_id(self):
+        return self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM readings").fetchone()[0]
+    
+    def status(self):
+        """Satır/trafo sayısı, zaman aralığı ve dosya boyutu"""
+        row = self._connection().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT transformer_id), MIN(timestamp), MAX(timestamp) FROM readings"
+        ).fetchone()
+        return {
+            'path': self.path,
+            'rows': row[0],
+            'transformers': row[1],
+            'time_range': [row[2], row[3]] if row[0] else None,
+            'size_mb': round(sum(
+                os.path.getsize(self.path + suffix)
+                for suffix in ('', '-wal') if os.path.exists(self.path + suffix)
+            ) / 1e6, 2)
+        }
+
+
+def import_csv(store, csv_path, chunksize=50000):
+    """Mevcut realtime_data.csv'yi parça parça veritabanına aktarır"""
+    import pandas as pd
+    
+    started = time.perf_counter()
+    rows = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, encoding='utf-8-sig'):
+        rows += store.write_batch(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {rows:,} kayıt aktarıldı ({elapsed:.2f} sn, {rows / elapsed if elapsed else 0:,.0f} kayıt/sn)")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yerel SQLite veritabanı')
+    parser.add_argument('--path', default=LOCAL_DATABASE['path'])
+    parser.add_argument('--import', dest='csv', metavar='CSV', help='CSV kayıtlarını veritabanına aktar')
+    parser.add_argument('--status', action='store_true', help='Sadece durumu yazdır')
+    args = parser.parse_args()
+    
+    store = SqliteStore(args.path)
+    if args.csv and not args.status:
+        import_csv(store, args.csv)
+    print(json.dumps(store.status(), indent=2, ensure_ascii=False))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()